@@ -11,7 +11,7 @@ import logging
 
 import click
 
-from ..data import PACKAGES, get_data_dir
+from ..data import PACKAGES, get_data_dir, pack_model
 
 
 log = logging.getLogger(__name__)
@@ -55,6 +55,19 @@ def download(ctx):
     click.echo('Successfully downloaded %s new data packages (%s existing)' % (count, len(PACKAGES) - count))
 
 
+@data_cli.command()
+@click.option('--force', is_flag=True, help='Pack models again, even if they are already packed.')
+@click.pass_obj
+def pack(ctx, force):
+    """Pack downloaded models for fast loading, shared between processes."""
+    log.debug('chemdataextractor.data.pack')
+    count = 0
+    for package in PACKAGES:
+        if package.local_exists() and pack_model(package.path, force=force):
+            count += 1
+    click.echo('Packed %s models (the others have nothing to pack)' % count)
+
+
 @data_cli.command()
 @click.pass_obj
 def clean(ctx):
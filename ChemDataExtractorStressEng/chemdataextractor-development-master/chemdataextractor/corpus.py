@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Run extraction over a corpus of documents.
+
+Each document is read, parsed and annotated once, every requested model is extracted from those shared annotations,
+and the work is spread over a pool of worker processes. Records are written incrementally as JSON lines, and finished documents are noted in
+a sidecar file so that an interrupted run can be resumed without redoing work.
+
+Usage::
+
+    from chemdataextractor.corpus import CorpusRunner
+    from chemdataextractor.model.model import YieldStrength, GrainSize, TableYieldStrength, TableGrainSize
+
+    runner = CorpusRunner(models=[YieldStrength, GrainSize, TableYieldStrength, TableGrainSize], processes=8)
+    runner.run(paths, 'records.jsonl')
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import multiprocessing
+import os
+
+import six
+
+from .doc.cache import AnnotationCache
+from .doc.document import Document
+from .parse.base import BaseTableParser
+from .reader.elsevier import ElsevierXmlReader
+
+
+log = logging.getLogger(__name__)
+
+
+#: Value of ``parsing_method`` for records from models that only have table parsers.
+TABLE_PARSING = 'Table Parsing'
+#: Value of ``parsing_method`` for records from all other models.
+TEXT_PARSING = 'Text Parsing'
+#: Elsevier document subtype of full-length articles, the only subtype kept by :func:`screen_file` by default.
+FULL_LENGTH_ARTICLE = 'fla'
+
+
+def parsing_method(model):
+    """Describe how records for a model are found, as written to the ``parsing_method`` field of the output.
+
+    :param model: The model class.
+    :returns: :data:`TABLE_PARSING` if every parser of the model is a table parser, otherwise :data:`TEXT_PARSING`.
+    :rtype: str
+    """
+    if model.parsers and all(isinstance(parser, BaseTableParser) for parser in model.parsers):
+        return TABLE_PARSING
+    return TEXT_PARSING
+
+
+def file_name(path):
+    """The name written to the ``file_name`` field of the output for a document path.
+
+    Downloaded Elsevier papers are saved with the ``/`` of the DOI replaced by ``-``, so this is undone here.
+
+    :param str path: Path to the document.
+    :rtype: str
+    """
+    return os.path.basename(path).replace('10.1016-', '10.1016/')
+
+
+def screen_file(path, subtypes=(FULL_LENGTH_ARTICLE,), open_access_only=False):
+    """Decide from its header alone whether a document is worth extracting records from.
+
+    Elsevier XML documents are screened with :meth:`~chemdataextractor.reader.elsevier.ElsevierXmlReader.read_header`,
+    which stops before the article body. Documents in any other format always pass.
+
+    :param str path: Path to the document.
+    :param subtypes: (Optional) The Elsevier document subtypes to keep, or None to keep all. Defaults to full-length
+        articles.
+    :param bool open_access_only: (Optional) Skip documents that are not marked as open access.
+    :returns: The reason to skip the document, or None if it should be extracted.
+    :rtype: str or None
+    """
+    with io.open(path, 'rb') as f:
+        header = ElsevierXmlReader().read_header(f)
+    if header is None:
+        return None
+    if header['rawtext_only']:
+        return 'raw text only'
+    if subtypes is not None and header['subtype'] not in subtypes:
+        return 'document subtype %s' % header['subtype']
+    if open_access_only and not header['open_access']:
+        return 'not open access'
+    return None
+
+
+def extract_file(path, models, readers=None, annotation_cache=None):
+    """Read, parse and annotate a single document once, and extract records for all the given models from it.
+
+    Each model is extracted on its own with :meth:`~chemdataextractor.doc.document.Document.records_for_groups`, so
+    records for one model are never merged with those for another. Each serialized record is annotated with the document metadata, its file name, the model that produced it and the
+    parsing method, in the same format as the per-model functions in ``propertyExtractor.py``. Compound records are
+    not returned on their own.
+
+    :param str path: Path to the document.
+    :param list models: The model classes to extract.
+    :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) Readers to try. Defaults to the Elsevier XML reader.
+    :param annotation_cache: (Optional) An :class:`~chemdataextractor.doc.cache.AnnotationCache`, or the path to
+        one, to reuse sentence annotations from earlier runs.
+    :returns: The serialized records.
+    :rtype: list[dict]
+    """
+    if readers is None:
+        readers = [ElsevierXmlReader()]
+    if isinstance(annotation_cache, six.string_types):
+        annotation_cache = AnnotationCache(annotation_cache)
+    with io.open(path, 'rb') as f:
+        d = Document.from_file(f, readers=readers)
+    try:
+        meta_data = d.metadata.serialize()
+    except Exception:
+        meta_data = 'empty'
+    name = file_name(path)
+    results = []
+    for model, records in zip(models, d.records_for_groups([[model] for model in models], cache=annotation_cache)):
+        for record in records:
+            if not isinstance(record, model):
+                continue
+            result = record.serialize(primitive=True)
+            result['metadata'] = meta_data
+            result['file_name'] = name
+            result['extraction_model'] = str(model)
+            result['parsing_method'] = parsing_method(model)
+            results.append(result)
+    return results
+
+
+def _extract_worker(args):
+    """Pool worker. Never raises, so a single bad document doesn't stop the run."""
+    path, models, readers, annotation_cache, screen = args
+    try:
+        if screen:
+            reason = screen_file(path)
+            if reason:
+                log.info('Skipping %s: %s', path, reason)
+                return path, [], 'skipped: %s' % reason
+        return path, extract_file(path, models, readers=readers, annotation_cache=annotation_cache), None
+    except Exception as e:
+        log.exception('Extraction failed for %s', path)
+        return path, [], '%s: %s' % (e.__class__.__name__, e)
+
+
+def _truncate(path, size):
+    """Cut a file back to ``size`` bytes, if it is longer."""
+    if os.path.getsize(path) > size:
+        log.warning('Removing the end of %s, written after the last finished document', path)
+        with io.open(path, 'r+b') as f:
+            f.truncate(size)
+
+
+class CorpusRunner(object):
+    """Extract records for a set of models from many documents, using a pool of worker processes."""
+
+    def __init__(self, models, processes=None, readers=None, chunksize=1, annotation_cache=None, screen=False):
+        """
+        :param list models: The model classes to extract.
+        :param int processes: (Optional) Number of worker processes. Defaults to the number of CPUs. If 1, documents
+            are processed in the current process.
+        :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) Readers to try. Defaults to the Elsevier XML reader.
+        :param int chunksize: (Optional) Number of documents sent to a worker at a time.
+        :param str annotation_cache: (Optional) Path to an :class:`~chemdataextractor.doc.cache.AnnotationCache`
+            shared by all the workers, so that re-running over the same corpus skips tokenization and tagging.
+        :param bool screen: (Optional) Check each document with :func:`screen_file` first, and skip those that are not
+            full-length articles with structured full text without reading them in full. The reason is noted in the
+            sidecar file in place of an error.
+        """
+        self.models = list(models)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.readers = readers
+        self.chunksize = chunksize
+        self.annotation_cache = annotation_cache
+        self.screen = screen
+
+    @staticmethod
+    def done_path(output):
+        """Path of the sidecar file that lists the documents already finished for an output file."""
+        return output + '.done'
+
+    @classmethod
+    def finished(cls, output):
+        """The documents already finished for an output file.
+
+        :param str output: Path to the JSON lines output file.
+        :returns: Absolute paths of the finished documents.
+        :rtype: set[str]
+        """
+        if not os.path.isfile(cls.done_path(output)):
+            return set()
+        return cls._read_done(output)[0]
+
+    @classmethod
+    def _read_done(cls, output):
+        """Read the sidecar file of an output file.
+
+        Each line of the sidecar is the path of a finished document, its status and the length in bytes of the output
+        once its records had been written. Sidecars written before the length was recorded have no third field.
+
+        :param str output: Path to the JSON lines output file.
+        :returns: The finished documents, the length in bytes of the complete lines of the sidecar, and the length of
+            the output once the last of them had been written, or None if that was not recorded.
+        :rtype: tuple(set[str], int, int)
+        """
+        done = set()
+        size = 0
+        offset = 0
+        with io.open(cls.done_path(output), 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Cut off while it was being written, so the document wasn't finished
+                    break
+                size += len(line)
+                fields = line.decode('utf8').rstrip('\n').split('\t')
+                if fields[0]:
+                    done.add(fields[0])
+                offset = int(fields[-1]) if len(fields) > 2 and fields[-1].isdigit() else None
+        return done, size, offset
+
+    def _results(self, paths):
+        annotation_cache = self.annotation_cache
+        if isinstance(annotation_cache, six.string_types):
+            annotation_cache = AnnotationCache(annotation_cache)
+        tasks = [(path, self.models, self.readers, annotation_cache, self.screen) for path in paths]
+        if self.processes == 1:
+            for task in tasks:
+                yield _extract_worker(task)
+            return
+        pool = multiprocessing.Pool(self.processes)
+        try:
+            for result in pool.imap_unordered(_extract_worker, tasks, chunksize=self.chunksize):
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def run(self, paths, output, resume=True):
+        """Extract records from documents and append them to a JSON lines file.
+
+        Once all the records for a document have been written, the document is noted in a sidecar file next to the
+        output (``<output>.done``), together with any error it raised and the length of the output so far. Documents
+        noted there are skipped when ``resume`` is set, and anything written to the output after the last of them, by
+        a run that was stopped part way through a document, is removed so its records aren't written twice.
+
+        :param paths: Paths to the documents.
+        :param str output: Path to the JSON lines output file.
+        :param bool resume: (Optional) Skip documents finished by a previous run. If False, the output is overwritten.
+        :returns: The number of records written.
+        :rtype: int
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        if resume:
+            done = set()
+            if os.path.isfile(self.done_path(output)):
+                done, done_size, offset = self._read_done(output)
+                _truncate(self.done_path(output), done_size)
+                if offset is not None and os.path.isfile(output):
+                    _truncate(output, offset)
+            todo = [path for path in paths if path not in done]
+            log.info('Skipping %s finished documents', len(paths) - len(todo))
+        else:
+            todo = paths
+        mode = 'ab' if resume else 'wb'
+        count = 0
+        with io.open(output, mode) as out, io.open(self.done_path(output), mode) as done_file:
+            for i, (path, records, error) in enumerate(self._results(todo)):
+                if records:
+                    out.write(''.join(six.text_type(json.dumps(record, ensure_ascii=False)) + '\n' for record in records).encode('utf8'))
+                    out.flush()
+                # Each document must be a single line of the sidecar
+                status = (error or 'ok').replace('\n', ' ')
+                done_file.write(('%s\t%s\t%s\n' % (path, status, out.tell())).encode('utf8'))
+                done_file.flush()
+                count += len(records)
+                log.info('%s/%s: %s records from %s', i + 1, len(todo), len(records), path)
+        return count
@@ -8,13 +8,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+from collections import defaultdict
 import io
 import logging
 import os
+import pickle
+import shutil
 
 import appdirs
+import dawg
+import numpy as np
 import requests
 import six
+from six.moves.collections_abc import Mapping, Set
 
 from .config import config
 from .errors import ModelNotFoundError
@@ -129,12 +135,23 @@ _model_cache = {}
 
 
 def load_model(path):
-    """Load a model from a pickle file in the data directory. Cached so model is only loaded once."""
+    """Load a model from a pickle file in the data directory. Cached so model is only loaded once.
+
+    If the model has been packed by :func:`pack_model`, it is loaded from the packed files instead.
+    """
     abspath = find_data(path)
     cached = _model_cache.get(abspath)
     if cached is not None:
         log.debug('Using cached copy of %s' % path)
         return cached
+    packed = packed_path(abspath)
+    if os.path.isfile(os.path.join(packed, 'model.pickle')):
+        if not _is_stale(abspath, packed):
+            log.debug('Loading packed model %s' % path)
+            model = load_packed(packed)
+            _model_cache[abspath] = model
+            return model
+        log.warning('Ignoring %s, which is older than %s. Run `cde data pack --force` to update it.', packed, abspath)
     log.debug('Loading model %s' % path)
     try:
         with io.open(abspath, 'rb') as f:
@@ -143,3 +160,298 @@ def load_model(path):
         raise ModelNotFoundError('Could not load %s. Have you run `cde data download`?' % path)
     _model_cache[abspath] = model
     return model
+
+
+#: Dictionaries and sets with fewer items than this are left in the pickle when a model is packed.
+PACK_MIN_SIZE = 1000
+
+
+def packed_path(abspath):
+    """Return the path to the directory a pickled model is packed into by :func:`pack_pickle`."""
+    return os.path.splitext(abspath)[0] + '.packed'
+
+
+def _is_stale(abspath, packed):
+    """Whether the pickle has changed since it was packed, for instance because it was downloaded again."""
+    return os.path.isfile(abspath) and os.path.getmtime(abspath) > os.path.getmtime(os.path.join(packed, 'model.pickle'))
+
+
+def pack_model(path, force=False):
+    """Pack a model from a pickle file in the data directory, so :func:`load_model` loads it from the packed files.
+
+    :param string path: The path to the model within the data directory.
+    :param bool force: (Optional) Pack the model again even if it is already packed.
+    :returns: The path to the packed model, or None if the model has nothing to pack.
+    """
+    abspath = find_data(path)
+    if not os.path.isfile(abspath):
+        raise ModelNotFoundError('Could not load %s. Have you run `cde data download`?' % path)
+    packed = packed_path(abspath)
+    if not force and os.path.isfile(os.path.join(packed, 'model.pickle')) and not _is_stale(abspath, packed):
+        log.debug('Skipping packed model %s' % path)
+        return packed
+    return pack_pickle(abspath, packed)
+
+
+def pack_pickle(src, dest):
+    """Pack the large dictionaries and sets in a pickled model into read-only files that are memory-mapped or read in
+    one go when loaded, and that are never written to afterwards. Worker processes forked after the model is loaded
+    therefore share its pages, and loading it is much faster than unpickling.
+
+    Sets and dictionaries of text, such as the Brown clusters, the tag dictionary of a tagger and the punkt parameters,
+    are stored in DAWGs. Averaged perceptron weights are stored in arrays in compressed sparse row layout, with a DAWG
+    mapping each feature to its row. The rest of the model is pickled, with references to the packed files.
+
+    :param string src: The path to the pickled model.
+    :param string dest: The path to the directory to write the packed model to. It is replaced if it already exists.
+    :returns: The path to the packed model, or None if the model is not a pickle or has nothing large enough to pack.
+    """
+    try:
+        with io.open(src, 'rb') as f:
+            model = six.moves.cPickle.load(f)
+    except Exception:
+        # Some models are read directly by CRFsuite or the DAWG library, so aren't pickles
+        log.debug('Not packing %s, which is not a pickle' % src)
+        return None
+    tmp = dest + '.tmp'
+    if os.path.isdir(tmp):
+        shutil.rmtree(tmp)
+    os.makedirs(tmp)
+    try:
+        with io.open(os.path.join(tmp, 'model.pickle'), 'wb') as f:
+            pickler = _PackingPickler(f, tmp)
+            pickler.dump(model)
+    except Exception:
+        shutil.rmtree(tmp)
+        raise
+    if not any(ref for _, ref in pickler.packed.values()):
+        log.debug('Not packing %s, which has nothing large enough to pack' % src)
+        shutil.rmtree(tmp)
+        return None
+    if os.path.isdir(dest):
+        shutil.rmtree(dest)
+    os.rename(tmp, dest)
+    log.info('Packed %s to %s', src, dest)
+    return dest
+
+
+def load_packed(path):
+    """Load a model packed by :func:`pack_pickle`. Not cached, so use :func:`load_model` instead to load models in the
+    data directory.
+
+    :param string path: The path to the directory of the packed model.
+    """
+    with io.open(os.path.join(path, 'model.pickle'), 'rb') as f:
+        return _PackedUnpickler(f, path).load()
+
+
+def _is_text(items):
+    """Whether every item is non-empty text, as DAWG keys must be."""
+    return all(isinstance(item, six.text_type) and item for item in items)
+
+
+class _PackingPickler(pickle.Pickler):
+    """Pickle a model, writing its large dictionaries and sets to packed files and pickling references to them."""
+
+    def __init__(self, f, path):
+        pickle.Pickler.__init__(self, f, protocol=2)
+        self.path = path
+        #: Packed references by object id, with the objects themselves to keep their ids from being reused
+        self.packed = {}
+
+    def persistent_id(self, obj):
+        if type(obj) not in {dict, defaultdict, set, frozenset} or len(obj) < PACK_MIN_SIZE:
+            return None
+        key = id(obj)
+        if key not in self.packed:
+            self.packed[key] = (obj, self._pack(obj, 'packed%s' % len(self.packed)))
+        return self.packed[key][1]
+
+    def _pack(self, obj, name):
+        """Write an object to packed files, returning its reference, or None to pickle it as normal instead."""
+        if not _is_text(obj):
+            return None
+        if isinstance(obj, (set, frozenset)):
+            packed = dawg.CompletionDAWG(obj)
+            if self._save(packed, name, all(key in packed for key in obj)):
+                return 'set', name, len(obj)
+            return None
+        values = list(obj.values())
+        if all(isinstance(value, six.text_type) for value in values):
+            items = [(key, value.encode('utf-8')) for key, value in obj.items()]
+            packed = dawg.BytesDAWG(items)
+            if self._save(packed, name, all(packed.get(key) == [value] for key, value in items)):
+                return 'text', name, len(obj)
+            return None
+        if all(type(value) is int and 0 <= value < 2 ** 31 for value in values):
+            default = 0 if isinstance(obj, defaultdict) and obj.default_factory is int else None
+            packed = dawg.IntCompletionDAWG(obj.items())
+            if self._save(packed, name, all(packed.get(key) == value for key, value in obj.items())):
+                return 'int', name, len(obj), default
+            return None
+        if all(type(value) is dict and all(type(w) is float for w in value.values()) for value in values):
+            return self._pack_weights(obj, name)
+        return None
+
+    def _pack_weights(self, weights, name):
+        """Write dictionaries of features to dictionaries of labels to weights as arrays in compressed sparse row
+        layout, with the features mapped to their rows by a DAWG."""
+        labels, label_ids, offsets, row_labels, row_weights = [], {}, [0], [], []
+        for feature_weights in weights.values():
+            for label, weight in feature_weights.items():
+                if label not in label_ids:
+                    label_ids[label] = len(labels)
+                    labels.append(label)
+                row_labels.append(label_ids[label])
+                row_weights.append(weight)
+            offsets.append(len(row_labels))
+        index = dawg.IntCompletionDAWG((feature, row) for row, feature in enumerate(weights))
+        if not self._save(index, name, all(index.get(feature) == row for row, feature in enumerate(weights))):
+            return None
+        np.save(os.path.join(self.path, name + '.offsets.npy'), np.array(offsets, dtype=np.int64))
+        np.save(os.path.join(self.path, name + '.labels.npy'), np.array(row_labels, dtype=np.int32))
+        np.save(os.path.join(self.path, name + '.weights.npy'), np.array(row_weights, dtype=np.float64))
+        return 'weights', name, len(weights), labels
+
+    def _save(self, packed, name, complete):
+        """Save a DAWG if it holds every item, as DAWGs can't hold keys with some control characters."""
+        if not complete:
+            log.debug('Not packing %s, which has keys a DAWG can\'t hold' % name)
+            return False
+        packed.save(os.path.join(self.path, name + '.dawg'))
+        return True
+
+
+class _PackedUnpickler(pickle.Unpickler):
+    """Unpickle a packed model, loading the packed files it refers to."""
+
+    def __init__(self, f, path):
+        pickle.Unpickler.__init__(self, f)
+        self.path = path
+
+    def persistent_load(self, pid):
+        kind, name, size = pid[:3]
+        path = os.path.join(self.path, name)
+        if kind == 'set':
+            return PackedSet(dawg.CompletionDAWG().load(path + '.dawg'), size)
+        if kind == 'text':
+            return PackedTextDict(dawg.BytesDAWG().load(path + '.dawg'), size)
+        if kind == 'int':
+            return PackedIntDict(dawg.IntCompletionDAWG().load(path + '.dawg'), size, default=pid[3])
+        if kind == 'weights':
+            return PackedWeights(path, size, pid[3])
+        raise pickle.UnpicklingError('Unknown packed data %s' % kind)
+
+
+class PackedSet(Set):
+    """A read-only set of text, stored in a DAWG by :func:`pack_pickle`."""
+
+    def __init__(self, packed, size):
+        self._dawg = packed
+        self._size = size
+
+    def __contains__(self, key):
+        return isinstance(key, six.text_type) and key in self._dawg
+
+    def __iter__(self):
+        return iter(self._dawg.keys())
+
+    def __len__(self):
+        return self._size
+
+
+class PackedTextDict(Mapping):
+    """A read-only dictionary of text to text, stored in a DAWG by :func:`pack_pickle`."""
+
+    def __init__(self, packed, size):
+        self._dawg = packed
+        self._size = size
+
+    def __getitem__(self, key):
+        values = self.get(key)
+        if values is None:
+            raise KeyError(key)
+        return values
+
+    def get(self, key, default=None):
+        values = self._dawg.get(key) if isinstance(key, six.text_type) else None
+        return default if values is None else values[0].decode('utf-8')
+
+    def __contains__(self, key):
+        return isinstance(key, six.text_type) and key in self._dawg
+
+    def __iter__(self):
+        return iter(self._dawg.keys())
+
+    def __len__(self):
+        return self._size
+
+
+class PackedIntDict(PackedTextDict):
+    """A read-only dictionary of text to integers, stored in a DAWG by :func:`pack_pickle`.
+
+    Like the :class:`~collections.defaultdict` it was packed from, if any, ``default`` is returned for missing keys.
+    """
+
+    def __init__(self, packed, size, default=None):
+        super(PackedIntDict, self).__init__(packed, size)
+        self.default = default
+
+    def __getitem__(self, key):
+        value = self.get(key, self.default)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        return self._dawg.get(key, default) if isinstance(key, six.text_type) else default
+
+
+class PackedWeights(Mapping):
+    """Read-only averaged perceptron weights, as a dictionary of features to dictionaries of labels to weights.
+
+    The labels and weights of every feature are stored in memory-mapped arrays in compressed sparse row layout by
+    :func:`pack_pickle`, with a DAWG mapping each feature to its row.
+    """
+
+    def __init__(self, path, size, labels):
+        """
+        :param string path: The path to the packed files, without their extensions.
+        :param int size: The number of features.
+        :param list labels: The labels, in the order of their ids in the packed files.
+        """
+        self.path = path
+        self.labels = labels
+        self._size = size
+        self._index = dawg.IntCompletionDAWG().load(path + '.dawg')
+        # Memory views of the memory-mapped arrays, as slicing them is much faster than slicing the arrays
+        self._offsets, self._label_ids, self._weights = [
+            memoryview(np.load('%s.%s.npy' % (path, array), mmap_mode='r')) for array in ('offsets', 'labels', 'weights')
+        ]
+
+    def __reduce__(self):
+        # Memory maps can't be pickled, so copies sent to other processes map the files again
+        return self.__class__, (self.path, self._size, self.labels)
+
+    def __getitem__(self, feature):
+        weights = self.get(feature)
+        if weights is None:
+            raise KeyError(feature)
+        return weights
+
+    def get(self, feature, default=None):
+        row = self._index.get(feature) if isinstance(feature, six.text_type) else None
+        if row is None:
+            return default
+        start, end = self._offsets[row], self._offsets[row + 1]
+        labels = self.labels
+        return dict(zip([labels[i] for i in self._label_ids[start:end].tolist()], self._weights[start:end].tolist()))
+
+    def __contains__(self, feature):
+        return isinstance(feature, six.text_type) and feature in self._index
+
+    def __iter__(self):
+        return iter(self._index.keys())
+
+    def __len__(self):
+        return self._size
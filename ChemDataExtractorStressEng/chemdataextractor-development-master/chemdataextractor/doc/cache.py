@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent storage for sentence annotations.
+
+Tokenization and tagging are the most expensive part of processing a document, but they do not depend on the parsers,
+so re-running extraction over a corpus after changing a parser repeats work whose results have not changed. An
+:class:`AnnotationCache` keeps these annotations in a local SQLite database, keyed by a hash of the sentence text and a
+description of the tokenizer, taggers and models that produced them. Sentences that have been seen before are then
+loaded instead of being tagged again.
+
+Usage::
+
+    cache = AnnotationCache('annotations.sqlite')
+    d = Document.from_file(f).annotate(models=[YieldStrength], cache=cache)
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import weakref
+
+import six
+
+
+log = logging.getLogger(__name__)
+
+
+#: Increment to invalidate existing caches when the stored format or the annotation pipeline changes.
+CACHE_VERSION = 1
+
+
+def _describe(obj):
+    """Describe a tokenizer, tagger, lexicon or abbreviation detector by its class, model files and sub-taggers."""
+    if obj is None:
+        return 'None'
+    parts = [obj.__class__.__name__]
+    for attr in ('model', 'clusters_path'):
+        value = getattr(obj, attr, None)
+        if isinstance(value, six.string_types):
+            parts.append(value)
+    for tagger in getattr(obj, 'taggers', []):
+        parts.append(_describe(tagger))
+    return '(%s)' % ','.join(parts)
+
+
+class AnnotationCache(object):
+    """
+    A store of sentence annotations in a SQLite database.
+
+    The tokens, part of speech tags, unprocessed named entity tags and abbreviation definitions of each sentence are
+    stored. These are everything needed for the remaining annotations to be recomputed cheaply.
+
+    The database can be shared between processes, each of which opens its own connection when it first needs one.
+    """
+
+    def __init__(self, path):
+        """
+        :param str path: Path to the SQLite database. It is created if it does not exist.
+        """
+        self.path = path
+        self._connection = None
+        self._pid = None
+        self._loaded = weakref.WeakSet()
+        #: Number of sentences loaded from the cache.
+        self.hits = 0
+        #: Number of sentences that were not found in the cache.
+        self.misses = 0
+
+    def __getstate__(self):
+        # Connections can't be pickled, so a copy sent to another process opens its own
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self.path)
+
+    @property
+    def connection(self):
+        """The SQLite connection for the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=60)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS annotations (key TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        """Close the connection for the current process."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def version(self, sentence):
+        """
+        Describe everything apart from its text that the annotations of a sentence depend on: the cache version, the
+        tokenizer, lexicon, taggers and abbreviation detector, and the units of its models, which are used to split
+        quantities when tokenizing.
+
+        :param Sentence sentence: The sentence.
+        :rtype: str
+        """
+        # Not memoized by component, as the id of a component that has been garbage collected can be reused by another
+        components = (sentence.word_tokenizer, sentence.lexicon, sentence.pos_tagger, sentence.ner_tagger, sentence.abbreviation_detector)
+        quantity_re = sentence.quantity_re
+        return '%s:%s:%s' % (
+            CACHE_VERSION,
+            ','.join(_describe(component) for component in components),
+            quantity_re.pattern if quantity_re is not None else None
+        )
+
+    def key(self, sentence):
+        """
+        The key that the annotations of a sentence are stored under.
+
+        :param Sentence sentence: The sentence.
+        :rtype: str
+        """
+        content = '%s\n%s' % (self.version(sentence), sentence.text)
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def load(self, sentences):
+        """
+        Load the stored annotations for any of the sentences that are in the cache, so they aren't recomputed.
+
+        Sentences that already have tokens are left alone.
+
+        :param list[Sentence] sentences: The sentences.
+        :returns: The number of sentences that were loaded.
+        :rtype: int
+        """
+        keyed = {}
+        for sentence in sentences:
+            if hasattr(sentence, '_tokens'):
+                continue
+            keyed.setdefault(self.key(sentence), []).append(sentence)
+        keys = list(keyed)
+        loaded = 0
+        # Stay well below SQLite's limit on the number of query parameters
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            query = 'SELECT key, data FROM annotations WHERE key IN (%s)' % ','.join('?' * len(chunk))
+            for key, data in self.connection.execute(query, chunk):
+                data = json.loads(data)
+                for sentence in keyed[key]:
+                    self._set_annotations(sentence, data)
+                    self._loaded.add(sentence)
+                    loaded += 1
+        self.hits += loaded
+        self.misses += sum(len(s) for s in keyed.values()) - loaded
+        return loaded
+
+    def store(self, sentences):
+        """
+        Store the annotations of the sentences that were not loaded from the cache, computing them if needed.
+
+        :param list[Sentence] sentences: The sentences.
+        :returns: The number of sentences that were stored.
+        :rtype: int
+        """
+        rows = []
+        for sentence in sentences:
+            if sentence in self._loaded:
+                continue
+            rows.append((self.key(sentence), json.dumps(self._get_annotations(sentence))))
+        if rows:
+            with self.connection:
+                self.connection.executemany('INSERT OR IGNORE INTO annotations (key, data) VALUES (?, ?)', rows)
+        return len(rows)
+
+    @staticmethod
+    def _get_annotations(sentence):
+        return {
+            'spans': [(token.start - sentence.start, token.end - sentence.start) for token in sentence.tokens],
+            'pos': [tag for token, tag in sentence.pos_tagged_tokens],
+            # Not unprocessed_ner_tags, which abbreviation detection corrects in place
+            'ner': [tag for token, tag in sentence.unprocessed_ner_tagged_tokens],
+            'abbreviations': sentence.abbreviation_definitions,
+        }
+
+    @staticmethod
+    def _set_annotations(sentence, data):
+        sentence._tokens = sentence._tokens_for_spans(data['spans'])
+        raw_tokens = sentence.raw_tokens
+        sentence._pos_tagged_tokens = list(zip(raw_tokens, data['pos']))
+        sentence._unprocessed_ner_tagged_tokens = list(zip(sentence._pos_tagged_tokens, data['ner']))
+        sentence._abbreviation_definitions = [(abbr, long_, tag) for abbr, long_, tag in data['abbreviations']]
@@ -18,13 +18,13 @@ import logging
 import six
 
 from ..utils import python_2_unicode_compatible
-from .text import Paragraph, Citation, Footnote, Heading, Title, Caption
+from .text import Paragraph, Citation, Footnote, Heading, Title, Caption, tag_sentences
 from .element import CaptionedElement
 from .table import Table
 from .figure import Figure
 from .meta import MetaData
 from ..errors import ReaderError
-from ..model.base import ModelList
+from ..model.base import ModelList, UpdatableContext
 from ..model.model import Compound
 from ..text import get_encoding
 from ..config import Config
@@ -146,6 +146,9 @@ class Document(BaseDocument):
 
             Always open files in binary mode by using the 'rb' parameter.
 
+        Files on disk are memory-mapped rather than read into memory, so readers that only need the start of a file to
+        detect it are given just that, and XML and HTML are parsed straight from the map.
+
         :param f: A file-like object or path to a file.
         :type f: file or str
         :param str fname: (Optional) The filename. Used to help determine file format.
@@ -156,11 +159,15 @@ class Document(BaseDocument):
             :class:`~chemdataextractor.reader.markup.XmlReader`, :class:`~chemdataextractor.reader.markup.HtmlReader`,
             :class:`~chemdataextractor.reader.pdf.PdfReader`, and :class:`~chemdataextractor.reader.plaintext.PlainTextReader`.
         """
+        from ..reader import DEFAULT_REGISTRY, ReaderRegistry
+        registry = DEFAULT_REGISTRY if readers is None else ReaderRegistry(readers)
+
         if isinstance(f, six.string_types):
-            f = io.open(f, 'rb')
+            with io.open(f, 'rb') as f:
+                return registry.read_file(f, fname=fname or f.name)
         if not fname and hasattr(f, 'name'):
             fname = f.name
-        return cls.from_string(f.read(), fname=fname, readers=readers)
+        return registry.read_file(f, fname=fname)
 
     @classmethod
     def from_string(cls, fstring, fname=None, readers=None):
@@ -183,25 +190,16 @@ class Document(BaseDocument):
             :class:`~chemdataextractor.reader.cssp.CsspHtmlReader`, :class:`~chemdataextractor.elsevier.ElsevierXmlReader`,
             :class:`~chemdataextractor.reader.markup.XmlReader`, :class:`~chemdataextractor.reader.markup.HtmlReader`,
             :class:`~chemdataextractor.reader.pdf.PdfReader`, and :class:`~chemdataextractor.reader.plaintext.PlainTextReader`.
+            Readers that can't read the format sniffed from the start of the file are skipped, and readers can be added to
+            the defaults with :data:`~chemdataextractor.reader.DEFAULT_REGISTRY`.
         """
-        if readers is None:
-            from ..reader import DEFAULT_READERS
-            readers = DEFAULT_READERS
+        from ..reader import DEFAULT_REGISTRY, ReaderRegistry
+        registry = DEFAULT_REGISTRY if readers is None else ReaderRegistry(readers)
 
         if isinstance(fstring, six.text_type):
             raise ReaderError('from_string expects a byte string, not a unicode string')
 
-        for reader in readers:
-            # Skip reader if we don't think it can read file
-            if not reader.detect(fstring, fname=fname):
-                continue
-            try:
-                d = reader.readstring(fstring)
-                log.debug('Parsed document with %s' % reader.__class__.__name__)
-                return d
-            except ReaderError:
-                pass
-        raise ReaderError('Unable to read document')
+        return registry.read(fstring, fname=fname)
 
     @property
     def elements(self):
@@ -212,6 +210,91 @@ class Document(BaseDocument):
         """
         return self._elements
 
+    def annotate(self, models=None, cache=None):
+        """
+        Run the NLP pipeline over every element of this Document: sentence splitting, tokenization, part of speech and
+        named entity tagging, abbreviation detection and definition finding. The results are kept on the elements and
+        reused however many times :attr:`records` is computed, including after the models are changed.
+
+        Calling this is optional, as everything is otherwise computed the first time it is needed.
+
+        .. note::
+
+            Quantities are split into value and unit tokens using the units of the models that are set when the
+            tokens are created, so set (or pass in) every model that will be extracted before annotating.
+
+        Usage::
+
+            d = Document.from_file(f).annotate(models=[YieldStrength, GrainSize])
+            yield_strengths = d.records_for([YieldStrength])
+            grain_sizes = d.records_for([GrainSize])
+
+        If an :class:`~chemdataextractor.doc.cache.AnnotationCache` is given, the tokens and tags of sentences it has
+        seen before are loaded from it rather than recomputed, and those of new sentences are added to it. Table cells
+        are not cached.
+
+        :param list models: (Optional) Models to set on the Document before annotating.
+        :param AnnotationCache cache: (Optional) Persistent store of sentence annotations.
+        :returns: This Document, to allow chaining.
+        :rtype: Document
+        """
+        if models is not None:
+            self.models = list(models)
+        sentences = self._cacheable_sentences()
+        if cache is not None:
+            cache.load(sentences)
+        # Tag the sentences of every element in one batch, rather than one sentence at a time
+        tag_sentences(sentences)
+        for element in self.elements:
+            if callable(getattr(element, 'annotate', None)):
+                element.annotate()
+        if cache is not None:
+            cache.store(sentences)
+        return self
+
+    def _cacheable_sentences(self):
+        """The sentences of every text element and caption in this Document."""
+        sentences = []
+        for element in self.elements:
+            if isinstance(element, CaptionedElement):
+                element = element.caption
+            sentences.extend(getattr(element, 'sentences', []))
+        return sentences
+
+    def records_for(self, models):
+        """
+        Records for the given models, reusing the annotations computed by :meth:`annotate`.
+        The models of the Document are restored afterwards.
+
+        :param list models: The model classes to extract.
+        :returns: The records found for these models.
+        :rtype: ModelList
+        """
+        previous_models = self.models
+        self.models = list(models)
+        try:
+            return self.records
+        finally:
+            self.models = previous_models
+
+    def records_for_groups(self, model_groups, cache=None):
+        """
+        Records for several groups of models, one group after another, all from a single annotation pass.
+        The Document is annotated with the models of every group, and each group is then extracted on its own,
+        so records from different groups are never merged together. To extract several models in the same pass
+        instead, put them in one group.
+
+        :param list[list] model_groups: Lists of model classes.
+        :param AnnotationCache cache: (Optional) Persistent store of sentence annotations, passed to :meth:`annotate`.
+        :returns: The records for each group, in the same order as the groups.
+        :rtype: list[ModelList]
+        """
+        all_models = []
+        for models in model_groups:
+            all_models.extend(model for model in models if model not in all_models)
+        self.annotate(models=all_models, cache=cache)
+        return [self.records_for(models) for models in model_groups]
+
     # TODO: memoized_property?
     @property
     def records(self):
@@ -220,124 +303,181 @@ class Document(BaseDocument):
         """
         log.debug("Getting chemical records")
         records = ModelList()  # Final list of records -- output
+        for el, el_records in self._element_records():
+            for record in el_records:
+                if record not in records:
+                    log.debug(record.serialize())
+                    records.append(record)
+        return self._merge_records(records, self.abbreviation_definitions)
+
+    def iter_records(self, window=1):
+        """
+        Yield the records found in this Document as each element is processed, rather than all at the end like
+        :attr:`records`. Records are bound to their compounds from earlier elements in the same way as for
+        :attr:`records`, so they can be written out straight away, e.g. as JSON lines.
+
+        Merging records and removing duplicates and subsets are done on batches of ``window`` elements at a time,
+        rather than over the whole Document, so only the records of one batch are held in memory. Abbreviation
+        definitions from the elements processed so far are used. With ``window=None``, the whole Document is one
+        batch, and the records are the same as :attr:`records`.
+
+        Usage::
+
+            with io.open('records.jsonl', 'w', encoding='utf8') as f:
+                for record in d.iter_records():
+                    f.write(record.to_json() + '\n')
+
+        :param int window: (Optional) Number of elements whose records are merged together before they are yielded.
+            Default 1. If None, the whole Document.
+        :returns: Generator of :class:`~chemdataextractor.model.base.BaseModel`.
+        """
+        records = ModelList()
+        abbreviation_definitions = []
+        elements = 0
+        for el, el_records in self._element_records():
+            abbreviation_definitions.extend(el.abbreviation_definitions)
+            for record in el_records:
+                if record not in records:
+                    records.append(record)
+            elements += 1
+            if window is not None and elements >= window:
+                for record in self._merge_records(records, abbreviation_definitions):
+                    yield record
+                records = ModelList()
+                elements = 0
+        for record in self._merge_records(records, abbreviation_definitions):
+            yield record
+
+    def _element_records(self):
+        """
+        Find the records in each element in turn, and bind those without a compound to the relevant compound from
+        earlier in the Document. Models are updated with the definitions found in each element as it is processed,
+        in an :class:`~chemdataextractor.model.base.UpdatableContext` for this call, so the model classes themselves
+        are left unchanged and other Documents can be processed at the same time in other threads.
+
+        :returns: Generator of (element, list of records) for each element.
+        """
         head_def_record = None  # Most recent record from a heading, title or short paragraph
         head_def_record_i = None # Element index of head_def_record
         last_product_record = None
         title_record = None # Records found in the title
 
+        # Definitions found in the elements are kept here rather than in the model classes
+        context = UpdatableContext()
+
         # Main loop, over all elements in the document
         for i, el in enumerate(self.elements):
-            log.debug("Element %d, type %s" %(i, str(type(el))))
-            last_id_record = None
-
-            # FORWARD INTERDEPENDENCY RESOLUTION -- Updated model parsers to reflect defined entities
-            # 1. Find any defined entities in the element e.g. "Curie Temperature, Tc"
-            # 2. Update the relevant models
-            element_definitions = el.definitions
-            chemical_defs = el.chemical_definitions
-
-            for model in el._streamlined_models:
-                if hasattr(model, 'is_id_only'):
-                    model.update(chemical_defs)
-                else:
-                    model.update(element_definitions)
-
-            el_records = el.records
-            # Save the title compound
-            if isinstance(el, Title):
-                if len(el_records) == 1 and isinstance(el_records[0], Compound) and el_records[0].is_id_only:
-                    title_record = el_records[0]  # TODO: why the first only?
-
-            # Reset head_def_record unless consecutive heading with no records
-            if isinstance(el, Heading) and head_def_record is not None:
-                if not (i == head_def_record_i + 1 and len(el.records) == 0):
-                    head_def_record = None
-                    head_def_record_i = None
-
-            # Paragraph with single sentence with single ID record considered a head_def_record
-            if isinstance(el, Paragraph) and len(el.sentences) == 1:
-                if len(el_records) == 1 and isinstance(el_records[0], Compound) and el_records[0].is_id_only:
-                    head_def_record = el_records[0]
-                    head_def_record_i = i
-
-            # Paragraph with multiple sentences
-            # We assume that if the first sentence of a paragraph contains only 1 ID Record, we can treat it as a header definition record, unless directly proceeding a header def record
-            elif isinstance(el, Paragraph) and len(el.sentences) > 0:
-                if not (isinstance(self.elements[i - 1], Heading) and head_def_record_i == i - 1):
-                    first_sent_records = el.sentences[0].records
-                    if len(first_sent_records) == 1 and isinstance(first_sent_records[0], Compound) and first_sent_records[0].is_id_only:
-                        sent_record = first_sent_records[0]
-                        if sent_record.labels or (sent_record.names and len(sent_record.names[0]) > len(el.sentences[0].text) / 2):  # TODO: Why do the length check?
-                            head_def_record = sent_record
-                            head_def_record_i = i
-
-            #: BACKWARD INTERDEPENDENCY RESOLUTION BEGINS HERE
-            for record in el_records:
-                if isinstance(record, MetaData):
-                    continue
-                if isinstance(record, Compound):
-                    # Keep track of the most recent compound record with labels
-                    if isinstance(el, Paragraph) and record.labels:
-                        last_id_record = record
-                    # # Keep track of the most recent compound 'product' record
-                    if 'product' in record.roles:
-                        last_product_record = record
-
-                    # Heading records with compound ID's
-                    if isinstance(el, Heading) and (record.labels or record.names):
-                        head_def_record = record
+            with context:
+                log.debug("Element %d, type %s" %(i, str(type(el))))
+                last_id_record = None
+
+                # FORWARD INTERDEPENDENCY RESOLUTION -- Updated model parsers to reflect defined entities
+                # 1. Find any defined entities in the element e.g. "Curie Temperature, Tc"
+                # 2. Update the relevant models
+                element_definitions = el.definitions
+                chemical_defs = el.chemical_definitions
+
+                for model in el._streamlined_models:
+                    if hasattr(model, 'is_id_only'):
+                        model.update(chemical_defs)
+                    else:
+                        model.update(element_definitions)
+
+                el_records = el.records
+                bound_records = []
+                # Save the title compound
+                if isinstance(el, Title):
+                    if len(el_records) == 1 and isinstance(el_records[0], Compound) and el_records[0].is_id_only:
+                        title_record = el_records[0]  # TODO: why the first only?
+
+                # Reset head_def_record unless consecutive heading with no records
+                if isinstance(el, Heading) and head_def_record is not None:
+                    if not (i == head_def_record_i + 1 and len(el.records) == 0):
+                        head_def_record = None
+                        head_def_record_i = None
+
+                # Paragraph with single sentence with single ID record considered a head_def_record
+                if isinstance(el, Paragraph) and len(el.sentences) == 1:
+                    if len(el_records) == 1 and isinstance(el_records[0], Compound) and el_records[0].is_id_only:
+                        head_def_record = el_records[0]
                         head_def_record_i = i
-                        # If 2 consecutive headings with compound ID, merge in from previous
-                        if i > 0 and isinstance(self.elements[i - 1], Heading):
-                            prev = self.elements[i - 1]
-                            if (len(el.records) == 1 and record.is_id_only and len(prev.records) == 1 and
-                                isinstance(prev.records[0], Compound) and prev.records[0].is_id_only and not (record.labels and prev.records[0].labels) and
-                                    not (record.names and prev.records[0].names)):
-                                record.names.extend(prev.records[0].names)
-                                record.labels.extend(prev.records[0].labels)
-                                record.roles.extend(prev.records[0].roles)
-
-                # Unidentified records -- those without compound names or labels
-                if record.is_unidentified:
-                    if hasattr(record, 'compound'):
-                        # We have property values but no names or labels... try merge those from previous records
-                        if isinstance(el, Paragraph) and (head_def_record or last_product_record or last_id_record or title_record):
-                            # head_def_record from heading takes priority if the heading directly precedes the paragraph ( NOPE: or the last_id_record has no name)
-                            if head_def_record_i and head_def_record_i + 1 == i: # or (last_id_record and not last_id_record.names)):
-                                if head_def_record:
-                                    record.compound = head_def_record
-                                elif last_id_record:
-                                    record.compound = last_id_record
-                                elif last_product_record:
-                                    record.compound = last_product_record
-                                elif title_record:
-                                    record.compound = title_record
+
+                # Paragraph with multiple sentences
+                # We assume that if the first sentence of a paragraph contains only 1 ID Record, we can treat it as a header definition record, unless directly proceeding a header def record
+                elif isinstance(el, Paragraph) and len(el.sentences) > 0:
+                    if not (isinstance(self.elements[i - 1], Heading) and head_def_record_i == i - 1):
+                        first_sent_records = el.sentences[0].records
+                        if len(first_sent_records) == 1 and isinstance(first_sent_records[0], Compound) and first_sent_records[0].is_id_only:
+                            sent_record = first_sent_records[0]
+                            if sent_record.labels or (sent_record.names and len(sent_record.names[0]) > len(el.sentences[0].text) / 2):  # TODO: Why do the length check?
+                                head_def_record = sent_record
+                                head_def_record_i = i
+
+                #: BACKWARD INTERDEPENDENCY RESOLUTION BEGINS HERE
+                for record in el_records:
+                    if isinstance(record, MetaData):
+                        continue
+                    if isinstance(record, Compound):
+                        # Keep track of the most recent compound record with labels
+                        if isinstance(el, Paragraph) and record.labels:
+                            last_id_record = record
+                        # # Keep track of the most recent compound 'product' record
+                        if 'product' in record.roles:
+                            last_product_record = record
+
+                        # Heading records with compound ID's
+                        if isinstance(el, Heading) and (record.labels or record.names):
+                            head_def_record = record
+                            head_def_record_i = i
+                            # If 2 consecutive headings with compound ID, merge in from previous
+                            if i > 0 and isinstance(self.elements[i - 1], Heading):
+                                prev = self.elements[i - 1]
+                                if (len(el.records) == 1 and record.is_id_only and len(prev.records) == 1 and
+                                    isinstance(prev.records[0], Compound) and prev.records[0].is_id_only and not (record.labels and prev.records[0].labels) and
+                                        not (record.names and prev.records[0].names)):
+                                    record.names.extend(prev.records[0].names)
+                                    record.labels.extend(prev.records[0].labels)
+                                    record.roles.extend(prev.records[0].roles)
+
+                    # Unidentified records -- those without compound names or labels
+                    if record.is_unidentified:
+                        if hasattr(record, 'compound'):
+                            # We have property values but no names or labels... try merge those from previous records
+                            if isinstance(el, Paragraph) and (head_def_record or last_product_record or last_id_record or title_record):
+                                # head_def_record from heading takes priority if the heading directly precedes the paragraph ( NOPE: or the last_id_record has no name)
+                                if head_def_record_i and head_def_record_i + 1 == i: # or (last_id_record and not last_id_record.names)):
+                                    if head_def_record:
+                                        record.compound = head_def_record
+                                    elif last_id_record:
+                                        record.compound = last_id_record
+                                    elif last_product_record:
+                                        record.compound = last_product_record
+                                    elif title_record:
+                                        record.compound = title_record
+                                else:
+                                    if last_id_record:
+                                        record.compound = last_id_record
+                                    elif head_def_record:
+                                        record.compound = head_def_record
+                                    elif last_product_record:
+                                        record.compound = last_product_record
+                                    elif title_record:
+                                        record.compound = title_record
                             else:
-                                if last_id_record:
-                                    record.compound = last_id_record
-                                elif head_def_record:
-                                    record.compound = head_def_record
-                                elif last_product_record:
-                                    record.compound = last_product_record
-                                elif title_record:
-                                    record.compound = title_record
-                        else:
-                            # Consider continue here to filter records missing name/label...
-                            pass
-                if record not in records:
-                    log.debug(record.serialize())
-                    records.append(record)
+                                # Consider continue here to filter records missing name/label...
+                                pass
+                    bound_records.append(record)
+            yield el, bound_records
 
-        # for record in records:
-        #     for contextual_record in contextual_records:
-        #         # record.merge_contextual(contextual_record)
-        #         contextual_record.merge_contextual(record)
-        #         if not contextual_record.is_contextual:
-        #             print("No longer contextual:", contextual_record)
-        #             records.append(contextual_record)
-        #             contextual_records.remove(contextual_record)
-        #     log.debug(records.serialize())
+    def _merge_records(self, records, abbreviation_definitions):
+        """
+        Merge records found in this Document with each other and with abbreviation definitions, and clean them up.
 
+        :param ModelList records: The records, in document order.
+        :param abbreviation_definitions: The abbreviation definitions to merge into compound names.
+        :returns: The merged records, without any that don't have all their required fields or are subsets of others.
+        :rtype: ModelList
+        """
         # Merge abbreviation definitions
         for record in records:
             compound = None
@@ -346,7 +486,7 @@ class Document(BaseDocument):
             elif isinstance(record, Compound):
                 compound = record
             if compound is not None:
-                for short, long_, entity in self.abbreviation_definitions:
+                for short, long_, entity in abbreviation_definitions:
                     if entity == 'CM':
                         name = ' '.join(long_)
                         abbrev = ' '.join(short)
@@ -356,56 +496,9 @@ class Document(BaseDocument):
                             compound.names.append(name)
 
         # Merge Compound records with any shared name/label
-        len_l = len(records)
         log.debug(records)
-        i = 0
-        while i < (len_l - 1):
-            j = i + 1
-            while j < len_l:
-                r = records[i]
-                other_r = records[j]
-                r_compound = None
-                if isinstance(r, Compound):
-                    r_compound = r
-                elif hasattr(r, 'compound') and isinstance(r.compound, Compound):
-                    r_compound = r.compound
-                other_r_compound = None
-                if isinstance(other_r, Compound):
-                    other_r_compound = other_r
-                elif hasattr(other_r, 'compound') and isinstance(other_r.compound, Compound):
-                    other_r_compound = other_r.compound
-                if r_compound and other_r_compound:
-                    # Strip whitespace and lowercase to compare names
-                    rnames_std = {''.join(n.split()).lower() for n in r_compound.names}
-                    onames_std = {''.join(n.split()).lower() for n in other_r_compound.names}
-
-                    # Clashing labels, don't merge
-                    if len(set(r_compound.labels) - set(other_r_compound.labels)) > 0 and len(set(other_r_compound.labels) - set(r_compound.labels)) > 0:
-                        j += 1
-                        continue
-
-                    if any(n in rnames_std for n in onames_std) or any(l in r_compound.labels for l in other_r_compound.labels):
-                        r_compound.merge(other_r_compound)
-                        other_r_compound.merge(r_compound)
-                        if isinstance(r, Compound) and isinstance(other_r, Compound):
-                            records.pop(j)
-                            records.pop(i)
-                            records.append(r_compound)
-                            len_l -= 1
-                            i -= 1
-                        break
-                j += 1
-            i += 1
-
-        i = 0
-        length = len(records)
-        while i < length:
-            j = 0
-            while j < length:
-                if i != j:
-                    records[j].merge_contextual(records[i])
-                j += 1
-            i += 1
+        records = self._merge_compound_records(records)
+        self._merge_contextual_records(records)
 
         # clean up records
         cleaned_records = ModelList()
@@ -416,18 +509,192 @@ class Document(BaseDocument):
                     cleaned_records.append(record)
 
         cleaned_records.remove_subsets()
+        return cleaned_records
 
-        # Reset updatables
-        for el in self.elements:
-            for model in el._streamlined_models:
-                model.reset_updatables()
-
-        # Append contextual records if they've filled required fields
-        # for record in contextual_records:
-        #     if record.required_fulfilled:
-        #         records.append(record)
+    @staticmethod
+    def _record_compound(record):
+        """The Compound a record is about: the record itself if it is a Compound, otherwise its compound field."""
+        if isinstance(record, Compound):
+            return record
+        if hasattr(record, 'compound') and isinstance(record.compound, Compound):
+            return record.compound
+        return None
+
+    def _merge_compound_records(self, records):
+        """
+        Merge the compounds of records that share a name or label, unless their labels clash. Compound records that
+        are merged together are replaced by a single record at the end of the list.
+
+        Each record is merged with the first record after it that shares a name or label, as found from an index of
+        the names and labels of the compounds, rather than by comparing every pair of records.
+
+        :param ModelList records: The records, in document order.
+        :returns: The merged records.
+        :rtype: ModelList
+        """
+        # Position of each record in the order it is visited, with None where a record has been removed or moved
+        order = list(records)
+        position = {}
+        # Ids of the records whose compound has each standardised name or label, and the records with each compound
+        name_index = collections.defaultdict(set)
+        label_index = collections.defaultdict(set)
+        compound_records = collections.defaultdict(list)
+
+        def index(compound):
+            for holder in compound_records[id(compound)]:
+                for name in compound.names:
+                    name_index[''.join(name.split()).lower()].add(id(holder))
+                for label in compound.labels:
+                    label_index[label].add(id(holder))
+
+        for k, record in enumerate(order):
+            position[id(record)] = k
+            compound = self._record_compound(record)
+            if compound is not None:
+                compound_records[id(compound)].append(record)
+        for record in order:
+            compound = self._record_compound(record)
+            if compound is not None:
+                index(compound)
 
-        return cleaned_records
+        len_l = len(order)
+        i = 0
+        k = 0
+        while i < (len_l - 1):
+            while order[k] is None:
+                k += 1
+            r = order[k]
+            r_compound = self._record_compound(r)
+            moved = False
+            if r_compound is not None:
+                # Strip whitespace and lowercase to compare names
+                rnames_std = {''.join(n.split()).lower() for n in r_compound.names}
+                candidates = set()
+                for name in rnames_std:
+                    candidates.update(name_index.get(name, ()))
+                for label in r_compound.labels:
+                    candidates.update(label_index.get(label, ()))
+                candidates = sorted(position[c] for c in candidates if position[c] is not None and position[c] > k)
+                for j in candidates:
+                    other_r = order[j]
+                    other_r_compound = self._record_compound(other_r)
+                    # Clashing labels, don't merge
+                    if len(set(r_compound.labels) - set(other_r_compound.labels)) > 0 and len(set(other_r_compound.labels) - set(r_compound.labels)) > 0:
+                        continue
+                    r_compound.merge(other_r_compound)
+                    other_r_compound.merge(r_compound)
+                    index(r_compound)
+                    index(other_r_compound)
+                    if isinstance(r, Compound) and isinstance(other_r, Compound):
+                        # Replace both with the merged record at the end
+                        order[j] = None
+                        position[id(other_r)] = None
+                        order[k] = None
+                        order.append(r)
+                        position[id(r)] = len(order) - 1
+                        len_l -= 1
+                        moved = True
+                    break
+            if not moved:
+                i += 1
+            k += 1
+        return ModelList(*[record for record in order if record is not None])
+
+    @staticmethod
+    def _merge_contextual_records(records):
+        """
+        Merge contextual fields between every pair of records, in the same order as comparing all pairs.
+
+        Only pairs where the target can take information from the source are compared: those where the source can fill
+        a contextual model field of the target, and those of the same type with no conflicting field values, as found
+        from an index of the field values of the targets. Targets that already have all their contextual fields are
+        skipped, as nothing more can be merged into them.
+
+        :param ModelList records: The records to merge, which are modified in place.
+        """
+        record_types = set(type(record) for record in records)
+        # Binding fields can be overwritten by any merge, so only use the indexes if there are none
+        indexed = not any(field.binding for record_type in record_types for model in record_type.flatten()
+                          for field in model.fields.values())
+        # Indices of the records of each type, and of those with each value (or any value) of each field
+        by_type = collections.defaultdict(list)
+        by_value = collections.defaultdict(set)
+        any_value = collections.defaultdict(set)
+        keys = {}
+
+        def index(j):
+            record = records[j]
+            record_type = type(record)
+            old_keys = keys.get(j, {})
+            new_keys = dict(record._match_keys())
+            for field_name, field in six.iteritems(record.fields):
+                if hasattr(field, 'model_class'):
+                    continue
+                if field_name in old_keys:
+                    by_value[(record_type, field_name, old_keys[field_name])].discard(j)
+                else:
+                    any_value[(record_type, field_name)].discard(j)
+                if field_name in new_keys:
+                    by_value[(record_type, field_name, new_keys[field_name])].add(j)
+                else:
+                    any_value[(record_type, field_name)].add(j)
+            keys[j] = new_keys
+
+        for j, record in enumerate(records):
+            by_type[type(record)].append(j)
+            if indexed:
+                index(j)
+
+        def is_open(j, field_name):
+            # Once a field has a model with all its contextual fields, nothing more can be merged into it
+            value = records[j][field_name]
+            return value is None or not value.contextual_fulfilled
+
+        # Contextual model fields of the target type that the source type can fill
+        fillable_fields = {}
+        # Indices of the records of each type that could still have a model merged into each contextual model field
+        open_fields = {}
+        fulfilled = set()
+        for i, source in enumerate(records):
+            source_type = type(source)
+            candidates = set()
+            for target_type in record_types:
+                if target_type == source_type:
+                    if indexed:
+                        # Records of the same type can only merge if they have no conflicting values
+                        matches = [by_value[(target_type, field_name, value)] | any_value[(target_type, field_name)]
+                                   for field_name, value in source._match_keys()]
+                        candidates.update(min(matches, key=len) if matches else by_type[target_type])
+                    else:
+                        candidates.update(by_type[target_type])
+                    continue
+                if (target_type, source_type) not in fillable_fields:
+                    fillable_fields[(target_type, source_type)] = [
+                        field_name for field_name, field in six.iteritems(target_type.fields)
+                        if field.contextual and hasattr(field, 'model_class') and issubclass(source_type, field.model_class)
+                    ]
+                for field_name in fillable_fields[(target_type, source_type)]:
+                    if not indexed:
+                        candidates.update(by_type[target_type])
+                        break
+                    if (target_type, field_name) not in open_fields:
+                        open_fields[(target_type, field_name)] = set(j for j in by_type[target_type] if is_open(j, field_name))
+                    candidates.update(open_fields[(target_type, field_name)])
+            for j in sorted(candidates - fulfilled):
+                if i == j:
+                    continue
+                target = records[j]
+                if indexed and target.contextual_fulfilled:
+                    fulfilled.add(j)
+                    continue
+                merged = target.merge_contextual(source)
+                if indexed and merged:
+                    if type(target) == source_type:
+                        index(j)
+                    else:
+                        for field_name in fillable_fields[(type(target), source_type)]:
+                            if not is_open(j, field_name):
+                                open_fields[(type(target), field_name)].discard(j)
 
     def get_element_with_id(self, id):
         """
@@ -229,8 +229,13 @@ class CaptionedElement(BaseElement):
     @models.setter
     def models(self, value):
         self._models = value
+        self._streamlined_models_list = None
         self.caption.models = value
 
+    def annotate(self):
+        """Compute the NLP annotations for the caption. See :meth:`~chemdataextractor.doc.document.Document.annotate`."""
+        self.caption.annotate()
+
     def serialize(self):
         """
         Convert self to a dictionary. The key 'type' will contain
@@ -12,21 +12,32 @@ import logging
 
 from .element import CaptionedElement
 from ..model import ModelList, Compound
+from ..utils import memoized_property
 log = logging.getLogger(__name__)
 
 
 class Figure(CaptionedElement):
 
-    def __init__(self, caption, label=None, links=None, models=None, **kwargs):
+    def __init__(self, caption, label=None, links=None, models=None, lazy=False, **kwargs):
         """
         Create a new Figure element, to interface with FDE
+
+        :param bool lazy: (Optional) Whether to tag the caption when its tokens are first used, instead of now. Its
+            quantities are then split into value and unit tokens using the models that are set at that point, as for
+            other elements, rather than those set now. Default False.
         """
         super(Figure, self).__init__(caption=caption, label=label, models=models, **kwargs)
         self.links = links
-        self.caption_tokens = []
+        if not lazy:
+            self.caption_tokens
+
+    @memoized_property
+    def caption_tokens(self):
+        """The tagged tokens of every sentence of the caption."""
+        caption_tokens = []
         for sent in self.caption.sentences:
-            self.caption_tokens.extend(sent.tagged_tokens)
-    
+            caption_tokens.extend(sent.tagged_tokens)
+        return caption_tokens
 
     @property
     def records(self):
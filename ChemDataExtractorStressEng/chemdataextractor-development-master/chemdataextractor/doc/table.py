@@ -15,6 +15,7 @@ from __future__ import unicode_literals
 
 import logging
 import copy
+import multiprocessing
 import six
 
 from .element import CaptionedElement
@@ -30,9 +31,69 @@ log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
 
+def _run_tde(args):
+    """Analyse table data with TableDataExtractor. A module-level function, so it can be run in worker processes.
+
+    :param tuple args: The table data, and the keyword arguments for TableDataExtractor.
+    :returns: The TDE table, its subtables and its title row, or None, [] and None if the data could not be analysed.
+    :rtype: tuple
+    """
+    table_data, kwargs = args
+    try:
+        # Can pass any kwargs into TDE directly
+        tde_table = TdeTable(table_data, **kwargs)
+
+    except (TDEError, TypeError) as e:
+        log.error("TableDataExtractor 'Table' error: {}".format(e))
+        log.info("Attempting TableDataExtractor 'TrivialTable' interpretation.")
+
+        try:
+            # TableDataExtractor `TrivialTable` object
+            tde_table = TrivialTdeTable(
+                table_data, standardize_empty_data=True, **kwargs
+            )
+        except (TDEError, TypeError) as e:
+            log.error("TableDataExtractor 'TrivialTable' error: {}".format(e))
+            return None, [], None
+
+    # get the subtables, and adjust the CDE Table heading from TDE results
+    return tde_table, tde_table.subtables, tde_table.title_row if tde_table.title_row is not None else []
+
+
+def analyse_tables(tables, processes=None, pool=None):
+    """Analyse the data of tables with TableDataExtractor as a batch, rather than each table when it is first used.
+
+    Usage::
+
+        analyse_tables(doc.tables, processes=4)
+
+    :param list[Table] tables: The tables. Tables that have already been analysed are skipped.
+    :param int processes: (Optional) The number of worker processes to analyse the tables in. If not set, or if
+        running in a daemonic process such as a pool worker, which can't start processes of its own, the tables are
+        analysed in this process.
+    :param multiprocessing.pool.Pool pool: (Optional) A pool of worker processes to use, instead of starting one.
+    """
+    pending = [table for table in tables if not table._tde_analysed]
+    args = [(table._table_data, table._tde_kwargs) for table in pending]
+    if pool is not None:
+        results = pool.map(_run_tde, args)
+    elif processes and processes > 1 and len(pending) > 1 and not multiprocessing.current_process().daemon:
+        pool = multiprocessing.Pool(min(processes, len(pending)))
+        try:
+            results = pool.map(_run_tde, args)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        results = [_run_tde(arg) for arg in args]
+    for table, result in zip(pending, results):
+        table._set_analysis(result)
+
+
 class Table(CaptionedElement):
     """
-    Main Table object. Relies on TableDataExtractor.
+    Main Table object. Relies on TableDataExtractor, which analyses the table data when the TDE table is first used.
     """
 
     def __init__(self, caption, label=None, table_data=[], models=None, **kwargs):
@@ -60,35 +121,49 @@ class Table(CaptionedElement):
         :param Document document: (Optional) The document containing this element.
         :param Any id: (Optional) Some identifier for this element. Must be equatable.
         """
+        #: Cells for each category table of a TDE table, keyed by the id of the TDE table
+        self._cde_tables_cache = {}
         super(Table, self).__init__(
             caption=caption, label=label, models=models, **kwargs
         )
-        try:
-            #: TableDataExtractor `Table` object. Can pass any kwargs into TDE directly.
-            self.tde_table = TdeTable(table_data, **kwargs)
+        # The table data is only analysed by TableDataExtractor when the TDE table is first used, so reading a document
+        # for its metadata or text doesn't run the analysis of every table
+        self._table_data = table_data
+        self._tde_kwargs = kwargs
+        self._tde_analysed = False
+
+    def _analyse(self):
+        """Analyse the table data with TableDataExtractor, setting :attr:`tde_table`, :attr:`tde_subtables` and
+        :attr:`heading`."""
+        self._set_analysis(_run_tde((self._table_data, self._tde_kwargs)))
+
+    def _set_analysis(self, result):
+        """Set the result of analysing the table data, as returned by :func:`_run_tde`."""
+        self._tde_table, self._tde_subtables, self._heading = result
+        self._tde_analysed = True
+        # TDE keeps its own copy of the data
+        self._table_data = None
 
-        except (TDEError, TypeError) as e:
-            log.error("TableDataExtractor 'Table' error: {}".format(e))
-            log.info("Attempting TableDataExtractor 'TrivialTable' interpretation.")
-
-            try:
-                #: TableDataExtractor `TrivialTable` object. Can pass any kwargs into TDE directly.
-                self.tde_table = TrivialTdeTable(
-                    table_data, standardize_empty_data=True, **kwargs
-                )
-            except (TDEError, TypeError) as e:
-                log.error("TableDataExtractor 'TrivialTable' error: {}".format(e))
-                self.tde_subtables = []
-                self.tde_table = None
-                self.heading = None
-
-        if self.tde_table is not None:
-            # get the subtables
-            self.tde_subtables = self.tde_table.subtables
-            # adjust the CDE Table heading from TDE results
-            self.heading = (
-                self.tde_table.title_row if self.tde_table.title_row is not None else []
-            )
+    @property
+    def tde_table(self):
+        """TableDataExtractor `Table` object, or None if the table data could not be analysed."""
+        if not self._tde_analysed:
+            self._analyse()
+        return self._tde_table
+
+    @property
+    def tde_subtables(self):
+        """The subtables of the TableDataExtractor `Table` object."""
+        if not self._tde_analysed:
+            self._analyse()
+        return self._tde_subtables
+
+    @property
+    def heading(self):
+        """The title row of the TableDataExtractor `Table` object."""
+        if not self._tde_analysed:
+            self._analyse()
+        return self._heading
 
     def serialize(self):
         """
@@ -106,6 +181,57 @@ class Table(CaptionedElement):
     def definitions(self):
         return self.caption.definitions
 
+    @property
+    def models(self):
+        return self._models
+
+    @models.setter
+    def models(self, value):
+        self._models = value
+        self._streamlined_models_list = None
+        self.caption.models = value
+        for cde_tables in self._cde_tables_cache.values():
+            for cde_table in cde_tables:
+                for cde_cell in cde_table:
+                    cde_cell.models = value
+
+    @property
+    def _tde_tables(self):
+        """The TDE tables that records are parsed from: the subtables if there are any, otherwise the whole table."""
+        if self.tde_subtables:
+            return self.tde_subtables
+        elif self.tde_table is not None:
+            return [self.tde_table]
+        return []
+
+    def annotate(self):
+        """Compute the NLP annotations for the caption and every cell. See :meth:`~chemdataextractor.doc.document.Document.annotate`."""
+        self.caption.annotate()
+        for table in self._tde_tables:
+            for cde_table in self._cde_tables(table):
+                for cde_cell in cde_table:
+                    cde_cell.annotate()
+
+    def _cde_tables(self, table):
+        """
+        The category tables of a TDE table as lists of :class:`~chemdataextractor.doc.text.Cell`.
+        The cells are only created once, so their tokens and tags are reused whichever models the table is parsed with.
+
+        :param table: Input TableDataExtractor object
+        :type table: TableDataExtractor.Table
+        :return: list of category tables (lists of Cell objects)
+        """
+        if id(table) not in self._cde_tables_cache:
+            cde_tables = []
+            for category_table in self._category_tables(table):
+                cde_table = []
+                for cell in category_table:
+                    cde_cell = Cell.from_tdecell(cell, models=self.models)
+                    cde_table.append(cde_cell)
+                cde_tables.append(cde_table)
+            self._cde_tables_cache[id(table)] = cde_tables
+        return self._cde_tables_cache[id(table)]
+
     def _parse_table(self, parser, cde_table):
         """
         Parses a table. The model and the category table have to be provided.
@@ -131,14 +257,9 @@ class Table(CaptionedElement):
     def records(self):
         table_records = []
         caption_records = self.caption.records
-        if self.tde_subtables:
-            for subtable in self.tde_subtables:
-                table_records.extend(
-                    self._records_for_tde_table(subtable, caption_records)
-                )
-        elif not self.tde_subtables and self.tde_table is not None:
+        for table in self._tde_tables:
             table_records.extend(
-                self._records_for_tde_table(self.tde_table, caption_records)
+                self._records_for_tde_table(table, caption_records)
             )
         return table_records
 
@@ -164,13 +285,7 @@ class Table(CaptionedElement):
             caption_records = ModelList()
 
         # Create a representation of the table that is more amenable to parsing
-        cde_tables = []
-        for category_table in self._category_tables(table):
-            cde_table = []
-            for cell in category_table:
-                cde_cell = Cell.from_tdecell(cell, models=self.models)
-                cde_table.append(cde_cell)
-            cde_tables.append(cde_table)
+        cde_tables = self._cde_tables(table)
 
         # Step 1
         table_records = ModelList()
@@ -11,14 +11,14 @@ from __future__ import unicode_literals
 from abc import abstractproperty
 import collections
 import logging
-import re
 from pprint import pprint
 
 import six
 
 from ..model.base import ModelList
 from ..nlp.lexicon import ChemLexicon, Lexicon
-from ..nlp.cem import CemTagger, IGNORE_PREFIX, IGNORE_SUFFIX, SPECIALS, SPLITS, CiDictCemTagger, CsDictCemTagger, CrfCemTagger
+from ..nlp.cem import (CemTagger, CiDictCemTagger, CsDictCemTagger, CrfCemTagger, ignored_prefix, ignored_suffix,
+                       is_split, match_special)
 from ..nlp.abbrev import ChemAbbreviationDetector
 from ..nlp.tag import NoneTagger
 from ..nlp.pos import ChemCrfPosTagger, CrfPosTagger, ApPosTagger, ChemApPosTagger
@@ -34,6 +34,28 @@ from ..model.model import Compound, NmrSpectrum, IrSpectrum, UvvisSpectrum, Melt
 log = logging.getLogger(__name__)
 
 
+def tag_sentences(sentences):
+    """
+    Part of speech and named entity tag a batch of :class:`Sentence` s, with one call to ``tag_sents`` for all the
+    sentences that share a tagger. The results are memoized on each sentence, exactly as if
+    :attr:`~Sentence.pos_tagged_tokens` and :attr:`~Sentence.unprocessed_ner_tagged_tokens` had been computed one
+    sentence at a time. Sentences that have already been tagged are left as they are.
+
+    :param list(Sentence) sentences: The sentences to tag.
+    """
+    sentences = list(sentences)
+    for tagger_name, tagged_name, tokens_name in [('pos_tagger', '_pos_tagged_tokens', 'raw_tokens'),
+                                                  ('ner_tagger', '_unprocessed_ner_tagged_tokens', 'pos_tagged_tokens')]:
+        batches = collections.OrderedDict()
+        for sentence in sentences:
+            if not hasattr(sentence, tagged_name):
+                batches.setdefault(getattr(sentence, tagger_name), []).append(sentence)
+        for tagger, batch in batches.items():
+            tagged_sents = tagger.tag_sents([getattr(sentence, tokens_name) for sentence in batch])
+            for sentence, tagged_sent in zip(batch, tagged_sents):
+                setattr(sentence, tagged_name, tagged_sent)
+
+
 @python_2_unicode_compatible
 class BaseText(BaseElement):
     """Abstract base class for a text Document Element."""
@@ -219,11 +241,29 @@ class Text(collections.Sequence, BaseText):
             if 'PARSERS' in c.keys():
                 raise(DeprecationWarning('Manually setting parsers deprecated, any settings from config files for this will be ignored.'))
 
+    @property
+    def models(self):
+        return self._models
+
+    @models.setter
+    def models(self, value):
+        self._models = value
+        self._streamlined_models_list = None
+        # Sentences that have already been created keep their annotations, but must parse with the new models
+        for sentence in getattr(self, '_sentences', []):
+            sentence.models = value
+
     @memoized_property
     def sentences(self):
         """A list of :class:`Sentence` s that make up this text passage."""
         return self.sentence_tokenizer.get_sentences(self)
 
+    def annotate(self):
+        """Compute the NLP annotations for every sentence. See :meth:`~chemdataextractor.doc.document.Document.annotate`."""
+        tag_sentences(self.sentences)
+        for sentence in self.sentences:
+            sentence.annotate()
+
     def _sentences_from_spans(self, spans):
         sents = []
         for span in spans:
@@ -346,6 +386,7 @@ class Text(collections.Sequence, BaseText):
     @property
     def records(self):
         """All records found in the object, as a list of :class:`~chemdataextractor.model.base.BaseModel`."""
+        tag_sentences(self.sentences)
         return ModelList(*[r for sent in self.sentences for r in sent.records])
 
     def __add__(self, other):
@@ -503,6 +544,16 @@ class Sentence(BaseText):
         """A list of :class:`str` representations for the tokens in the object."""
         return [token.text for token in self.tokens]
 
+    def annotate(self):
+        """
+        Compute and memoize the annotations of this sentence that do not depend on its models: tokens, part of speech
+        tags, named entity tags, abbreviation definitions and specifier and chemical label definitions.
+        """
+        self.tags
+        self.abbreviation_definitions
+        self.definitions
+        self.chemical_definitions
+
     @memoized_property
     def pos_tagged_tokens(self):
         """A list of (:class:`Token` token, :class:`str` tag) tuples for each sentence in this sentence."""
@@ -609,16 +660,12 @@ class Sentence(BaseText):
             end = tokens[-1].end
             # Adjust boundaries to exclude disallowed prefixes/suffixes
             currenttext = self.text[start-self.start:end-self.start].lower()
-            for prefix in IGNORE_PREFIX:
-                if currenttext.startswith(prefix):
-                    # print('%s removing %s' % (currenttext, prefix))
-                    start += len(prefix)
-                    break
-            for suffix in IGNORE_SUFFIX:
-                if currenttext.endswith(suffix):
-                    # print('%s removing %s' % (currenttext, suffix))
-                    end -= len(suffix)
-                    break
+            prefix = ignored_prefix(currenttext)
+            if prefix:
+                start += len(prefix)
+            suffix = ignored_suffix(currenttext)
+            if suffix:
+                end -= len(suffix)
             # Adjust boundaries to exclude matching brackets at start and end
             currenttext = self.text[start-self.start:end-self.start]
             for bpair in [('(', ')'), ('[', ']')]:
@@ -643,31 +690,23 @@ class Sentence(BaseText):
             # Do splits
             split_spans = []
             comps = list(regex_span_tokenize(currenttext, '(-|\+|\)?-to-\(?|···|/|\s)'))
-            if len(comps) > 1:
-                for split in SPLITS:
-                    if all(re.search(split, currenttext[comp[0]:comp[1]]) for comp in comps):
-                        # print('%s splitting %s' % (currenttext, [currenttext[comp[0]:comp[1]] for comp in comps]))
-                        for comp in comps:
-                            span = Span(text=currenttext[comp[0]:comp[1]], start=start+comp[0], end=start+comp[1])
-                            # print('SPLIT: %s - %s' % (currenttext, repr(span)))
-                            split_spans.append(span)
-                        break
-                else:
-                    split_spans.append(Span(text=currenttext, start=start, end=end))
+            if len(comps) > 1 and is_split([currenttext[comp[0]:comp[1]] for comp in comps]):
+                for comp in comps:
+                    span = Span(text=currenttext[comp[0]:comp[1]], start=start+comp[0], end=start+comp[1])
+                    # print('SPLIT: %s - %s' % (currenttext, repr(span)))
+                    split_spans.append(span)
             else:
                 split_spans.append(Span(text=currenttext, start=start, end=end))
 
             # Do specials
             for split_span in split_spans:
-                for special in SPECIALS:
-                    m = re.search(special, split_span.text)
-                    if m:
-                        # print('%s special %s' % (split_span.text, m.groups()))
-                        for i in range(1, len(m.groups()) + 1):
-                            span = Span(text=m.group(i), start=split_span.start+m.start(i), end=split_span.start+m.end(i))
-                            # print('SUBMATCH: %s - %s' % (currenttext, repr(span)))
-                            spans.append(span)
-                        break
+                m = match_special(split_span.text)
+                if m:
+                    # print('%s special %s' % (split_span.text, m.groups()))
+                    for i in range(1, len(m.groups()) + 1):
+                        span = Span(text=m.group(i), start=split_span.start+m.start(i), end=split_span.start+m.end(i))
+                        # print('SUBMATCH: %s - %s' % (currenttext, repr(span)))
+                        spans.append(span)
                 else:
                     spans.append(split_span)
         return spans
@@ -844,6 +883,10 @@ class Cell(Sentence):
         # print(cell._streamlined_models, construct_quantity_re(*cell._streamlined_models))
         return cell
 
+    def annotate(self):
+        """Compute and memoize the tokens and tags of this cell, which are all that table parsers use."""
+        self.tags
+
     @memoized_property
     def abbreviation_definitions(self):
         """Empty list. Abbreviation detection is disabled within table cells."""
@@ -9,5 +9,5 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from .base import BaseType, StringType, FloatType, ModelType, ListType, BaseModel, ModelList
+from .base import BaseType, StringType, FloatType, ModelType, ListType, BaseModel, ModelList, UpdatableContext
 from .model import *
@@ -15,6 +15,7 @@ from collections import MutableSequence
 import json
 import logging
 from pprint import pprint
+import threading
 
 import six
 
@@ -25,6 +26,48 @@ from ..parse.auto import AutoSentenceParser, AutoTableParser
 log = logging.getLogger(__name__)
 
 
+class UpdatableContext(object):
+    """
+    Holds changes to the updatable fields of models, such as the specifiers and chemical labels defined in a document,
+    separately from the model classes.
+
+    While a context is active in a thread, :meth:`BaseModel.update` and :meth:`BaseModel.reset_updatables` change the
+    context rather than the classes, and parsers in that thread see the parse expressions from the context. This lets
+    several documents be processed at once in different threads. Outside any context, the classes are changed as
+    before.
+
+    Usage::
+
+        context = UpdatableContext()
+        with context:
+            YieldStrength.update(definitions)
+            records = sentence.records
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        #: Updated parse expressions, by field
+        self.parse_expressions = {}
+        #: Whether each model class was updated
+        self.updated = {}
+
+    @classmethod
+    def current(cls):
+        """The active context in this thread, or None if there isn't one."""
+        stack = getattr(cls._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def __enter__(self):
+        if getattr(self._local, 'stack', None) is None:
+            self._local.stack = []
+        self._local.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._local.stack.pop()
+
+
 class BaseType(six.with_metaclass(ABCMeta)):
 
     # This is assigned by ModelMeta to match the attribute on the Model
@@ -45,26 +88,47 @@ class BaseType(six.with_metaclass(ABCMeta)):
         self.null = null
         self.required = required
         self.contextual = contextual
-        self.parse_expression = parse_expression
+        self._parse_expression = parse_expression
         self.updatable = updatable
         self.binding = binding
         if self.parse_expression is None and self.updatable:
             print('No parse_expression supplied but updatable set as True for ', type(self))
             print('updatable refers to whether parse_expression can be changed by the document as parsing occurs. Setting updatable to False.')
             self.updatable = False
-        self.parse_expression = copy.copy(parse_expression)
+        self._parse_expression = copy.copy(parse_expression)
         self._default_parse_expression = parse_expression
         # when a record is created from the table, this will be filled with the row/col header cateogry strings
         # which helps merging based on same row/column category
         self.table_row_categories = None
         self.table_col_categories = None
 
+    @property
+    def parse_expression(self):
+        """The expression for parsing this field, as updated in the active :class:`UpdatableContext` if there is one."""
+        if self.updatable:
+            context = UpdatableContext.current()
+            if context is not None and self in context.parse_expressions:
+                return context.parse_expressions[self]
+        return self._parse_expression
+
+    @parse_expression.setter
+    def parse_expression(self, value):
+        context = UpdatableContext.current()
+        if self.updatable and context is not None:
+            context.parse_expressions[self] = value
+        else:
+            self._parse_expression = value
+
     def reset(self):
         """
         Reset the parse expression to the initial value.
         """
         if self.updatable:
-            self.parse_expression = copy.copy(self._default_parse_expression)
+            context = UpdatableContext.current()
+            if context is not None:
+                context.parse_expressions.pop(self, None)
+            else:
+                self._parse_expression = copy.copy(self._default_parse_expression)
 
     def __get__(self, instance, owner):
         """Descriptor for retrieving a value from a field in a Model."""
@@ -211,7 +275,7 @@ class BaseModel(six.with_metaclass(ModelMeta)):
             if key not in raw_data:
                 setattr(self, key, copy.copy(field.default))
         self._record_method = None
-        self.was_updated = self._updated
+        self.was_updated = self._is_updated()
 
     @property
     def is_unidentified(self):
@@ -283,7 +347,7 @@ class BaseModel(six.with_metaclass(ModelMeta)):
         for key, field in six.iteritems(cls.fields):
             if cls.fields[key].updatable:
                 cls.fields[key].reset()
-                cls._updated = False
+                cls._set_updated(False)
 
     @classmethod
     def update(cls, definitions, strict=True):
@@ -299,13 +363,33 @@ class BaseModel(six.with_metaclass(ModelMeta)):
                     matches = [i for i in cls.fields[field].parse_expression.scan(definition['tokens'])]
                     # print(matches)
                     if any(matches):
-                        cls._updated = True
+                        cls._set_updated(True)
                         if strict:
                             cls.fields[field].parse_expression = cls.fields[field].parse_expression | W(str(definition['specifier']))
                         else:
                             cls.fields[field].parse_expression = cls.fields[field].parse_expression | I(str(definition['specifier']))
         return
 
+    @classmethod
+    def _set_updated(cls, updated):
+        """Record whether this model has been updated, in the active :class:`UpdatableContext` if there is one."""
+        context = UpdatableContext.current()
+        if context is not None:
+            context.updated[cls] = updated
+        else:
+            cls._updated = updated
+
+    @classmethod
+    def _is_updated(cls):
+        """Whether this model (or the nearest base class it inherits the flag from) has been updated."""
+        context = UpdatableContext.current()
+        for klass in cls.__mro__:
+            if context is not None and klass in context.updated:
+                return context.updated[klass]
+            if '_updated' in vars(klass):
+                return klass._updated
+        return False
+
     @property
     def updated(self):
         """
@@ -688,6 +772,25 @@ class BaseModel(six.with_metaclass(ModelMeta)):
             raise TypeError("Record method description is not string.")
         self._record_method = text
 
+    def _match_keys(self):
+        """
+        The (field name, value) pairs for the fields of this model that have a simple value set. A model of the same
+        type can only be a superset of this one, or be compatible with it, if its value for each of these fields is
+        the same (or, when checking compatibility, is None). Used to index models when merging.
+
+        Subclasses that relax :meth:`is_superset` or :meth:`_compatible` for a field should leave that field out.
+
+        :rtype: list[(str, Any)]
+        """
+        keys = []
+        for field_name, field in six.iteritems(self.fields):
+            if hasattr(field, 'model_class'):
+                continue
+            value = self[field_name]
+            if isinstance(value, (six.string_types, six.integer_types, float)):
+                keys.append((field_name, value))
+        return keys
+
     def _clean(self):
         for field_name, field in six.iteritems(self.fields):
             if hasattr(field, 'model_class') and self[field_name] is not None:
@@ -753,27 +856,31 @@ class ModelList(MutableSequence):
                 typed_list[type(element)] = [element]
         new_models = []
         for _, elements in six.iteritems(typed_list):
-            i = 0
             length = len(elements)
-            to_remove = []
-            # Iterate through the list of elements and if any subsets are found, add the
-            # indices to a list of values to remove
-            while i < length:
-                j = 0
-                while j < length:
-                    if i != j and elements[i].is_subset(elements[j]) and j not in to_remove:
-                        if strict and elements[i] == elements[j]:
+            # A subset has the same value as its superset in every field it has set, so only elements that share a
+            # value with an element need to be compared to it
+            index = {}
+            element_keys = []
+            for j, element in enumerate(elements):
+                keys = element._match_keys()
+                element_keys.append(keys)
+                for key in keys:
+                    index.setdefault(key, []).append(j)
+            removed = set()
+            for i, element in enumerate(elements):
+                if element_keys[i]:
+                    candidates = min((index[key] for key in element_keys[i]), key=len)
+                else:
+                    candidates = range(length)
+                for j in candidates:
+                    # Earlier elements only count if they weren't removed themselves
+                    if i != j and (j > i or j not in removed) and element.is_subset(elements[j]):
+                        if strict and element == elements[j]:
                             # Do not remove the element if it is not a strict subset depending on the value of strict
-                            pass
-                        else:
-                            to_remove.append(i)
-                    j += 1
-                i += 1
-
-            # Append any values that are not in the list of objects to remove
-            i = 0
-            while i < length:
-                if i not in to_remove:
-                    new_models.append(elements[i])
-                i += 1
+                            continue
+                        removed.add(i)
+                        break
+
+            # Append any values that are not in the set of objects to remove
+            new_models.extend(element for i, element in enumerate(elements) if i not in removed)
         self.models = new_models
@@ -295,6 +295,11 @@ class QuantityModel(six.with_metaclass(_QuantityModelMeta, BaseModel)):
                     break
         return match
 
+    def _match_keys(self):
+        # A raw value of 'NoValue' matches any other raw value
+        return [(field_name, value) for field_name, value in super(QuantityModel, self)._match_keys()
+                if not (field_name == 'raw_value' and value == 'NoValue')]
+
     def __str__(self):
         string = 'Quantity with ' + self.dimensions.__str__() + ', ' + self.units.__str__()
         string += ' and a value of ' + str(self.value)
@@ -11,6 +11,7 @@ from __future__ import unicode_literals
 import logging
 import re
 
+import dawg
 import six
 
 from ..text import bracket_level
@@ -350,6 +351,61 @@ SPECIALS = [
 ]
 
 
+# The lists above are compiled once at import, so changes to them after import have no effect
+
+#: Tries of the prefixes and reversed suffixes to ignore, with the position of each in its list
+_IGNORE_PREFIXES = dawg.DAWG(IGNORE_PREFIX)
+_IGNORE_SUFFIXES = dawg.DAWG(suffix[::-1] for suffix in IGNORE_SUFFIX)
+_IGNORE_PREFIX_ORDER = {prefix: i for i, prefix in reversed(list(enumerate(IGNORE_PREFIX)))}
+_IGNORE_SUFFIX_ORDER = {suffix[::-1]: i for i, suffix in reversed(list(enumerate(IGNORE_SUFFIX)))}
+
+_STRIP_END = frozenset(STRIP_END)
+_STRIP_START = frozenset(STRIP_START)
+
+#: All of each list of regular expressions combined into one, that matches if any of them does
+_STOP_RE = re.compile('|'.join('(?:%s)' % stop_re for stop_re in STOP_RES))
+_ANY_SPLIT = re.compile('|'.join('(?:%s)' % split for split in SPLITS))
+_ANY_SPECIAL = re.compile('|'.join('(?:%s)' % special for special in SPECIALS))
+
+_SPLITS = [re.compile(split) for split in SPLITS]
+_SPECIALS = [re.compile(special) for special in SPECIALS]
+
+
+def ignored_prefix(text):
+    """Return the first of :data:`IGNORE_PREFIX` that the text starts with, or None if it starts with none of them."""
+    prefixes = _IGNORE_PREFIXES.prefixes(text)
+    if prefixes:
+        return min(prefixes, key=_IGNORE_PREFIX_ORDER.get)
+
+
+def ignored_suffix(text):
+    """Return the first of :data:`IGNORE_SUFFIX` that the text ends with, or None if it ends with none of them."""
+    suffixes = _IGNORE_SUFFIXES.prefixes(text[::-1])
+    if suffixes:
+        return min(suffixes, key=_IGNORE_SUFFIX_ORDER.get)[::-1]
+
+
+def is_split(texts):
+    """Return True if every one of the texts matches the same regular expression in :data:`SPLITS`.
+
+    :param list(string) texts: The components of a chemical entity mention, joined by hyphens, -to-, slashes or spaces.
+    """
+    # The combined expression rules out most mentions, where a component matches none of them
+    if all(_ANY_SPLIT.search(text) for text in texts):
+        return any(all(split.search(text) for text in texts) for split in _SPLITS)
+    return False
+
+
+def match_special(text):
+    """Return the match of the first regular expression in :data:`SPECIALS` that matches the text, or None."""
+    if _ANY_SPECIAL.search(text):
+        for special in _SPECIALS:
+            match = special.search(text)
+            if match:
+                return match
+    return None
+
+
 class CiDictCemTagger(DictionaryTagger):
     """Case-insensitive CEM dictionary tagger."""
     lexicon = ChemLexicon()
@@ -504,6 +560,91 @@ class CrfCemTagger(CrfTagger):
             features.append('-lasttoken-')
         return features
 
+    def _get_sentence_features(self, tokens):
+        """Return the features of every token in a sentence, the same as :meth:`_get_features` for each in turn.
+
+        The features of each lexeme, as the token itself and as each of its neighbours, are cached on the lexeme, so
+        only the part of speech tag features are computed for each token.
+        """
+        get_features = six.get_unbound_function(type(self)._get_features)
+        if get_features is not six.get_unbound_function(CrfCemTagger._get_features):
+            # A subclass has features of its own
+            return super(CrfCemTagger, self)._get_sentence_features(tokens)
+        lexicon = self.lexicon
+        lexemes = [lexicon[token] for token, tag in tokens]
+        key = 'cem.clusters' if self.clusters else 'cem'
+        cached = self._get_cached_features(lexemes, key, self._get_lexeme_features)
+        tags = [tag for token, tag in tokens]
+        end = len(tokens) - 1
+        sentence_features = []
+        for i, (w_head, w_tail, _, _, _, _, _, _, _, _) in enumerate(cached):
+            features = w_head + ['w.tag=%s' % tags[i]] + w_tail
+            # Add features for previous tokens if present
+            if i > 0:
+                p1 = cached[i-1]
+                features += p1[2] + ['p1.tag=%s' % tags[i-1]] + p1[3]
+                if i > 1:
+                    p2 = cached[i-2]
+                    features += p2[4] + ['p2.tag=%s' % tags[i-2]] + p2[5]
+            # Add features for next tokens if present
+            if i < end:
+                n1 = cached[i+1]
+                features += n1[6] + ['n1.tag=%s' % tags[i+1]] + n1[7]
+                if i < end - 1:
+                    n2 = cached[i+2]
+                    features += n2[8] + ['n2.tag=%s' % tags[i+2]] + n2[9]
+            if i == 0:
+                features.append('-firsttoken-')
+            elif i == 1:
+                features.append('-secondtoken-')
+            elif i == end - 1:
+                features.append('-secondlasttoken-')
+            elif i == end:
+                features.append('-lasttoken-')
+            sentence_features.append(features)
+        return sentence_features
+
+    def _get_lexeme_features(self, w):
+        """Return the features of a lexeme as the token itself and as the previous and next two tokens, as pairs of
+        lists either side of the part of speech tag feature, in the order :meth:`_get_features` gives them."""
+        affixes = not (w.like_number or w.is_punct or w.like_url)
+        clusters = [(n, w.cluster[:n]) for n in (4, 6, 10, 20)] if self.clusters and w.cluster else []
+        w_head = [
+            'w.shape=%s' % w.shape,
+            'w.normalized=%s' % w.normalized,
+            'w.lower=%s' % w.lower,
+            'w.length=%s' % w.length,
+            'w.digit_count=%s' % w.digit_count,
+            'w.upper_count=%s' % w.upper_count,
+            'w.lower_count=%s' % w.lower_count,
+        ]
+        if w.like_number:
+            w_tail = ['w.like_number']
+        elif w.is_punct:
+            w_tail = ['w.is_punct']
+        elif w.like_url:
+            w_tail = ['w.like_url']
+        else:
+            w_tail = ['w.suffix%s=%s' % (n, w.lower[-n:]) for n in range(1, 6)]
+            w_tail += ['w.prefix%s=%s' % (n, w.lower[:n]) for n in range(1, 6)]
+            if w.is_alpha:
+                w_tail.append('w.is_alpha')
+            elif w.is_hyphenated:
+                w_tail.append('w.is_hyphenated')
+            if w.is_upper:
+                w_tail.append('w.is_upper')
+            elif w.is_lower:
+                w_tail.append('w.is_lower')
+            elif w.is_title:
+                w_tail.append('w.is_title')
+        w_tail += ['w.cluster%s=%s' % cluster for cluster in clusters]
+        features = [w_head, w_tail]
+        for name, suffix in [('p1', 'p1:suffix3'), ('p2', None), ('n1', 'n1.suffix3'), ('n2', None)]:
+            tail = ['%s=%s' % (suffix, w.lower[-3:])] if suffix and affixes else []
+            tail += ['%s.cluster%s=%s' % ((name,) + cluster) for cluster in clusters]
+            features += [['%s.lower=%s' % (name, w.lower), '%s.shape=%s' % (name, w.shape)], tail]
+        return features
+
 
 class CemTagger(BaseTagger):
     """Return the combined output of a number of chemical entity taggers."""
@@ -517,16 +658,12 @@ class CemTagger(BaseTagger):
         start = 0
         end = len(entity)
         # Adjust boundaries to exclude disallowed prefixes/suffixes
-        for prefix in IGNORE_PREFIX:
-            if entity.startswith(prefix):
-                # print('%s removing %s' % (currenttext, prefix))
-                start += len(prefix)
-                break
-        for suffix in IGNORE_SUFFIX:
-            if entity.endswith(suffix):
-                # print('%s removing %s' % (currenttext, suffix))
-                end -= len(suffix)
-                break
+        prefix = ignored_prefix(entity)
+        if prefix:
+            start += len(prefix)
+        suffix = ignored_suffix(entity)
+        if suffix:
+            end -= len(suffix)
         # Return True if entity has been reduced to nothing by adjusting boundaries
         if start >= end:
             return True
@@ -535,18 +672,33 @@ class CemTagger(BaseTagger):
         if entity in STOPLIST:
             return True
         # log.debug('Entity: %s', entity)
-        for stop_re in STOP_RES:
-            if re.search(stop_re, entity):
-                log.debug('Killed: %s', entity)
-                return True
+        if _STOP_RE.search(entity):
+            log.debug('Killed: %s', entity)
+            return True
 
     def tag(self, tokens):
         """Run individual chemical entity mention taggers and return union of matches, with some postprocessing."""
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Run each individual chemical entity mention tagger over all the sentences in one batch, then combine and
+        postprocess the matches for each sentence as :meth:`tag` does.
+
+        :param list(list(tuple(str, str))) sentences: The sentences to tag, each a list of (token, POS tag) tuples.
+        :rtype: list(list(tuple))
+        """
+        sentences = [list(tokens) for tokens in sentences]
+        just_tokens = [[t[0] for t in tokens] for tokens in sentences]
+        tagger_sents = [tagger.tag_sents(sentences if isinstance(tagger, CrfCemTagger) else just_tokens)
+                        for tagger in self.taggers]
+        return [self._combine(tokens, [tagged_sents[i] for tagged_sents in tagger_sents])
+                for i, tokens in enumerate(sentences)]
+
+    def _combine(self, tokens, tagger_tags):
+        """Return the union of the matches made by each individual tagger for a sentence, with some postprocessing."""
         # Combine output from individual taggers
         tags = [None] * len(tokens)
-        just_tokens = [t[0] for t in tokens]
-        for tagger in self.taggers:
-            tag_gen = tagger.tag(tokens) if isinstance(tagger, CrfCemTagger) else tagger.tag(just_tokens)
+        for tag_gen in tagger_tags:
             for i, (token, newtag) in enumerate(tag_gen):
                 if newtag == 'I-CM' and not (i == 0 or tag_gen[i - 1][1] not in {'B-CM', 'I-CM'}):
                     tags[i] = 'I-CM'  # Always overwrite I-CM
@@ -558,12 +710,12 @@ class CemTagger(BaseTagger):
             lex = self.lexicon[token]
             nexttag = tags[i+1] if i < len(tags) - 1 else None
             # Trim disallowed first tokens
-            if tag == 'B-CM' and lex.lower in STRIP_START:
+            if tag == 'B-CM' and lex.lower in _STRIP_START:
                 tags[i] = None
                 if nexttag == 'I-CM':
                     tags[i+1] = 'B-CM'
             # Trim disallowed final tokens
-            if nexttag is None and lex.lower in STRIP_END:
+            if nexttag is None and lex.lower in _STRIP_END:
                 tags[i] = None
         # Filter certain entities
         for i, tag in enumerate(tags):
@@ -8,6 +8,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+from collections import OrderedDict
 import logging
 
 import six
@@ -19,13 +20,20 @@ from ..utils import Singleton
 
 log = logging.getLogger(__name__)
 
+#: Mark a key of an OrderedDict as the most recently used.
+if hasattr(OrderedDict, 'move_to_end'):
+    _touch = OrderedDict.move_to_end
+else:
+    def _touch(lexemes, text):
+        lexemes[text] = lexemes.pop(text)
+
 
 class Lexeme(object):
     """"""
 
     __slots__ = ('text', 'normalized', 'lower', 'first', 'suffix', 'shape', 'length', 'upper_count', 'lower_count',
                  'digit_count', 'is_alpha', 'is_ascii', 'is_digit', 'is_lower', 'is_upper', 'is_title', 'is_punct',
-                 'is_hyphenated', 'like_url', 'like_number', 'cluster')
+                 'is_hyphenated', 'like_url', 'like_number', 'cluster', 'tagger_features')
 
     def __init__(self, text, normalized, lower, first, suffix, shape, length, upper_count, lower_count, digit_count,
                  is_alpha, is_ascii, is_digit, is_lower, is_upper, is_title, is_punct, is_hyphenated, like_url,
@@ -72,10 +80,23 @@ class Lexeme(object):
         self.like_url = like_url
         #: Whether the text looks like a number.
         self.like_number = like_number
+        #: Features computed by taggers, cached by each tagger under a key of its own. None until first tagged.
+        self.tagger_features = None
 
 
 class Lexicon(six.with_metaclass(Singleton)):
-    """"""
+    """The features of every word seen, computed once for each word.
+
+    By default the lexicon keeps every word it sees for the life of the process. Setting :attr:`max_size` bounds it,
+    evicting the least recently used words once it is full, and their features are computed again if they are seen
+    again. Words added with :meth:`pin` are never evicted, and don't count towards the size. Each lexicon is a
+    singleton, so it can be bounded once for the whole process, before starting any worker processes::
+
+        ChemLexicon().max_size = 100000
+
+    The counts of lexemes found, computed and evicted are kept in :attr:`hits`, :attr:`misses` and :attr:`evictions`.
+    Hits are only counted once the lexicon is bounded, so the unbounded lexicon is as fast as it was.
+    """
 
     #: The Normalizer for this Lexicon.
     normalizer = Normalizer()
@@ -85,45 +106,117 @@ class Lexicon(six.with_metaclass(Singleton)):
 
     def __init__(self):
         """"""
+        #: Lexemes by text. Once :attr:`max_size` is set, an ordered dict with the least recently used first.
         self.lexemes = {}
+        #: Lexemes that are never evicted, by text.
+        self.pinned = {}
+        #: The number of times a lexeme was found in the lexicon, once :attr:`max_size` is set.
+        self.hits = 0
+        #: The number of lexemes computed.
+        self.misses = 0
+        #: The number of lexemes evicted.
+        self.evictions = 0
         self.clusters = {}
         self._loaded_clusters = False
+        self._max_size = None
 
     def __len__(self):
         """The current number of lexemes stored."""
-        return len(self.lexemes)
+        return len(self.lexemes) + len(self.pinned)
+
+    @property
+    def max_size(self):
+        """The number of lexemes to keep, not counting pinned lexemes, or None to keep them all."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        if value is not None and not isinstance(self.lexemes, OrderedDict):
+            self.lexemes = OrderedDict(self.lexemes)
+        self._max_size = value
+        self._evict()
+
+    def _evict(self):
+        """Evict the least recently used lexemes until there are no more than :attr:`max_size`."""
+        if self._max_size is None:
+            return
+        while len(self.lexemes) > self._max_size:
+            self.lexemes.popitem(last=False)
+            self.evictions += 1
+
+    def pin(self, texts):
+        """Add texts to the lexicon, and never evict them.
+
+        :param list[string] texts: The texts to pin, such as the most common words of a corpus.
+        """
+        for text in texts:
+            if text not in self.pinned:
+                lexeme = self.lexemes.pop(text, None)
+                self.pinned[text] = lexeme if lexeme is not None else self._make_lexeme(text)
 
     def add(self, text):
         """Add text to the lexicon.
 
         :param string text: The text to add.
+        :returns: The lexeme for the text.
+        :rtype: Lexeme
         """
         # logging.debug('Adding to lexicon: %s' % text)
-        if text not in self.lexemes:
-            normalized = self.normalized(text)
-            self.lexemes[text] = Lexeme(
-                text=text,
-                normalized=normalized,
-                lower=self.lower(normalized),
-                first=self.first(normalized),
-                suffix=self.suffix(normalized),
-                shape=self.shape(normalized),
-                length=self.length(normalized),
-                upper_count=self.upper_count(normalized),
-                lower_count=self.lower_count(normalized),
-                digit_count=self.digit_count(normalized),
-                is_alpha=self.is_alpha(normalized),
-                is_ascii=self.is_ascii(normalized),
-                is_digit=self.is_digit(normalized),
-                is_lower=self.is_lower(normalized),
-                is_upper=self.is_upper(normalized),
-                is_title=self.is_title(normalized),
-                is_punct=self.is_punct(normalized),
-                is_hyphenated=self.is_hyphenated(normalized),
-                like_url=self.like_url(normalized),
-                like_number=self.like_number(normalized),
-                cluster=self.cluster(normalized)
-            )
+        try:
+            lexeme = self.lexemes[text]
+        except KeyError:
+            return self._add(text)
+        if self._max_size is not None:
+            self.hits += 1
+            _touch(self.lexemes, text)
+        return lexeme
+
+    def _add(self, text):
+        """Return the pinned lexeme for text that is not in :attr:`lexemes`, or compute it and add it.
+
+        :param string text: The text to add.
+        :rtype: Lexeme
+        """
+        lexeme = self.pinned.get(text)
+        if lexeme is not None:
+            if self._max_size is not None:
+                self.hits += 1
+            return lexeme
+        self.misses += 1
+        lexeme = self.lexemes[text] = self._make_lexeme(text)
+        self._evict()
+        return lexeme
+
+    def _make_lexeme(self, text):
+        """Compute the features of some text.
+
+        :param string text: The text.
+        :rtype: Lexeme
+        """
+        normalized = self.normalized(text)
+        return Lexeme(
+            text=text,
+            normalized=normalized,
+            lower=self.lower(normalized),
+            first=self.first(normalized),
+            suffix=self.suffix(normalized),
+            shape=self.shape(normalized),
+            length=self.length(normalized),
+            upper_count=self.upper_count(normalized),
+            lower_count=self.lower_count(normalized),
+            digit_count=self.digit_count(normalized),
+            is_alpha=self.is_alpha(normalized),
+            is_ascii=self.is_ascii(normalized),
+            is_digit=self.is_digit(normalized),
+            is_lower=self.is_lower(normalized),
+            is_upper=self.is_upper(normalized),
+            is_title=self.is_title(normalized),
+            is_punct=self.is_punct(normalized),
+            is_hyphenated=self.is_hyphenated(normalized),
+            like_url=self.like_url(normalized),
+            like_number=self.like_number(normalized),
+            cluster=self.cluster(normalized)
+        )
 
     def __getitem__(self, text):
         """Return the requested lexeme from the Lexicon.
@@ -132,8 +225,7 @@ class Lexicon(six.with_metaclass(Singleton)):
         :rtype: Lexeme
         :returns: The requested Lexeme.
         """
-        self.add(text)
-        return self.lexemes[text]
+        return self.add(text)
 
     def cluster(self, text):
         """"""
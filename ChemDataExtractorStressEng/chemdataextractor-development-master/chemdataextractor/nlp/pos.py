@@ -10,6 +10,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 import logging
 
+import six
+
 from .lexicon import ChemLexicon
 from .tag import ApTagger, CrfTagger
 
@@ -332,6 +334,92 @@ class CrfPosTagger(CrfTagger):
             features.append('-lasttoken-')
         return features
 
+    def _get_sentence_features(self, tokens):
+        """Return the features of every token in a sentence, the same as :meth:`_get_features` for each in turn.
+
+        The features of each lexeme, as the token itself and as each of its neighbours, are cached on the lexeme, so
+        only the features that combine neighbouring words are computed for each token.
+        """
+        get_features = six.get_unbound_function(type(self)._get_features)
+        if get_features is not six.get_unbound_function(CrfPosTagger._get_features):
+            # A subclass has features of its own
+            return super(CrfPosTagger, self)._get_sentence_features(tokens)
+        lexemes = [self.lexicon[token] for token in tokens]
+        key = 'pos.clusters' if self.clusters else 'pos'
+        cached = self._get_cached_features(lexemes, key, self._get_lexeme_features)
+        lower = [lexeme.lower for lexeme in lexemes]
+        end = len(tokens) - 1
+        sentence_features = []
+        for i, (w_features, _, _, _, _, _, _, _, _) in enumerate(cached):
+            features = list(w_features)
+            # Add features for previous tokens if present
+            if i > 0:
+                p1 = cached[i-1]
+                features += p1[1] + ['p1.lower=%s+w.lower=%s' % (lower[i-1], lower[i])] + p1[2]
+                if i > 1:
+                    p2 = cached[i-2]
+                    features += p2[3] + [
+                        'p2.lower=%s+p1.lower=%s' % (lower[i-2], lower[i-1]),
+                        'p2.lower=%s+p1.lower=%s+w.lower=%s' % (lower[i-2], lower[i-1], lower[i]),
+                    ] + p2[4]
+            # Add features for next tokens if present
+            if i < end:
+                n1 = cached[i+1]
+                features += n1[5] + ['w.lower=%s+n1.lower=%s' % (lower[i], lower[i+1])] + n1[6]
+                if i < end - 1:
+                    n2 = cached[i+2]
+                    features += n2[7] + [
+                        'n1.lower=%s+n2.lower=%s' % (lower[i+1], lower[i+2]),
+                        'w.lower=%s+n1.lower=%s+n2.lower=%s' % (lower[i], lower[i+1], lower[i+2]),
+                    ] + n2[8]
+            if i == 0:
+                features.append('-firsttoken-')
+            elif i == 1:
+                features.append('-secondtoken-')
+            elif i == end - 1:
+                features.append('-secondlasttoken-')
+            elif i == end:
+                features.append('-lasttoken-')
+            sentence_features.append(features)
+        return sentence_features
+
+    def _get_lexeme_features(self, w):
+        """Return the features of a lexeme as the token itself, then as the previous and next two tokens as pairs of
+        lists either side of the features that combine neighbouring words, in the order :meth:`_get_features` gives
+        them."""
+        clusters = [(n, w.cluster[:n]) for n in (4, 6, 10, 20)] if self.clusters and w.cluster else []
+        w_features = [
+            'w.shape=%s' % w.shape,
+            'w.lower=%s' % w.lower,
+            'w.length=%s' % w.length,
+        ]
+        if w.like_number:
+            w_features.append('w.like_number')
+        elif w.is_punct:
+            w_features.append('w.is_punct')
+        else:
+            w_features += ['w.suffix%s=%s' % (n, w.lower[-n:]) for n in range(1, 6)]
+            w_features += ['w.prefix%s=%s' % (n, w.lower[:n]) for n in range(1, 6)]
+            if w.is_alpha:
+                w_features.append('w.is_alpha')
+            elif w.is_hyphenated:
+                w_features.append('w.is_hyphenated')
+            if w.is_upper:
+                w_features.append('w.is_upper')
+            elif w.is_lower:
+                w_features.append('w.is_lower')
+            elif w.is_title:
+                w_features.append('w.is_title')
+        w_features += ['w.cluster%s=%s' % cluster for cluster in clusters]
+        features = [w_features]
+        affixes = not (w.like_number or w.is_punct or w.like_url)
+        for name, suffix in [('p1', 'p1:suffix3'), ('p2', None), ('n1', 'n1.suffix3'), ('n2', None)]:
+            tail = ['%s.shape=%s' % (name, w.shape)]
+            tail += ['%s=%s' % (suffix, w.lower[-3:])] if suffix and affixes else []
+            tail += ['%s.cluster%s=%s' % ((name,) + cluster) for cluster in clusters]
+            features += [['%s.lower=%s' % (name, w.lower)], tail]
+        return features
+
 
 class ChemCrfPosTagger(CrfPosTagger):
     """"""
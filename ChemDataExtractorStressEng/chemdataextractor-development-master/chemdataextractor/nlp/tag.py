@@ -139,9 +139,10 @@ class AveragedPerceptron(object):
         """Dot-product the features and current weights and return the best label."""
         scores = defaultdict(float)
         for feat in features:
-            if feat not in self.weights:
+            # A single lookup, as the weights may be packed, which makes lookups slower than in a dictionary
+            weights = self.weights.get(feat)
+            if weights is None:
                 continue
-            weights = self.weights[feat]
             for label, weight in weights.items():
                 scores[label] += weight
         # Do a secondary alphabetic sort, for stability
@@ -321,13 +322,52 @@ class CrfTagger(BaseTagger):
 
     def tag(self, tokens):
         """Return a list of ((token, tag), label) tuples for a given list of (token, tag) tuples."""
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Return a list of tagged sentences for a list of sentences, each a list of tokens.
+
+        The model is loaded and the feature and tagging functions are looked up once for the whole batch, rather than
+        once per sentence.
+
+        :param list sentences: The sentences to tag.
+        :rtype: list(list(tuple))
+        """
         # Lazy load model first time we tag
         if not self._loaded_model:
             self.load(self.model)
-        features = [self._get_features(tokens, i) for i in range(len(tokens))]
-        labels = self._tagger.tag(features)
-        tagged_sent = list(zip(tokens, labels))
-        return tagged_sent
+        get_sentence_features = self._get_sentence_features
+        crf_tag = self._tagger.tag
+        tagged_sents = []
+        for tokens in sentences:
+            tagged_sents.append(list(zip(tokens, crf_tag(get_sentence_features(tokens)))))
+        return tagged_sents
+
+    def _get_sentence_features(self, tokens):
+        """Return the features of every token in a sentence, as given by :meth:`_get_features` for each in turn.
+
+        Subclasses may override this to compute the features of the whole sentence at once, with the same result.
+        """
+        return [self._get_features(tokens, i) for i in range(len(tokens))]
+
+    def _get_cached_features(self, lexemes, key, get_features):
+        """Return the features of each lexeme given by ``get_features``, computing them only the first time each lexeme
+        is seen.
+
+        :param list lexemes: The lexemes.
+        :param string key: The key to cache the features under, which must differ for features that differ.
+        :param get_features: A function that returns the features of a lexeme that don't depend on its neighbours.
+        """
+        cached = []
+        for lexeme in lexemes:
+            tagger_features = lexeme.tagger_features
+            if tagger_features is None:
+                tagger_features = lexeme.tagger_features = {}
+            features = tagger_features.get(key)
+            if features is None:
+                features = tagger_features[key] = get_features(lexeme)
+            cached.append(features)
+        return cached
 
     def train(self, sentences, model):
         """Train the CRF tagger using CRFSuite.
@@ -339,8 +379,7 @@ class CrfTagger(BaseTagger):
         trainer.set_params(self.params)
         for sentence in sentences:
             tokens, labels = zip(*sentence)
-            features = [self._get_features(tokens, i) for i in range(len(tokens))]
-            trainer.append(features, labels)
+            trainer.append(self._get_sentence_features(tokens), labels)
         trainer.train(model)
         self.load(model)
 
@@ -358,6 +397,9 @@ class DictionaryTagger(BaseTagger):
     delimiters = re.compile(r'(^.|\b|\s|\W|.$)')
     #: Whether dictionary matches are case sensitive.
     case_sensitive = False
+    #: Number of characters to walk the DAWG along at first, walking the rest of the sentence only if they are all the
+    #: start of a dictionary word, so long sentences aren't copied at every delimiter.
+    walk_length = 64
 
     def __init__(self, words=None, model=None, entity=None, case_sensitive=None, lexicon=None):
         """
@@ -396,46 +438,53 @@ class DictionaryTagger(BaseTagger):
             return ' '.join(self.lexicon[t].lower for t in tokens)
 
     def tag(self, tokens):
-        """Return a list of (token, tag) tuples for a given list of tokens."""
+        """Return a list of (token, tag) tuples for a given list of tokens.
+
+        Matches must start and end at delimiters. From each delimiter in turn, the DAWG is walked along the rest of the
+        sentence to find every dictionary word that starts there, and the longest that ends at a delimiter is a match.
+        The search then skips forward to the first delimiter at or after the end of the match, or after the start if
+        there was no match. Matches can't start at the last character of the sentence.
+        """
         if not self._loaded_model:
             self.load(self.model)
         tags = [None] * len(tokens)
         norm = self._normalize(tokens)
         length = len(norm)
         # A set of allowed indexes for matches to start or end at
-        delims = [0] + [i for span in [m.span() for m in self.delimiters.finditer(norm)] for i in span] + [length]
+        delims = {0, length}
+        for m in self.delimiters.finditer(norm):
+            delims.update(m.span())
         # Token indices
         token_at_index = []
         for i, t in enumerate(tokens):
             token_at_index.extend([i] * (len(self.lexicon[t].normalized) + 1))
-        start_i = 0
-        end_i = 1
-        matches = {}
-        next_start = end_i
-        # TODO: This could be a little more efficient by skipping indexes forward to next delim points.
-        while True:
-            current = norm[start_i:end_i]
-            if self._dawg.has_keys_with_prefix(current):
-                # print('%s:%s:%s' % (start_i, end_i, current))
-                # If the current span is in the dawg, and isn't followed by an alphanumeric character
-                if current in self._dawg and start_i in delims and end_i in delims:
-                    # print(current)
-                    # Subsequent longer matches with same start_i will overwrite values in matches dict
-                    matches[start_i] = (start_i, end_i, current)
-                    # We can skip forward to after this match next time we increment start_i
-                    next_start = end_i
-                # Increment end_i provided we aren't already at the end of the input
-                if end_i < length:
-                    end_i += 1
-                    continue
-            # Increment start_i provided we aren't already at the end of the input
-            start_i = next_start
-            if start_i >= length - 1:
+        starts = sorted(delims)
+        prefixes = self._dawg.prefixes
+        walk_length = self.walk_length
+        matches = []
+        i = 0
+        while i < len(starts):
+            start_i = starts[i]
+            if start_i > 0 and start_i >= length - 1:
                 break
-            end_i = start_i + 1
-            next_start = end_i
+            rest = norm[start_i:start_i + walk_length]
+            if len(rest) == walk_length and self._dawg.has_keys_with_prefix(rest):
+                rest = norm[start_i:]
+            match = None
+            # Every dictionary word that starts here, found in a single walk along the DAWG
+            for current in prefixes(rest):
+                end_i = start_i + len(current)
+                if end_i > start_i and end_i in delims and (match is None or end_i > match[1]):
+                    match = (start_i, end_i, current)
+            if match is None:
+                next_start = start_i + 1
+            else:
+                matches.append(match)
+                next_start = match[1]
+            while i < len(starts) and starts[i] < next_start:
+                i += 1
         # Apply matches as tags to the relevant tokens
-        for start_i, end_i, current in matches.values():
+        for start_i, end_i, current in matches:
             start_token = token_at_index[start_i]
             end_token = token_at_index[end_i]
             # Possible for match to start in 'I' token from prev match. Merge matches by not overwriting to 'B'.
@@ -273,6 +273,8 @@ class BaseAutoParser(BaseParser):
 
 
 class AutoSentenceParser(BaseAutoParser, BaseSentenceParser):
+    root_options = ("lenient", "chem_name")
+
     def __init__(
         self, lenient=False, chem_name=(cem | chemical_label | lenient_chemical_label)
     ):
@@ -301,6 +303,9 @@ class AutoSentenceParser(BaseAutoParser, BaseSentenceParser):
 
     @property
     def root(self):
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         # is always found, our models currently rely on the compound
         chem_name = self.chem_name
         compound_model = self.model.compound.model_class
@@ -371,12 +376,17 @@ class AutoSentenceParser(BaseAutoParser, BaseSentenceParser):
 class AutoTableParser(BaseAutoParser, BaseTableParser):
     """ Additions for automated parsing of tables"""
 
+    root_options = ("chem_name",)
+
     def __init__(self, chem_name=(cem | chemical_label | lenient_chemical_label)):
         super(AutoTableParser, self).__init__()
         self.chem_name = chem_name
 
     @property
     def root(self):
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         # is always found, our models currently rely on the compound
         chem_name = self.chem_name
         compound_model = self.model.compound.model_class
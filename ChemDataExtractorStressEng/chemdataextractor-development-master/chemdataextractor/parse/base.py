@@ -9,6 +9,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 from abc import abstractproperty, abstractmethod
 from .quantity import extract_error, extract_units, extract_value
+from .trigger import Trigger
 import logging
 
 log = logging.getLogger(__name__)
@@ -17,6 +18,7 @@ log = logging.getLogger(__name__)
 class BaseParser(object):
     """"""
     model = None
+    _root_cache = None
     trigger_phrase = None
     """
     Optional :class:`~chemdataextractor.parse.elements.BaseParserElement` instance.
@@ -32,10 +34,56 @@ class BaseParser(object):
     that takes little time to process.
     """
 
+    #: Names of parser attributes, besides the model, that the root phrase is built from.
+    root_options = ()
+
     @abstractproperty
     def root(self):
         pass
 
+    def _root_state(self):
+        """The objects the root phrase is built from: the parser options, the model and any models nested in it, and
+        the parse expressions of their fields, which are replaced when the model is updated."""
+        state = [self.model] + [getattr(self, name) for name in self.root_options]
+        models = [self.model]
+        seen = set()
+        while models:
+            model = models.pop()
+            if model is None or model in seen:
+                continue
+            seen.add(model)
+            state.extend([getattr(model, 'dimensions', None), getattr(model, 'category', None)])
+            state.extend(model.parsers)
+            for field in model.fields.values():
+                state.append(field.parse_expression)
+                # Follow list and model fields to the models nested in them
+                while getattr(field, 'field', None) is not None:
+                    field = field.field
+                models.append(getattr(field, 'model_class', None))
+        return state
+
+    def _cached_root(self, build):
+        """
+        The root phrase, built once by ``build`` and then reused until the model, its updatable definitions or the
+        parser options change.
+
+        The state and the root phrase are stored together, so a parser shared between threads never returns a root
+        phrase built for another state.
+
+        :param build: Function that builds the root phrase.
+        :returns: The streamlined root phrase.
+        :rtype: BaseParserElement
+        """
+        state = self._root_state()
+        cached = self._root_cache
+        if cached is None or len(cached[0]) != len(state) or any(a is not b for a, b in zip(cached[0], state)):
+            root = build()
+            if root is not None:
+                root.streamline()
+            cached = (state, root)
+            self._root_cache = cached
+        return cached[1]
+
     @abstractmethod
     def interpret(self, result, start, end):
         pass
@@ -106,6 +154,20 @@ class BaseSentenceParser(BaseParser):
     impelement the interpret function.
     """
 
+    #: The number of sentences given to :meth:`parse_sentence`.
+    sentences_parsed = 0
+    #: The number of those sentences skipped because they do not contain the words the trigger phrase needs.
+    sentences_skipped = 0
+
+    def _trigger(self, trigger_phrase):
+        """The :class:`~chemdataextractor.parse.trigger.Trigger` pre-filter for the trigger phrase, rebuilt only when
+        the trigger phrase changes, e.g. after its model is updated."""
+        cached = getattr(self, '_trigger_cache', None)
+        if cached is None or cached[0] is not trigger_phrase:
+            cached = (trigger_phrase, Trigger.from_element(trigger_phrase))
+            self._trigger_cache = cached
+        return cached[1]
+
     def parse_sentence(self, tokens):
         """
         Parse a sentence. This function is primarily called by the
@@ -118,9 +180,16 @@ class BaseSentenceParser(BaseParser):
         :returns: All the models found in the sentence.
         :rtype: Iterator[:class:`chemdataextractor.model.base.BaseModel`]
         """
-        if self.trigger_phrase is not None:
-            trigger_phrase_results = [result for result in self.trigger_phrase.scan(tokens)]
-        if self.trigger_phrase is None or trigger_phrase_results:
+        self.sentences_parsed += 1
+        trigger_phrase = self.trigger_phrase
+        if trigger_phrase is not None:
+            # Skip sentences without the words the trigger phrase needs before running any parse elements
+            trigger = self._trigger(trigger_phrase)
+            if trigger is not None and not trigger.matches(tokens):
+                self.sentences_skipped += 1
+                return
+            trigger_phrase_results = [result for result in trigger_phrase.scan(tokens)]
+        if trigger_phrase is None or trigger_phrase_results:
             for result in self.root.scan(tokens):
                 for model in self.interpret(*result):
                     yield model
@@ -1261,6 +1261,9 @@ class CompoundParser(BaseSentenceParser):
 
     @property
     def root(self):
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         label = self.model.labels.parse_expression("labels")
         label_name_cem = (label + optdelim + chemical_name)("compound")
 
@@ -1369,6 +1372,9 @@ class CompoundTableParser(BaseTableParser):
 
     @property
     def root(self):
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         # is always found, our models currently rely on the compound
         chem_name = cem | chemical_label | lenient_chemical_label
         compound_model = self.model
@@ -58,9 +58,72 @@ def safe_name(name):
     return XML_SAFE_TAGS.get(name, name)
 
 
+class TokenMatcher(object):
+    """A set of tests on tokens: exact token texts, lowercase token texts, tags and regular expressions."""
+
+    def __init__(self, words=(), lower_words=(), tags=(), regexes=()):
+        #: Token texts, matched exactly.
+        self.words = frozenset(words)
+        #: Lowercase token texts, matched case-insensitively.
+        self.lower_words = frozenset(lower_words)
+        #: Part of speech tags, matched exactly.
+        self.tags = frozenset(tags)
+        #: Compiled regular expressions, searched for in the token texts.
+        self.regexes = tuple(regexes)
+
+    def __or__(self, other):
+        return TokenMatcher(self.words | other.words, self.lower_words | other.lower_words, self.tags | other.tags,
+                            self.regexes + tuple(r for r in other.regexes if r not in self.regexes))
+
+    @property
+    def cost(self):
+        """Matchers with fewer regular expressions to search for, then fewer tests, are cheaper."""
+        return len(self.regexes), len(self.words) + len(self.lower_words) + len(self.tags)
+
+    def matches_token(self, token):
+        """Whether a (token, tag) tuple passes one of the tests."""
+        text = token[0]
+        if text in self.words or token[1] in self.tags or (self.lower_words and text.lower() in self.lower_words):
+            return True
+        return any(regex.search(text) for regex in self.regexes)
+
+    def matches(self, texts, lower_texts, tags):
+        """Whether some token of a sentence passes one of the tests.
+
+        :param set(str) texts: The token texts of the sentence.
+        :param set(str) lower_texts: The lowercase token texts of the sentence.
+        :param set(str) tags: The tags of the sentence.
+        :rtype: bool
+        """
+        if not self.words.isdisjoint(texts) or not self.lower_words.isdisjoint(lower_texts) or not self.tags.isdisjoint(tags):
+            return True
+        return any(regex.search(text) for regex in self.regexes for text in texts)
+
+
+class ScanTokens(list):
+    """
+    The tokens given to :meth:`BaseParserElement.scan`, along with a memo of parse outcomes at each position.
+
+    Within one scan the same combining elements are tried at the same positions many times, e.g. by each alternative
+    of a :class:`First`, or by a ``OneOrMore(Not(phrase) + Any())`` at every later start position. Failures, and the
+    end positions found by :meth:`~BaseParserElement.try_parse`, only depend on the element and the position, so they
+    are remembered for the rest of the scan (packrat parsing). Successful results are not, as they are lxml elements
+    that parent elements and actions go on to modify.
+    """
+
+    def __init__(self, tokens):
+        super(ScanTokens, self).__init__(tokens)
+        #: Outcomes keyed by (element id, position, kind). The element is kept in the value so its id is not reused.
+        self.memo = {}
+
+
 class BaseParserElement(object):
     """Abstract base parser element class."""
 
+    #: Whether failures to parse at each position are memoized during a scan. Only worthwhile for elements that
+    #: combine others, as the simple elements are as quick to parse as to look up.
+    memoize = False
+
     def __init__(self):
         self.name = None
         #: str or None: name for BaseParserElement. This is used to set the name of the Element when a result is found
@@ -109,10 +172,17 @@ class BaseParserElement(object):
         """
         if not self.streamlined:
             self.streamline()
+        if not isinstance(tokens, ScanTokens):
+            tokens = ScanTokens(tokens)
+        first, nullable = self.first_tokens()
         matches = 0
         i = 0
         length = len(tokens)
         while i < length and matches < max_matches:
+            if first is not None and not first.matches_token(tokens[i]):
+                # No match that consumes any tokens can start here
+                i += 1
+                continue
             try:
                 results, next_i = self.parse(tokens, i)
             except ParseException as err:
@@ -142,6 +212,26 @@ class BaseParserElement(object):
         :returns: A tuple where the first element is a list of elements found (can be None if no results were found), and the last index investigated.
         :rtype: tuple(list(Element) or None, int)
         """
+        memo = tokens.memo if self.memoize and isinstance(tokens, ScanTokens) else None
+        if memo is None:
+            return self._parse(tokens, i, actions)
+        key = (id(self), i, actions)
+        failure = memo.get(key)
+        if failure is not None:
+            raise ParseException(tokens, failure[1], failure[2], self)
+        try:
+            return self._parse(tokens, i, actions)
+        except ParseException as err:
+            memo[key] = (self, err.i, err.msg)
+            raise
+
+    def _parse(self, tokens, i, actions):
+        if self.memoize:
+            first, nullable = self.first_tokens()
+            # Reject tokens this element cannot start with, unless checking would mean searching for regexes
+            if not nullable and first is not None and not first.regexes:
+                if i >= len(tokens) or not first.matches_token(tokens[i]):
+                    raise ParseException(tokens, i, 'Expected one of the first tokens of %s' % self.__class__.__name__, self)
         try:
             result, found_index = self._parse_tokens(tokens, i, actions)
         except IndexError:
@@ -157,7 +247,35 @@ class BaseParserElement(object):
         return result, found_index
 
     def try_parse(self, tokens, i):
-        return self.parse(tokens, i, actions=False)[1]
+        memo = tokens.memo if self.memoize and isinstance(tokens, ScanTokens) else None
+        if memo is None:
+            return self.parse(tokens, i, actions=False)[1]
+        key = (id(self), i, None)
+        success = memo.get(key)
+        if success is None:
+            success = (self, self.parse(tokens, i, actions=False)[1])
+            memo[key] = success
+        return success[1]
+
+    def first_tokens(self):
+        """
+        The tokens this element can start with, and whether it can match without consuming any tokens. Any match that
+        consumes tokens starts with a token accepted by the returned :class:`TokenMatcher`, so other tokens can be
+        rejected without parsing. The result is worked out once, so elements should not be modified after they are
+        first used to parse.
+
+        :returns: The matcher for the first token, or None if it can be any token, and whether it can match nothing.
+        :rtype: tuple(TokenMatcher or None, bool)
+        """
+        first = self.__dict__.get('_first')
+        if first is None:
+            first = self._first_tokens()
+            self._first = first
+        return first
+
+    def _first_tokens(self):
+        """Implemented by subclasses. By default any token could be first, and the element could match nothing."""
+        return None, True
 
     def _parse_tokens(self, tokens, i, actions=True):
         """
@@ -260,12 +378,18 @@ class Any(BaseParserElement):
     def _parse_tokens(self, tokens, i, actions=True):
         return [E(self.name or safe_name(tokens[i][1]), tokens[i][0])], i + 1
 
+    def _first_tokens(self):
+        return None, False
+
 
 class NoMatch(BaseParserElement):
 
     def _parse_tokens(self, tokens, i, actions=True):
         raise ParseException(tokens, i, 'NoMatch will not match any tokens', self)
 
+    def _first_tokens(self):
+        return TokenMatcher(), False
+
 
 class Word(BaseParserElement):
     """Match token text exactly. Case-sensitive."""
@@ -280,6 +404,9 @@ class Word(BaseParserElement):
             return [E(self.name or safe_name(tokens[i][1]), token_text)], i + 1
         raise ParseException(tokens, i, 'Expected %s, got %s' % (self.match, token_text), self)
 
+    def _first_tokens(self):
+        return TokenMatcher(words=[self.match]), False
+
 
 class Tag(BaseParserElement):
     """Match tag exactly."""
@@ -295,6 +422,9 @@ class Tag(BaseParserElement):
             return [E(self.name or safe_name(tag), token[0])], i + 1
         raise ParseException(tokens, i, 'Expected %s, got %s' % (self.match, tag), self)
 
+    def _first_tokens(self):
+        return TokenMatcher(tags=[self.match]), False
+
 
 class IWord(Word):
     """Case-insensitive match token text."""
@@ -308,6 +438,9 @@ class IWord(Word):
             return [E(self.name or safe_name(tokens[i][1]), tokens[i][0])], i + 1
         raise ParseException(tokens, i, 'Expected %s, got %s' % (self.match, tokens[i][0]), self)
 
+    def _first_tokens(self):
+        return TokenMatcher(lower_words=[self.match]), False
+
 
 class Regex(BaseParserElement):
     """Match token text with regular expression."""
@@ -330,6 +463,9 @@ class Regex(BaseParserElement):
             return [E(self.name or safe_name(tokens[i][1]), text)], i + 1
         raise ParseException(tokens, i, 'Expected %s, got %s' % (self.pattern, token_text), self)
 
+    def _first_tokens(self):
+        return TokenMatcher(regexes=[self.regex]), False
+
     # Solves issues with deepcopying of records, jm2111
     # only the pattern is copied and the object is created from scratch
     def __deepcopy__(self, memodict={}):
@@ -347,6 +483,9 @@ class Start(BaseParserElement):
             raise ParseException(tokens, i, 'Expected start of tokens', self)
         return [], i
 
+    def _first_tokens(self):
+        return TokenMatcher(), True
+
 
 class End(BaseParserElement):
     """Match at end of tokens."""
@@ -359,10 +498,15 @@ class End(BaseParserElement):
             raise ParseException(tokens, i, 'Expected end of tokens', self)
         return [], i
 
+    def _first_tokens(self):
+        return TokenMatcher(), True
+
 
 class ParseExpression(BaseParserElement):
     """Abstract class for combining and post-processing parsed tokens."""
 
+    memoize = True
+
     def __init__(self, exprs):
         super(ParseExpression, self).__init__()
         if isinstance(exprs, types.GeneratorType):
@@ -384,8 +528,19 @@ class ParseExpression(BaseParserElement):
 
     def append(self, other):
         self.exprs.append(other)
+        self.__dict__.pop('_first', None)
         return self
 
+    def _alternatives_first_tokens(self):
+        """The first tokens of an expression that matches one of its expressions."""
+        first = TokenMatcher()
+        nullable = False
+        for e in self.exprs:
+            e_first, e_nullable = e.first_tokens()
+            first = first | e_first if first is not None and e_first is not None else None
+            nullable = nullable or e_nullable
+        return first, nullable
+
     def copy(self):
         ret = super(ParseExpression, self).copy()
         ret.exprs = [e.copy() for e in self.exprs]
@@ -425,6 +580,16 @@ class And(ParseExpression):
                 results.extend(exprresults)
         return ([E(self.name, *results)] if self.name else results), i
 
+    def _first_tokens(self):
+        # The first token is consumed by the first part that consumes anything
+        first = TokenMatcher()
+        for e in self.exprs:
+            e_first, e_nullable = e.first_tokens()
+            first = first | e_first if first is not None and e_first is not None else None
+            if not e_nullable:
+                return first, False
+        return first, True
+
     def __iadd__(self, other):
         if isinstance(other, six.text_type):
             other = Word(other)
@@ -495,6 +660,9 @@ class Or(ParseExpression):
         #     result.tag = self.name
         return result, result_i
 
+    def _first_tokens(self):
+        return self._alternatives_first_tokens()
+
     def __ixor__(self, other):
         if isinstance(other, six.text_type):
             other = Word(other)
@@ -528,6 +696,9 @@ class First(ParseExpression):
             else:
                 raise ParseException(tokens, i, 'No alternatives match', self)
 
+    def _first_tokens(self):
+        return self._alternatives_first_tokens()
+
     def __ior__(self, other):
         if isinstance(other, six.text_type):
             other = Word(other)
@@ -549,6 +720,11 @@ class ParseElementEnhance(BaseParserElement):
         else:
             raise ParseException('', i, 'Error', self)
 
+    def _first_tokens(self):
+        if self.expr is None:
+            return TokenMatcher(), False
+        return self.expr.first_tokens()
+
     def streamline(self):
         if not self.streamlined:
             super(ParseElementEnhance, self).streamline()
@@ -573,6 +749,9 @@ class FollowedBy(ParseElementEnhance):
         self.expr.try_parse(tokens, i)
         return [], i
 
+    def _first_tokens(self):
+        return TokenMatcher(), True
+
 
 class Not(ParseElementEnhance):
     """
@@ -594,6 +773,9 @@ class Not(ParseElementEnhance):
             raise ParseException(tokens, i, 'Encountered disallowed token', self)
         return [], i
 
+    def _first_tokens(self):
+        return TokenMatcher(), True
+
 
 class ZeroOrMore(ParseElementEnhance):
     """Optional repetition of zero or more of the given expression."""
@@ -611,6 +793,10 @@ class ZeroOrMore(ParseElementEnhance):
             pass
         return ([E(self.name, *results)] if self.name else results), i
 
+    def _first_tokens(self):
+        first, nullable = super(ZeroOrMore, self)._first_tokens()
+        return first, True
+
 
 class OneOrMore(ParseElementEnhance):
     """Repetition of one or more of the given expression."""
@@ -646,6 +832,10 @@ class Optional(ParseElementEnhance):
             pass
         return results, i
 
+    def _first_tokens(self):
+        first, nullable = super(Optional, self)._first_tokens()
+        return first, True
+
 
 class Group(ParseElementEnhance):
     """
@@ -693,6 +883,9 @@ class SkipTo(ParseElementEnhance):
                 i += 1
         raise ParseException(tokens, i, '', self)
 
+    def _first_tokens(self):
+        return None, True
+
 
 class Hide(ParseElementEnhance):
     """
@@ -38,6 +38,11 @@ class QuantityModelTemplateParser(BaseAutoParser, BaseSentenceParser):
     Other entities are merged contextually
     """
 
+    @property
+    def trigger_phrase(self):
+        """Every root phrase contains the specifier"""
+        return self.model.specifier.parse_expression
+
     @property
     def specifier_phrase(self):
         """The model specifier"""
@@ -216,6 +221,9 @@ class QuantityModelTemplateParser(BaseAutoParser, BaseSentenceParser):
     @property
     def root(self):
         """Root Phrases"""
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         root_phrase = Group(
             self.specifier_before_cem_and_value_phrase
             | self.cem_after_specifier_and_value_phrase
@@ -244,6 +252,11 @@ class MultiQuantityModelTemplateParser(BaseAutoParser, BaseSentenceParser):
         BaseSentenceParser {[type]} -- [description]
     """
 
+    @property
+    def trigger_phrase(self):
+        """Every root phrase contains the specifier"""
+        return self.model.specifier.parse_expression
+
     @property
     def specifier_phrase(self):
         """Specifier Phrase"""
@@ -540,6 +553,9 @@ class MultiQuantityModelTemplateParser(BaseAutoParser, BaseSentenceParser):
 
     @property
     def root(self):
+        return self._cached_root(self._build_root)
+
+    def _build_root(self):
         return (
             self.multi_entity_phrase_1
             | self.multi_entity_phrase_2
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Cheap pre-filters for parsers, built from the vocabulary of their trigger phrases.
+
+A :class:`Trigger` is a set of clauses that every match of a parse expression must satisfy. Each clause is a
+:class:`~chemdataextractor.parse.elements.TokenMatcher`, and at least one token in the sentence must pass one of its
+tests. Sentences that fail a clause cannot contain a match, so they can be skipped without running any parse elements
+at all.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+import logging
+
+from .elements import TokenMatcher, Word, IWord, Tag, Regex, NoMatch, And, Or, First, ParseElementEnhance, Group, Hide, OneOrMore, FollowedBy, SkipTo
+
+log = logging.getLogger(__name__)
+
+
+class Trigger(object):
+    """
+    The clauses that every match of a parse expression must satisfy.
+
+    Usage::
+
+        trigger = Trigger.from_element(I('yield') + I('strength'))
+        trigger.matches([('The', 'DT'), ('yield', 'NN'), ('strength', 'NN')])  # True
+        trigger.matches([('The', 'DT'), ('grain', 'NN'), ('size', 'NN')])  # False
+
+    """
+
+    def __init__(self, clauses):
+        #: The clauses, cheapest first.
+        self.clauses = sorted(clauses, key=lambda clause: clause.cost)
+
+    @classmethod
+    def from_element(cls, element):
+        """Build the trigger for a parse expression.
+
+        :param BaseParserElement element: The parse expression.
+        :returns: The trigger, or None if no token is required for every match.
+        :rtype: Trigger or None
+        """
+        clauses = _clauses(element)
+        if not clauses:
+            return None
+        return cls(clauses)
+
+    def matches(self, tokens):
+        """Whether the tokens could contain a match. If this is False, they certainly do not.
+
+        :param list(tuple(str, str)) tokens: The (token, tag) tuples of a sentence.
+        :rtype: bool
+        """
+        texts = set(token[0] for token in tokens)
+        lower_texts = set(text.lower() for text in texts)
+        tags = set(token[1] for token in tokens)
+        return all(clause.matches(texts, lower_texts, tags) for clause in self.clauses)
+
+
+def _clauses(element):
+    """The clauses that every match of the element satisfies, or an empty list if there are none."""
+    element_type = type(element)
+    if element_type is Word:
+        return [TokenMatcher(words=[element.match])]
+    elif element_type is IWord:
+        return [TokenMatcher(lower_words=[element.match])]
+    elif element_type is Tag:
+        return [TokenMatcher(tags=[element.match])]
+    elif element_type is Regex:
+        return [TokenMatcher(regexes=[element.regex])]
+    elif element_type is NoMatch:
+        # Can never match, so any sentence can be skipped
+        return [TokenMatcher()]
+    elif element_type is And:
+        # Every part must match
+        return [clause for expr in element.exprs for clause in _clauses(expr)]
+    elif element_type in {First, Or}:
+        # One alternative must match, so the cheapest clause of each can be combined
+        combined = TokenMatcher()
+        for expr in element.exprs:
+            clauses = _clauses(expr)
+            if not clauses:
+                return []
+            combined |= min(clauses, key=lambda clause: clause.cost)
+        return [combined]
+    elif element_type in {ParseElementEnhance, Group, Hide, OneOrMore, FollowedBy, SkipTo}:
+        # The wrapped expression must match at least once
+        return _clauses(element.expr) if element.expr is not None else []
+    # Optional, ZeroOrMore, Not, Any, Start, End and unknown elements may match without any particular token
+    return []
+
+
+def skip_stats(models):
+    """
+    The number of sentences given to the sentence parsers of each model, and how many of them were skipped because
+    they could not contain the parser's trigger phrase.
+
+    :param list models: The model classes.
+    :returns: For each model name, a dict with the number of ``sentences``, the number ``skipped`` and the
+        ``skip_rate``.
+    :rtype: OrderedDict
+    """
+    stats = OrderedDict()
+    for model in models:
+        sentences = sum(getattr(parser, 'sentences_parsed', 0) for parser in model.parsers)
+        skipped = sum(getattr(parser, 'sentences_skipped', 0) for parser in model.parsers)
+        stats[model.__name__] = {
+            'sentences': sentences,
+            'skipped': skipped,
+            'skip_rate': float(skipped) / sentences if sentences else 0.0,
+        }
+    return stats
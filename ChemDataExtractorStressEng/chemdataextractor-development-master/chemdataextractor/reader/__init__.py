@@ -18,6 +18,7 @@ from .plaintext import PlainTextReader
 from .rsc import RscHtmlReader
 from .nlm import NlmXmlReader
 from .uspto import UsptoXmlReader
+from .registry import ReaderRegistry, sniff_format
 
 
 DEFAULT_READERS = [
@@ -32,3 +33,6 @@ DEFAULT_READERS = [
     PdfReader(),
     PlainTextReader(),
 ]
+
+#: The default readers, with the format of each file sniffed before the readers are asked if they can read it.
+DEFAULT_REGISTRY = ReaderRegistry(DEFAULT_READERS)
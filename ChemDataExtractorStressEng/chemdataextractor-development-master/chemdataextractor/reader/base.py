@@ -15,6 +15,15 @@ import six
 class BaseReader(six.with_metaclass(ABCMeta)):
     """All Document Readers should implement a parse method."""
 
+    #: The file formats this reader can read, as sniffed by :func:`~chemdataextractor.reader.registry.sniff_format`.
+    #: Readers are not asked to detect files of other formats. None for any format.
+    formats = None
+
+    #: How many bytes at the start of a file :meth:`detect` looks at, or None if it may look at the whole file. Only
+    #: applies to the ``detect`` of the class that sets it, so subclasses that override ``detect`` are given the whole
+    #: file unless they set it too.
+    detect_size = None
+
     def __init__(self):
         self.root = None
 
@@ -32,7 +41,7 @@ class BaseReader(six.with_metaclass(ABCMeta)):
         pass
 
     def read(self, f):
-        """Read a file-like object and return a Document."""
+        """Read a file-like object, such as a memory-mapped file, and return a Document."""
         return self.parse(f.read())
 
     def readstring(self, fstring):
@@ -13,15 +13,22 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import io
+import logging
+import mmap
 import six
-from ..scrape.clean import clean, Cleaner
+from ..scrape import BLOCK_ELEMENTS
+from ..scrape.clean import clean, Cleaner, collapse_whitespace
 from ..doc.table import Cell, Table
 from ..doc.text import Caption
 from ..doc.meta import MetaData
+from ..text import get_encoding
 from .markup import XmlReader
 from lxml import etree
 import re
 
+log = logging.getLogger(__name__)
+
 # XML stripper that removes the tags around numbers in chemical formulas
 strip_els_xml = Cleaner(strip_xpath='.//ce:inf | .//ce:italic | .//ce:bold | .//ce:formula | .//mml:* | .//ce:sup | .//ce:table//ce:sup',
                         kill_xpath='.//ce:cross-ref//ce:sup | .//ce:cross-ref | .//ce:cross-refs | .//ce:note-para')
@@ -72,7 +79,7 @@ def fix_elsevier_xml_whitespace(document):
 def els_xml_whitespace(document):
     """ Remove whitespace in xml.text or xml.tails for all elements, if it is only whitespace """
     # selects all tags and checks if the text or tail are spaces
-    for el in document.xpath('//*'):
+    for el in document.iter(etree.Element):
         if str(el.text).isspace():
             el.text = ''
         if str(el.tail).isspace():
@@ -83,10 +90,219 @@ def els_xml_whitespace(document):
     return document
 
 
+ce = '{http://www.elsevier.com/xml/common/dtd}'
+mml = '{http://www.w3.org/1998/Math/MathML}'
+
+
+class ElsevierXmlCleaner(object):
+    """
+    Clean an Elsevier XML document exactly as ``clean``, ``fix_elsevier_xml_whitespace``, ``els_xml_whitespace`` and
+    ``strip_els_xml`` do when applied in turn, with a single walk over the document.
+
+    The walk collapses the whitespace of every text and tail, and finds the elements that each step kills, strips or
+    moves. The steps then run in the same order on just those elements, and only text that they join together is
+    collapsed again. Collapsing text that was already collapsed changes nothing, and collapsing joined text gives the
+    same result whether or not its parts were collapsed first, so the document is identical to applying the four
+    cleaners.
+    """
+
+    #: The step that handles each tag: killed by ``clean``, spaced by ``fix_elsevier_xml_whitespace``, or killed or
+    #: stripped by ``strip_els_xml``. Comments, processing instructions and hidden elements are also killed by
+    #: ``clean``, and all MathML elements are stripped by ``strip_els_xml``.
+    _steps = {
+        'script': 'kill',
+        'style': 'kill',
+        ce + 'hsp': 'hsp',
+        ce + 'cross-ref': 'els_kill',
+        ce + 'cross-refs': 'els_kill',
+        ce + 'note-para': 'els_kill',
+        ce + 'inf': 'els_strip',
+        ce + 'italic': 'els_strip',
+        ce + 'bold': 'els_strip',
+        ce + 'formula': 'els_strip',
+        ce + 'sup': 'els_strip',
+    }
+
+    def __call__(self, doc):
+        """Clean the document."""
+        if hasattr(doc, 'getroot'):
+            doc = doc.getroot()
+        # Elements whose text and tail may be whitespace only before they are blanked
+        blank = []
+        # Elements and attributes of text that has been joined onto since it was collapsed
+        joined = set()
+        block, kill, hsps, els_kill, els_strip = [], [], [], [], []
+        lists = {'kill': kill, 'hsp': hsps, 'els_kill': els_kill, 'els_strip': els_strip}
+        steps = self._steps
+        for el in doc.iter():
+            tag = el.tag
+            if el is not doc:
+                if tag in BLOCK_ELEMENTS:
+                    block.append(el)
+                    self._newlines(el, joined)
+                if isinstance(tag, six.string_types):
+                    step = steps.get(tag)
+                    if el.get('style') == 'display:none;':
+                        kill.append(el)
+                    elif step is not None:
+                        lists[step].append(el)
+                    elif tag.startswith(mml):
+                        els_strip.append(el)
+                else:
+                    # Comments and processing instructions
+                    kill.append(el)
+                    continue
+            # Most text has nothing to collapse, and is left as it is
+            text = el.text
+            if text and ('\n' in text or '\t' in text or '  ' in text):
+                text = collapse_whitespace(text)
+                el.text = text
+            tail = el.tail
+            if tail and ('\n' in tail or '\t' in tail or '  ' in tail):
+                tail = collapse_whitespace(tail)
+                el.tail = tail
+            if text and text.isspace() or tail and tail.isspace():
+                blank.append(el)
+        # The rest of clean
+        self._collapse(joined)
+        dead = set()
+        for el in kill:
+            self._kill(el, joined)
+            dead.update(el.iter())
+        self._collapse(joined)
+        blank.extend(el for el, _ in joined)
+        joined.clear()
+        # fix_elsevier_xml_whitespace
+        for el in hsps:
+            if el not in dead:
+                self._replace_hsp(el, joined)
+        # els_xml_whitespace
+        blank.extend(el for el, _ in joined)
+        for el in blank:
+            if el.text and el.text.isspace():
+                el.text = ''
+            if el.tail and el.tail.isspace():
+                el.tail = ''
+        # strip_els_xml
+        for el in block:
+            if el not in dead:
+                self._newlines(el, joined)
+        for el in els_kill:
+            if el not in dead:
+                self._kill(el, joined)
+                dead.update(el.iter())
+        for el in els_strip:
+            if el not in dead:
+                self._strip(el, joined)
+        self._collapse(joined)
+        return doc
+
+    @staticmethod
+    def _collapse(joined):
+        """Collapse the whitespace of the joined text."""
+        for el, attribute in joined:
+            text = getattr(el, attribute)
+            if text:
+                collapsed = collapse_whitespace(text)
+                if collapsed != text:
+                    setattr(el, attribute, collapsed)
+
+    @staticmethod
+    def _newlines(el, joined):
+        """Ensure newlines around a block element, as :class:`~chemdataextractor.scrape.clean.Cleaner` does."""
+        el.tail = (el.tail or '') + '\n'
+        joined.add((el, 'tail'))
+        previous = el.getprevious()
+        parent = el.getparent()
+        if previous is None:
+            parent.text = (parent.text or '') + '\n'
+            joined.add((parent, 'text'))
+        else:
+            previous.tail = (previous.tail or '') + '\n'
+            joined.add((previous, 'tail'))
+
+    @staticmethod
+    def _kill(el, joined):
+        """Remove an element and its contents, as :class:`~chemdataextractor.scrape.clean.Cleaner` does."""
+        parent = el.getparent()
+        if parent is None:
+            return
+        if el.tail:
+            previous = el.getprevious()
+            if previous is None:
+                parent.text = (parent.text or '') + el.tail
+                joined.add((parent, 'text'))
+            else:
+                previous.tail = (previous.tail or '') + el.tail
+                joined.add((previous, 'tail'))
+        parent.remove(el)
+
+    @staticmethod
+    def _strip(el, joined):
+        """Replace an element with its contents, as :class:`~chemdataextractor.scrape.clean.Cleaner` does."""
+        parent = el.getparent()
+        previous = el.getprevious()
+        if parent is None:
+            return
+        if el.text and isinstance(el.tag, six.string_types):
+            if previous is None:
+                parent.text = (parent.text or '') + el.text
+                joined.add((parent, 'text'))
+            else:
+                previous.tail = (previous.tail or '') + el.text
+                joined.add((previous, 'tail'))
+        if el.tail:
+            if len(el):
+                last = el[-1]
+                last.tail = (last.tail or '') + el.tail
+                joined.add((last, 'tail'))
+            elif previous is None:
+                parent.text = (parent.text or '') + el.tail
+                joined.add((parent, 'text'))
+            else:
+                previous.tail = (previous.tail or '') + el.tail
+                joined.add((previous, 'tail'))
+        index = parent.index(el)
+        parent[index:index + 1] = el[:]
+
+    @staticmethod
+    def _replace_hsp(el, joined):
+        """Replace a ce:hsp element with its contents, spacing its text as ``fix_elsevier_xml_whitespace`` does."""
+        parent = el.getparent()
+        previous = el.getprevious()
+        if parent is None:
+            return
+        if el.text and isinstance(el.tag, six.string_types):
+            if previous is None:
+                if parent.text:
+                    parent.text = parent.text + ('' if parent.text.endswith(' ') else ' ') + el.text
+                    joined.add((parent, 'text'))
+            elif previous.tail:
+                previous.tail = previous.tail + ('' if previous.tail.endswith(' ') else ' ') + el.text
+                joined.add((previous, 'tail'))
+        if el.tail:
+            if len(el):
+                last = el[-1]
+                last.tail = (last.tail or '') + el.tail
+                joined.add((last, 'tail'))
+            elif previous is None:
+                parent.text = (parent.text or '') + ('' if el.tail.startswith(' ') else ' ') + el.tail
+                joined.add((parent, 'text'))
+            else:
+                previous.tail = (previous.tail or '') + ('' if el.tail.startswith(' ') else ' ') + el.tail
+                joined.add((previous, 'tail'))
+        index = parent.index(el)
+        parent[index:index + 1] = el[:]
+
+
+#: Applies all the Elsevier cleaners with a single walk over the document.
+clean_els_xml = ElsevierXmlCleaner()
+
+
 class ElsevierXmlReader(XmlReader):
     """Reader for Elsevier XML documents."""
 
-    cleaners = [clean, fix_elsevier_xml_whitespace, els_xml_whitespace, strip_els_xml]
+    cleaners = [clean_els_xml]
 
     etree.FunctionNamespace("http://www.elsevier.com/xml/svapi/article/dtd").prefix = 'default'
     etree.FunctionNamespace("http://www.elsevier.com/xml/bk/dtd").prefix = 'bk'
@@ -104,6 +320,24 @@ class ElsevierXmlReader(XmlReader):
     etree.FunctionNamespace("http://prismstandard.org/namespaces/basic/2.0/").prefix = 'prism'
     etree.FunctionNamespace("http://www.w3.org/2001/XMLSchema-instance").prefix = 'xsi'
 
+    namespaces = {
+        'default': 'http://www.elsevier.com/xml/svapi/article/dtd',
+        'bk': 'http://www.elsevier.com/xml/bk/dtd',
+        'cals': 'http://www.elsevier.com/xml/common/cals/dtd',
+        'ce': 'http://www.elsevier.com/xml/common/dtd',
+        'ja': 'http://www.elsevier.com/xml/ja/dtd',
+        'mml': 'http://www.w3.org/1998/Math/MathML',
+        'sa': 'http://www.elsevier.com/xml/common/struct-aff/dtd',
+        'sb': 'http://www.elsevier.com/xml/common/struct-bib/dtd',
+        'tb': 'http://www.elsevier.com/xml/common/table/dtd',
+        'xlink': 'http://www.w3.org/1999/xlink',
+        'xocs': 'http://www.elsevier.com/xml/xocs/dtd',
+        'dc': 'http://purl.org/dc/elements/1.1/',
+        'dcterms': 'http://purl.org/dc/terms/',
+        'prism': 'http://prismstandard.org/namespaces/basic/2.0/',
+        'xsi': 'http://www.w3.org/2001/XMLSchema-instance',
+    }
+
     root_css = 'default|full-text-retrieval-response'
     title_css = 'dc|title'
     heading_css = 'ce|section-title'
@@ -147,8 +381,204 @@ class ElsevierXmlReader(XmlReader):
                  'prism|publisher, prism|*, xocs|copyright-line, xocs|cp-notice,' \
                  'dc|description'
 
+    #: Elements that only group other elements. In stream mode, each of their children is parsed as soon as it has
+    #: been read, and is then freed.
+    container_css = 'default|full-text-retrieval-response, default|coredata, default|objects, default|originalText,' \
+                    'xocs|doc, xocs|serial-item, ja|article, ja|simple-article, ja|converted-article, ja|head,' \
+                    'ja|simple-head, ja|body, ja|tail, ce|floats, ce|sections, ce|section, ce|abstract,' \
+                    'ce|abstract-sec, ce|keywords, ce|appendices'
+    object_css = 'default|object'
+
     url_prefix = 'https://sciencedirect.com/science/article/pii/'
 
+    #: The default namespace is declared on the root element, so :meth:`detect` only needs the start of the file.
+    detect_size = 4096
+
+    def __init__(self, stream=False, lazy=False, table_processes=None):
+        """
+        :param bool stream: (Optional) Whether to read documents in a single streaming pass with lxml iterparse,
+            freeing each part of the tree as soon as it has been parsed, instead of building and cleaning the whole
+            tree first. Default False.
+        :param bool lazy: (Optional) Whether to leave figure captions to be tagged when their records are first needed.
+            See :class:`~chemdataextractor.reader.markup.LxmlReader`. Default False.
+        :param int table_processes: (Optional) The number of worker processes to analyse the tables of each document
+            in as a batch. See :class:`~chemdataextractor.reader.markup.LxmlReader`.
+        """
+        super(ElsevierXmlReader, self).__init__(lazy=lazy, table_processes=table_processes)
+        self.stream = stream
+        # Figure link URLs by object ref, collected while streaming or on the first figure
+        self._objects = None
+
+    def read(self, f):
+        """Read a file-like object and return a Document."""
+        if self.stream:
+            # Memory-mapped files are read with the encoding they would be given as strings
+            encoding = get_encoding(f) if isinstance(f, mmap.mmap) else None
+            return self._make_document(self.iter_elements(f, encoding=encoding))
+        return super(ElsevierXmlReader, self).read(f)
+
+    def parse(self, fstring):
+        if self.stream:
+            return self._make_document(self.iter_elements(io.BytesIO(fstring), encoding=get_encoding(fstring)))
+        self._objects = None
+        return super(ElsevierXmlReader, self).parse(fstring)
+
+    def iter_elements(self, f, encoding=None):
+        """
+        Read an Elsevier XML document in a single streaming pass, yielding each Document element as soon as the
+        part of the document it comes from has been read.
+
+        The children of the :attr:`container_css` elements are cleaned and parsed as soon as they have been read,
+        in the same way as :meth:`parse`, and are then removed from the tree, so memory use does not grow with the
+        length of the article. The elements are the same as those of the Document returned by :meth:`parse`,
+        provided the objects that figures link to come before the figures, as they do in full-text retrieval
+        responses.
+
+        Usage::
+
+            with io.open('article.xml', 'rb') as f:
+                for element in ElsevierXmlReader().iter_elements(f):
+                    print(element)
+
+        :param f: The file-like object or file name to read.
+        :param str encoding: (Optional) The encoding, if not declared in the file.
+        :returns: The Document elements.
+        :rtype: Iterator[chemdataextractor.doc.element.BaseElement]
+        """
+        containers = self._container_tags()
+        # Selects the elements that need more than their text parsing
+        special_css = ', '.join([self.title_css, self.heading_css, self.figure_css, self.table_css, self.citation_css,
+                                 self.reference_css, self.ignore_css, self.metadata_css, self.object_css])
+        self._objects = {}
+        # Each open container, with its id and whether its text has been parsed
+        open_containers = []
+        for event, el in etree.iterparse(f, events=('start', 'end'), tag=containers, encoding=encoding, recover=True,
+                                         remove_comments=True, remove_pis=True):
+            if event == 'start':
+                if not open_containers:
+                    self.root = el
+                    open_containers.append([el, el.get('id'), False])
+                elif el.getparent() is open_containers[-1][0]:
+                    # Everything in the parent before this container has been read
+                    for element in self._parse_children(open_containers[-1], containers, special_css, until=el):
+                        yield element
+                    open_containers.append([el, el.get('id', open_containers[-1][1]), False])
+            elif open_containers and el is open_containers[-1][0]:
+                for element in self._parse_children(open_containers.pop(), containers, special_css):
+                    yield element
+
+    def read_header(self, f, encoding=None):
+        """
+        Read just enough of an Elsevier XML document to decide whether it is worth reading in full.
+
+        The header values are taken from the coredata and xocs:meta elements at the start of the document. Reading
+        stops as soon as the article body, or the raw text that replaces it, is reached, so the body is never parsed.
+
+        Usage::
+
+            header = ElsevierXmlReader().read_header('article.xml')
+            if header and header['subtype'] == 'fla' and not header['rawtext_only']:
+                d = Document.from_file('article.xml', readers=[ElsevierXmlReader()])
+
+        :param f: The file-like object or file name to read.
+        :param str encoding: (Optional) The encoding, if not declared in the file.
+        :returns: The ``doi``, ``title``, document ``subtype`` (e.g. ``'fla'`` for a full-length article),
+            ``open_access`` flag (None if not given) and whether the article is ``rawtext_only``, without structured
+            full text. None if this is not an Elsevier full-text retrieval response.
+        :rtype: dict or None
+        """
+        tags = self._header_tags()
+        header = {'doi': None, 'title': None, 'subtype': None, 'open_access': None, 'rawtext_only': False}
+        root = None
+        try:
+            for event, el in etree.iterparse(f, events=('start', 'end'), tag=list(tags), encoding=encoding, recover=True):
+                name = tags[el.tag]
+                if root is None:
+                    if event != 'start' or name != 'root':
+                        return None
+                    root = el
+                elif event == 'start':
+                    if name == 'rawtext':
+                        header['rawtext_only'] = True
+                        break
+                    elif name == 'body':
+                        break
+                elif name in {'doi', 'title', 'subtype', 'open_access'} and header[name] is None:
+                    text = ' '.join(''.join(el.itertext()).split())
+                    if name == 'open_access':
+                        header[name] = {'1': True, 'true': True, '0': False, 'false': False}.get(text.lower())
+                    elif text:
+                        header[name] = text
+        except etree.XMLSyntaxError as e:
+            # Empty or truncated files, and files that are not XML at all
+            log.debug('Stopped reading header: %s', e)
+        if root is None:
+            return None
+        return header
+
+    @classmethod
+    def _header_tags(cls):
+        """The qualified tag names that :meth:`read_header` looks for, with the header value each one gives."""
+        tags = {}
+        for name, selectors in [('root', cls.root_css), ('doi', 'prism|doi, xocs|doi'),
+                                ('title', 'dc|title, xocs|normalized-article-title'),
+                                ('subtype', 'xocs|document-subtype'), ('open_access', 'default|openaccess'),
+                                ('rawtext', 'xocs|rawtext'), ('body', 'ja|body, ja|simple-body, ce|sections')]:
+            for selector in selectors.split(','):
+                prefix, local_name = selector.strip().split('|')
+                tags['{%s}%s' % (cls.namespaces[prefix], local_name)] = name
+        return tags
+
+    @classmethod
+    def _container_tags(cls):
+        """The qualified tag names of the :attr:`container_css` elements."""
+        tags = set()
+        for selector in cls.container_css.split(','):
+            prefix, name = selector.strip().split('|')
+            tags.add('{%s}%s' % (cls.namespaces[prefix], name))
+        return tags
+
+    def _parse_children(self, container, containers, special_css, until=None):
+        """Parse the text of an open container and its children that have been read, and remove them from the tree.
+
+        Each run of children between child containers is moved into a new element with the container's tag, along
+        with the text before it, and is cleaned and parsed together. Stripping and killing elements can join their
+        text onto their neighbours, so this gives the same text as cleaning the whole document. Containers are never
+        inline, so nothing is joined across them.
+
+        :param list container: The container element, its id, and whether its text has been parsed.
+        :param set containers: The container tags. Child containers have already been parsed, except for their tails.
+        :param str special_css: Selects the elements that need more than their text parsing.
+        :param until: (Optional) The child that is still being read.
+        :rtype: list(chemdataextractor.doc.element.BaseElement)
+        """
+        el, id, parsed = container
+        container[2] = True
+        runs = [[None if parsed else el.text, []]]
+        for child in list(el):
+            if child is until:
+                break
+            el.remove(child)
+            if child.tag in containers:
+                runs.append([child.tail, []])
+            else:
+                runs[-1][1].append(child)
+        elements = []
+        for text, children in runs:
+            if text is None and not children:
+                continue
+            run = etree.Element(el.tag)
+            run.text = text
+            run.extend(children)
+            for cleaner in self.cleaners:
+                cleaner(run)
+            specials, refs = {}, {}
+            if self._css(special_css, run):
+                self._collect_objects(run)
+                specials, refs = self._parse_specials(run)
+            elements.extend(self._parse_element(run, specials=specials, refs=refs, id=id))
+        return elements
+
     def detect(self, fstring, fname=None):
         """Elsevier document detection based on string found in xml"""
         if fname and not fname.endswith('.xml'):
@@ -225,11 +655,13 @@ class ElsevierXmlReader(XmlReader):
         """
         figure_link_css = self._css('ce|link', el)
         figure_link_locator = figure_link_css[0].get('locator', '') if figure_link_css else None
-        links = []
-        # find the locator id in the objects
-        objects = self._css('default|object', self.root)
-        for obj in objects:
-            ref = obj.get('ref', '0')
-            if ref == figure_link_locator:
-                links.append(obj.text)
-        return links
+        if self._objects is None:
+            # Find the objects once, rather than searching the whole document for each figure
+            self._objects = {}
+            self._collect_objects(self.root)
+        return list(self._objects.get(figure_link_locator, []))
+
+    def _collect_objects(self, el):
+        """Add the link of each object in an element to the links for its ref in :attr:`_objects`."""
+        for obj in self._css(self.object_css, el):
+            self._objects.setdefault(obj.get('ref', '0'), []).append(obj.text)
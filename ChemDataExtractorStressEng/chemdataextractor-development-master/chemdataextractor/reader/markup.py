@@ -11,6 +11,9 @@ from __future__ import unicode_literals
 import logging
 from abc import abstractmethod, ABCMeta
 from collections import defaultdict
+import mmap
+import multiprocessing
+import os
 
 from lxml import etree
 from lxml.etree import XMLParser
@@ -21,7 +24,7 @@ from ..errors import ReaderError
 from ..doc.document import Document
 from ..doc.text import Title, Heading, Paragraph, Caption, Citation, Footnote, Text, Sentence, Cell
 from ..doc.meta import MetaData
-from ..doc.table import Table
+from ..doc.table import Table, analyse_tables
 from ..doc.figure import Figure
 from ..scrape import INLINE_ELEMENTS
 from ..scrape.clean import clean
@@ -32,6 +35,57 @@ from .base import BaseReader
 
 log = logging.getLogger(__name__)
 
+#: Translator shared by all readers for their CSS selectors.
+css_translator = CssHTMLTranslator()
+
+
+class _TextFragments(object):
+    """
+    The pieces of text that will be joined into a single text element, collected as the markup is read.
+
+    Adding text elements together copies all of the text so far into a new element, which takes quadratic time for
+    text split over many inline elements. The pieces are collected here instead, and the element is built once,
+    with the same text, id and references that adding them would have given.
+    """
+
+    def __init__(self, element_cls, text, id=None, references=None):
+        self.element_cls = element_cls
+        self.texts = [text]
+        self.id = id
+        self.references = references if references is not None else []
+
+    def extend(self, other):
+        """Add the pieces of another :class:`_TextFragments` to the end of these."""
+        self.texts.extend(other.texts)
+        self.id = self.id or other.id
+        self.references = self.references + other.references
+
+    def build(self):
+        """The text element."""
+        return self.element_cls(''.join(self.texts), id=self.id, references=self.references)
+
+
+def _build(element):
+    """The document element for an element or :class:`_TextFragments`."""
+    return element.build() if isinstance(element, _TextFragments) else element
+
+
+def _text_type(element):
+    """The type of text element that an element or :class:`_TextFragments` is, or None if it is not text."""
+    if isinstance(element, _TextFragments):
+        return element.element_cls
+    if isinstance(element, (Text, Sentence)):
+        return type(element)
+    return None
+
+
+def _join(element, other):
+    """Add two elements or :class:`_TextFragments`, only building a new element if one of them is already built."""
+    if isinstance(element, _TextFragments) and isinstance(other, _TextFragments):
+        element.extend(other)
+        return element
+    return _build(element) + _build(other)
+
 
 class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
     """Abstract base class for lxml-based readers."""
@@ -72,11 +126,75 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
 
     ignore_css = 'a.ref sup'
 
+    #: Namespace prefixes that can be used in the CSS selectors, e.g. ``{'ce': 'http://www.elsevier.com/xml/common/dtd'}``
+    namespaces = None
+
     #: Inline elements
     inline_elements = INLINE_ELEMENTS
 
+    def __init__(self, lazy=False, table_processes=None):
+        """
+        :param bool lazy: (Optional) Whether to leave figure captions to be tagged when their records are first needed,
+            so that reading documents for their metadata or text does no NLP. See
+            :class:`~chemdataextractor.doc.figure.Figure`. Default False.
+        :param int table_processes: (Optional) If set, the tables of each document are analysed by TableDataExtractor
+            as a batch once the document has been read, in this many worker processes, instead of each table being
+            analysed when it is first used. See :func:`~chemdataextractor.doc.table.analyse_tables`. The worker
+            processes are started when they are first needed and kept for every document the reader reads, until
+            :meth:`close` is called.
+        """
+        super(LxmlReader, self).__init__()
+        self.lazy = lazy
+        self.table_processes = table_processes
+        self._table_pool = None
+        self._table_pool_pid = None
+
+    def __getstate__(self):
+        # Pools can't be pickled, so a copy sent to another process starts its own if it needs one
+        state = self.__dict__.copy()
+        state['_table_pool'] = None
+        state['_table_pool_pid'] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stop the worker processes that analyse tables, if they were started in this process."""
+        if self._table_pool is not None and self._table_pool_pid == os.getpid():
+            self._table_pool.close()
+            self._table_pool.join()
+        self._table_pool = None
+        self._table_pool_pid = None
+
+    def _get_table_pool(self, tables):
+        """The pool of worker processes to analyse the tables in, started the first time a document has more than one
+        table, or None if the tables are to be analysed in this process."""
+        # Daemonic processes, such as pool workers, can't start processes of their own
+        if self.table_processes <= 1 or len(tables) <= 1 or multiprocessing.current_process().daemon:
+            return None
+        if self._table_pool is None or self._table_pool_pid != os.getpid():
+            self._table_pool = multiprocessing.Pool(self.table_processes)
+            self._table_pool_pid = os.getpid()
+        return self._table_pool
+
+    def _make_document(self, elements):
+        """Make a Document of the elements, analysing its tables as a batch if :attr:`table_processes` is set."""
+        d = Document(*elements)
+        if self.table_processes:
+            tables = d.tables
+            analyse_tables(tables, pool=self._get_table_pool(tables))
+        return d
+
     def _parse_element_r(self, el, specials, refs, id=None, element_cls=Paragraph):
         """Recursively parse HTML/XML element and its children into a list of Document elements."""
+        return [_build(element) for element in self._parse_fragments_r(el, specials, refs, id=id, element_cls=element_cls)]
+
+    def _parse_fragments_r(self, el, specials, refs, id=None, element_cls=Paragraph):
+        """Like _parse_element_r, but with text still to be built as :class:`_TextFragments`."""
         elements = []
         if el.tag in {etree.Comment, etree.ProcessingInstruction}:
             return []
@@ -87,34 +205,35 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         id = el.get('id', id)
         references = refs.get(el, [])
         if el.text is not None:
-            elements.append(element_cls(six.text_type(el.text), id=id, references=references))
+            elements.append(_TextFragments(element_cls, six.text_type(el.text), id=id, references=references))
         elif references:
-            elements.append(element_cls('', id=id, references=references))
+            elements.append(_TextFragments(element_cls, '', id=id, references=references))
         for child in el:
             # br is a special case - technically inline, but we want to split
             if child.tag not in {etree.Comment, etree.ProcessingInstruction} and child.tag.lower() == 'br':
-                elements.append(element_cls(''))
+                elements.append(_TextFragments(element_cls, ''))
 
-            child_elements = self._parse_element_r(child, specials=specials, refs=refs, id=id, element_cls=element_cls)
+            child_elements = self._parse_fragments_r(child, specials=specials, refs=refs, id=id, element_cls=element_cls)
             if (self._is_inline(child) and len(elements) > 0 and len(child_elements) > 0 and
-                    isinstance(elements[-1], (Text, Sentence)) and isinstance(child_elements[0], (Text, Sentence)) and
-                    type(elements[-1]) == type(child_elements[0])):
-                elements[-1] += child_elements.pop(0)
+                    _text_type(elements[-1]) is not None and _text_type(elements[-1]) == _text_type(child_elements[0])):
+                elements[-1] = _join(elements[-1], child_elements.pop(0))
             elements.extend(child_elements)
             if child.tail is not None:
-                if self._is_inline(child) and len(elements) > 0 and isinstance(elements[-1], element_cls):
-                    elements[-1] += element_cls(six.text_type(child.tail), id=id)
+                tail = _TextFragments(element_cls, six.text_type(child.tail), id=id)
+                if (self._is_inline(child) and len(elements) > 0 and
+                        (isinstance(elements[-1], _TextFragments) or isinstance(elements[-1], element_cls))):
+                    elements[-1] = _join(elements[-1], tail)
                 else:
-                    elements.append(element_cls(six.text_type(child.tail), id=id))
+                    elements.append(tail)
         return elements
 
-    def _parse_element(self, el, specials=None, refs=None, element_cls=Paragraph):
+    def _parse_element(self, el, specials=None, refs=None, id=None, element_cls=Paragraph):
         """"""
         if specials is None:
             specials = {}
         if refs is None:
             refs = {}
-        elements = self._parse_element_r(el, specials=specials, refs=refs, element_cls=element_cls)
+        elements = self._parse_element_r(el, specials=specials, refs=refs, id=id, element_cls=element_cls)
         final_elements = []
         for element in elements:
             # Filter empty text elements
@@ -131,17 +250,23 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
             specials = {}
         if refs is None:
             refs = {}
-        elements = self._parse_element_r(el, specials=specials, refs=refs, element_cls=element_cls)
+        elements = self._parse_fragments_r(el, specials=specials, refs=refs, element_cls=element_cls)
         # This occurs if the input element is self-closing... (some table td in NLM XML)
         if not elements:
             return [element_cls('')]
         element = elements[0]
         for next_element in elements[1:]:
+            if isinstance(element, _TextFragments) and isinstance(next_element, _TextFragments):
+                element.extend(_TextFragments(element_cls, ' '))
+                element.extend(next_element)
+                continue
+            element = _build(element)
+            next_element = _build(next_element)
             try:
                 element += element_cls(' ') + next_element
             except TypeError as e:
                 log.warning('Adding of two objects was skipped. {} and {} cannot be added.'.format(str(type(element)), str(type(next_element))))
-        return [element]
+        return [_build(element)]
     
     def _parse_figure_links(self, el):
         return self._css(self.figure_download_link_css, el)
@@ -154,7 +279,7 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
 
         links = self._parse_figure_links(el)
         caption = self._parse_text(caps[0], refs=refs, specials=specials, element_cls=Caption)[0] if caps else Caption('')
-        fig = Figure(caption, label=label, links=links)
+        fig = Figure(caption, label=label, links=links, lazy=self.lazy)
         return [fig]
 
     def _parse_table_rows(self, els, refs, specials):
@@ -255,14 +380,37 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         return [meta]
 
     def _xpath(self, query, root):
-        result = root.xpath(query, smart_strings=False)
+        if isinstance(query, etree.XPath):
+            result = query(root)
+        else:
+            result = root.xpath(query, smart_strings=False)
         if type(result) is not list:
             result = [result]
-        log.debug('Selecting XPath: {}: {}'.format(query, result))
+        log.debug('Selecting XPath: %s: %s', query, result)
         return result
 
+    @classmethod
+    def _compile_css(cls, query):
+        """Return the compiled XPath for a CSS selector.
+
+        Each selector is translated and compiled once per reader class, with the class :attr:`namespaces`, and then
+        reused for every element of every document.
+
+        :param str query: The CSS selector.
+        :rtype: lxml.etree.XPath
+        """
+        compiled = cls.__dict__.get('_compiled_css')
+        if compiled is None:
+            compiled = {}
+            cls._compiled_css = compiled
+        xpath = compiled.get(query)
+        if xpath is None:
+            xpath = etree.XPath(css_translator.css_to_xpath(query), namespaces=cls.namespaces, smart_strings=False)
+            compiled[query] = xpath
+        return xpath
+
     def _css(self, query, root):
-        return self._xpath(CssHTMLTranslator().css_to_xpath(query), root)
+        return self._xpath(self._compile_css(query), root)
 
     def _is_inline(self, element):
         """Return True if an element is inline."""
@@ -275,6 +423,12 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         """Read a string into an lxml elementtree."""
         pass
 
+    def read(self, f):
+        """Read a file-like object and return a Document. Memory-mapped files are parsed without copying them."""
+        if isinstance(f, mmap.mmap):
+            return self.parse(f)
+        return super(LxmlReader, self).read(f)
+
     def parse(self, fstring):
         root = self._make_tree(fstring)
         self.root = root
@@ -285,6 +439,18 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         root = self._css(self.root_css, root)[0]
         for cleaner in self.cleaners:
             cleaner(root)
+        specials, refs = self._parse_specials(root)
+        elements = self._parse_element(root, specials=specials, refs=refs)
+        return self._make_document(elements)
+
+    def _parse_specials(self, root):
+        """Parse the titles, headings, figures, tables, citations and metadata in a cleaned tree.
+
+        :param root: The cleaned element.
+        :returns: The Document elements for each special element (empty for ignored elements), and the references
+            for each element that contains them.
+        :rtype: tuple(dict, defaultdict)
+        """
         specials = {}
         refs = defaultdict(list)
         titles = self._css(self.title_css, root)
@@ -311,13 +477,29 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
             specials[citation] = self._parse_text(citation, element_cls=Citation, refs=refs, specials=specials)
         for md in metadata:
             specials[md] = self._parse_metadata(md, refs=refs, specials=specials)
-        elements = self._parse_element(root, specials=specials, refs=refs)
-        return Document(*elements)
+        return specials, refs
+
+
+def parse_tree(fstring, parser):
+    """Parse a byte string or memory-mapped file with an lxml parser and return the root element.
+
+    Memory-mapped files are parsed straight from the map, without being read into a byte string first.
+
+    :param fstring: The byte string, or a memory-mapped file.
+    :param parser: The lxml parser.
+    """
+    if isinstance(fstring, mmap.mmap):
+        fstring.seek(0)
+        return etree.parse(fstring, parser=parser).getroot()
+    return etree.fromstring(fstring, parser=parser)
 
 
 class XmlReader(LxmlReader):
     """Reader for generic XML documents."""
 
+    formats = {'xml', 'markup'}
+    detect_size = 0
+
     def detect(self, fstring, fname=None):
         """"""
         if fname and not fname.endswith('.xml'):
@@ -325,13 +507,16 @@ class XmlReader(LxmlReader):
         return True
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=XMLParser(recover=True, encoding=get_encoding(fstring)))
+        root = parse_tree(fstring, XMLParser(recover=True, encoding=get_encoding(fstring)))
         return root
 
 
 class HtmlReader(LxmlReader):
     """Reader for generic HTML documents."""
 
+    formats = {'html', 'markup'}
+    detect_size = 0
+
     def detect(self, fstring, fname=None):
         """"""
         if fname and not (fname.endswith('.html') or fname.endswith('.htm')):
@@ -339,5 +524,5 @@ class HtmlReader(LxmlReader):
         return True
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=HTMLParser(encoding=get_encoding(fstring)))
+        root = parse_tree(fstring, HTMLParser(encoding=get_encoding(fstring)))
         return root
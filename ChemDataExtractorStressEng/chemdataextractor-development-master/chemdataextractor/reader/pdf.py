@@ -26,6 +26,9 @@ from ..errors import ReaderError
 class PdfReader(BaseReader):
     """"""
 
+    formats = {'pdf'}
+    detect_size = 0
+
     def detect(self, fstring, fname=None):
         """"""
         if fname and not fname.endswith('.pdf'):
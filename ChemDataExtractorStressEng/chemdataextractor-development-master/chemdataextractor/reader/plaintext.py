@@ -20,6 +20,8 @@ from ..text import get_encoding
 class PlainTextReader(BaseReader):
     """Read plain text and split into Paragraphs based on newline patterns."""
 
+    detect_size = 0
+
     def detect(self, fstring, fname=None):
         """Have a stab at most files."""
         if fname is not None and '.' in fname:
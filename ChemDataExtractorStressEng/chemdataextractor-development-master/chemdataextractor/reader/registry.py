@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Choose the reader for a file from the first few KB of it.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import Counter, defaultdict
+import io
+import logging
+import mmap
+import re
+
+from ..errors import ReaderError
+
+
+log = logging.getLogger(__name__)
+
+#: The start of an HTML document: an optional XML declaration and comments, then an HTML doctype or root element.
+HTML_START_RE = re.compile(br'^(<\?xml[^>]*>\s*)?(<!--.*?-->\s*)*<(!doctype\s+html|html)\b', re.I | re.S)
+#: Byte order marks of UTF-16 and UTF-32, which the sniffing stage does not decode.
+WIDE_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
+
+def sniff_format(head):
+    """Guess the format of a file from its first few KB, without parsing it.
+
+    Returns ``'pdf'`` for the PDF magic bytes, ``'html'`` for a document that starts with an HTML doctype or root
+    element, ``'xml'`` for any other document with an XML declaration, ``'markup'`` for other documents that start
+    with a tag, and ``'text'`` for anything else that is not binary. Returns None if the format can't be told, for
+    binary or wide-character input.
+
+    :param bytes head: The first few KB of the file.
+    :rtype: str or None
+    """
+    # The PDF header may come after some junk, but always in the first 1024 bytes
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(WIDE_BOMS) or b'\x00' in head:
+        return None
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:]
+    head = head.lstrip()
+    if not head:
+        return None
+    if head.startswith(b'<'):
+        if HTML_START_RE.match(head):
+            return 'html'
+        if head.startswith(b'<?xml'):
+            return 'xml'
+        return 'markup'
+    return 'text'
+
+
+def map_file(f):
+    """Memory-map a file opened for reading in binary mode.
+
+    :param f: The file object.
+    :returns: A read-only map of the whole file, or None if the file can't be mapped, such as an in-memory or empty
+        file, a pipe, or a file that has already been partly read.
+    :rtype: mmap.mmap or None
+    """
+    try:
+        if f.tell() != 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, io.UnsupportedOperation, ValueError, EnvironmentError):
+        return None
+
+
+def detect_size(reader):
+    """How many bytes at the start of a file the reader's :meth:`~chemdataextractor.reader.base.BaseReader.detect`
+    looks at, or None for the whole file.
+
+    :param chemdataextractor.reader.base.BaseReader reader: The reader.
+    :rtype: int or None
+    """
+    for cls in type(reader).__mro__:
+        if 'detect' in vars(cls):
+            return vars(cls).get('detect_size')
+    return None
+
+
+class ReaderRegistry(object):
+    """The readers to try for each file, in order.
+
+    The format of each file is sniffed once from its first few KB, and readers that can't read that format are
+    skipped without being asked. The rest are asked in turn if they can read the file, and the file is read by the
+    first that succeeds. The formats that each reader can read are given by its ``formats`` attribute, and readers
+    with no ``formats`` are always asked.
+
+    Usage::
+
+        from chemdataextractor.reader import DEFAULT_REGISTRY
+        DEFAULT_REGISTRY.register(MyXmlReader())
+        doc = DEFAULT_REGISTRY.read(fstring, fname='paper.xml')
+
+    The counts of how often each reader was skipped, rejected the file, failed to read it or read it are kept in
+    :attr:`stats`.
+
+    Files can also be read from a memory map with :meth:`read_file`. Readers are then only given the start of the file
+    to detect if they set :attr:`~chemdataextractor.reader.base.BaseReader.detect_size`, and the lxml readers parse
+    straight from the map.
+    """
+
+    #: How many bytes at the start of a file are sniffed.
+    head_size = 4096
+
+    def __init__(self, readers=None):
+        """Create a registry of readers.
+
+        :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) The readers, in the order to try
+            them. The list is used as it is, not copied.
+        """
+        self.readers = readers if readers is not None else []
+        self.stats = defaultdict(Counter)
+
+    def register(self, reader, before=None):
+        """Add a reader, to be tried before the first reader of class ``before``, or before all readers.
+
+        :param chemdataextractor.reader.base.BaseReader reader: The reader to add.
+        :param type before: (Optional) The class of reader to try this reader before.
+        """
+        index = 0
+        if before is not None:
+            index = len(self.readers)
+            for i, other in enumerate(self.readers):
+                if isinstance(other, before):
+                    index = i
+                    break
+        self.readers.insert(index, reader)
+
+    def unregister(self, reader_cls):
+        """Remove all readers of a class.
+
+        :param type reader_cls: The class of reader to remove.
+        """
+        self.readers[:] = [reader for reader in self.readers if type(reader) is not reader_cls]
+
+    def _verdicts(self, fstring, fname=None):
+        """Yield each reader in turn, with ``'skipped'`` if it can't read the sniffed format, ``'rejected'`` if it says
+        it can't read the file, or None if it may."""
+        fmt = sniff_format(fstring[:self.head_size])
+        # A memory-mapped file is only copied whole for readers that may look at all of it
+        whole = fstring if isinstance(fstring, bytes) else None
+        for reader in self.readers:
+            formats = getattr(reader, 'formats', None)
+            if fmt is not None and formats is not None and fmt not in formats:
+                yield reader, 'skipped'
+                continue
+            size = detect_size(reader)
+            if size is not None:
+                sample = fstring[:size]
+            else:
+                if whole is None:
+                    whole = fstring[:]
+                sample = whole
+            if not reader.detect(sample, fname=fname):
+                yield reader, 'rejected'
+            else:
+                yield reader, None
+
+    def candidates(self, fstring, fname=None):
+        """The readers that may read the file, in the order to try them.
+
+        :param bytes fstring: The contents of the file.
+        :param str fname: (Optional) The filename. Used to help determine the file format.
+        :rtype: list[chemdataextractor.reader.base.BaseReader]
+        """
+        return [reader for reader, verdict in self._verdicts(fstring, fname=fname) if verdict is None]
+
+    def read(self, fstring, fname=None):
+        """Read the file with the first reader that can, and return a Document.
+
+        :param fstring: The contents of the file, or a memory-mapped file.
+        :type fstring: bytes or mmap.mmap
+        :param str fname: (Optional) The filename. Used to help determine the file format.
+        :rtype: chemdataextractor.doc.document.Document
+        :raises ReaderError: If none of the readers can read the file.
+        """
+        mapped = isinstance(fstring, mmap.mmap)
+        for reader, verdict in self._verdicts(fstring, fname=fname):
+            stats = self.stats[reader.__class__.__name__]
+            if verdict is not None:
+                stats[verdict] += 1
+                continue
+            try:
+                if mapped:
+                    fstring.seek(0)
+                    d = reader.read(fstring)
+                else:
+                    d = reader.readstring(fstring)
+            except ReaderError:
+                stats['failed'] += 1
+                continue
+            stats['read'] += 1
+            log.debug('Parsed document with %s' % reader.__class__.__name__)
+            return d
+        raise ReaderError('Unable to read document')
+
+    def read_file(self, f, fname=None):
+        """Read a file with the first reader that can, and return a Document.
+
+        The file is memory-mapped where possible, so it is not read into memory as a whole, and otherwise read as
+        with :meth:`read`.
+
+        :param f: The file object, opened in binary mode.
+        :param str fname: (Optional) The filename. Used to help determine the file format.
+        :rtype: chemdataextractor.doc.document.Document
+        :raises ReaderError: If none of the readers can read the file.
+        """
+        mapped = map_file(f)
+        if mapped is None:
+            return self.read(f.read(), fname=fname)
+        try:
+            return self.read(mapped, fname=fname)
+        finally:
+            mapped.close()
@@ -13,7 +13,7 @@ from lxml import etree
 import six
 from lxml.html import HTMLParser
 from ..text import get_encoding
-from .markup import HtmlReader, XmlReader
+from .markup import HtmlReader, XmlReader, parse_tree
 from ..scrape.clean import clean, Cleaner, strip_html
 from ..scrape.pub.springer import tidy_springer_references
 
@@ -45,8 +45,7 @@ class SpringerMaterialsHtmlReader(HtmlReader):
         return False
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=HTMLParser(
-            encoding=get_encoding(fstring, guesses='utf-8', is_html=True)))
+        root = parse_tree(fstring, HTMLParser(encoding=get_encoding(fstring, guesses='utf-8', is_html=True)))
         return root
 
 def springer_html_whitespace(document):
@@ -117,6 +116,5 @@ class SpringerHtmlReader(HtmlReader):
         return False
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=HTMLParser(
-            encoding=get_encoding(fstring, guesses='utf-8', is_html=True)))
+        root = parse_tree(fstring, HTMLParser(encoding=get_encoding(fstring, guesses='utf-8', is_html=True)))
         return root
\ No newline at end of file
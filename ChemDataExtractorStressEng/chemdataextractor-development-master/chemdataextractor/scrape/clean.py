@@ -20,6 +20,25 @@ from . import BLOCK_ELEMENTS
 
 log = logging.getLogger(__name__)
 
+#: Whitespace around one or more newlines.
+NEWLINE_WHITESPACE_RE = re.compile(r'\s*\n\s*')
+#: Runs of spaces and tabs.
+SPACES_RE = re.compile(r'[ \t]+')
+
+
+def collapse_whitespace(text):
+    """Collapse whitespace down to a single space or a single newline, as :class:`Cleaner` does with fix_whitespace.
+
+    :param str text: The text to collapse.
+    :rtype: str
+    """
+    # Most text has nothing to collapse, and checking is much quicker than substituting
+    if '\n' in text:
+        text = NEWLINE_WHITESPACE_RE.sub('\n', text)
+    if '\t' in text or '  ' in text:
+        text = SPACES_RE.sub(' ', text)
+    return text
+
 
 class Cleaner(object):
     """Clean HTML or XML by removing tags completely or replacing with their contents.
@@ -110,7 +129,7 @@ class Cleaner(object):
                 parent.remove(el)
 
         # Collect all the allowed elements
-        to_keep = [el for el in doc.xpath(self.allow_xpath, namespaces=self.namespaces)] if self.allow_xpath else []
+        to_keep = set(doc.xpath(self.allow_xpath, namespaces=self.namespaces)) if self.allow_xpath else set()
 
         # Replace elements that match strip_xpath with their contents
         if self.strip_xpath:
@@ -145,13 +164,9 @@ class Cleaner(object):
         if self.fix_whitespace:
             for el in doc.iter():
                 if el.text is not None:
-                    el.text = re.sub(r'\s*\n\s*', '\n', el.text)
-                    el.text = re.sub(r'[ \t]+', ' ', el.text)
-                    # el.text = re.sub(r'\s+', ' ', el.text)
+                    el.text = collapse_whitespace(el.text)
                 if el.tail is not None:
-                    el.tail = re.sub(r'\s*\n\s*', '\n', el.tail)
-                    el.tail = re.sub(r'[ \t]+', ' ', el.tail)
-                    # el.tail = re.sub(r'\s+', ' ', el.tail)
+                    el.tail = collapse_whitespace(el.tail)
 
     def clean_html(self, html):
         """Apply ``Cleaner`` to HTML string or document and return a cleaned string or document."""
@@ -8,10 +8,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import codecs
+import mmap
 import re
 import unicodedata
 
 from bs4 import UnicodeDammit
+import six
 
 
 #: Control characters.
@@ -215,13 +218,42 @@ ISSN_RE = re.compile(r'^\d{4}-\d{3}[\dX]$', re.U)
 CONTROL_RE = re.compile('[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD\u10000-\u10FFFF]+')
 
 
+#: How many bytes at a time are checked to be valid UTF-8.
+UTF8_CHUNK_SIZE = 1 << 16
+
+
+def is_utf8(input_string):
+    """Return True if a byte string is valid UTF-8.
+
+    The string is decoded a chunk at a time, so it is never all decoded at once.
+
+    :param input_string: Encoded byte string, or a memory-mapped file.
+    :rtype: bool
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for start in range(0, len(input_string), UTF8_CHUNK_SIZE):
+            decoder.decode(input_string[start:start + UTF8_CHUNK_SIZE])
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
 def get_encoding(input_string, guesses=None, is_html=False):
     """Return the encoding of a byte string. Uses bs4 UnicodeDammit.
 
-    :param string input_string: Encoded byte string.
+    UnicodeDammit tries the first guess before anything else, so if that is UTF-8 and the string is valid UTF-8, the
+    string is only checked, rather than decoded and kept whole.
+
+    :param input_string: Encoded byte string, or a memory-mapped file.
     :param list[string] guesses: (Optional) List of encoding guesses to prioritize. Default is ['utf-8']
     :param bool is_html: Whether the input is HTML.
     """
+    if not isinstance(input_string, six.text_type) and (not guesses or guesses == 'utf-8') and is_utf8(input_string):
+        return 'utf-8'
+    if isinstance(input_string, mmap.mmap):
+        input_string = input_string[:]
     converted = UnicodeDammit(input_string, override_encodings=[guesses] if guesses else ['utf-8'], is_html=is_html)
     return converted.original_encoding
 
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+bench_dictionary_tagger
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Benchmark :meth:`DictionaryTagger.tag <chemdataextractor.nlp.tag.DictionaryTagger.tag>` on long, formula-dense
+sentences, against the previous matcher that checked every pair of start and end characters with a separate DAWG query.
+
+Usage::
+
+    python scripts/bench_dictionary_tagger.py [sentences] [--tokens N]
+
+Builds a dictionary of synthetic chemical names and formulae, and tags the given number of synthetic sentences
+(default 200) of N tokens each (default 300), with a chemical name or formula in every third token. Prints the time
+taken each way, and checks the tags are the same.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import random
+import sys
+import time
+
+from chemdataextractor.nlp.tag import DictionaryTagger
+
+ELEMENTS = ['Ti', 'Al', 'V', 'Fe', 'Ni', 'Cr', 'Mo', 'Nb', 'Zr', 'Cu', 'O', 'C', 'N', 'H', 'Si', 'Mn', 'Co', 'W']
+NAMES = ['titanium', 'aluminium', 'vanadium', 'iron', 'nickel', 'chromium', 'oxide', 'dioxide', 'carbide', 'nitride',
+         'silicate', 'hydroxide', 'sulfate', 'acetate', 'chloride']
+WORDS = ['the', 'alloy', 'was', 'annealed', 'at', '900', '°C', 'for', '2', 'h', 'and', 'showed', 'a', 'yield', 'strength',
+         'of', 'MPa', ',', '(', ')', 'with', 'phase', 'in', 'matrix', '.', 'wt', '%', '-', 'grain', 'size']
+
+
+def formula(rand):
+    return ''.join('%s%s' % (rand.choice(ELEMENTS), rand.choice(['', '', '2', '3', '0.5', '6'])) for _ in range(rand.randint(1, 4)))
+
+
+def make_dictionary(rand, size=20000):
+    """Synthetic chemical names and formulae, as lists of tokens."""
+    words = [[formula(rand)] for _ in range(size // 2)]
+    words += [[rand.choice(NAMES), rand.choice(NAMES)] for _ in range(size // 4)]
+    words += [[rand.choice(NAMES), '(', rand.choice(['II', 'III', 'IV']), ')', rand.choice(NAMES)] for _ in range(size // 4)]
+    return words
+
+
+def make_sentence(rand, dictionary, tokens):
+    """A synthetic sentence of about ``tokens`` tokens, with a chemical name or formula in every third token."""
+    sentence = []
+    while len(sentence) < tokens:
+        sentence.extend(rand.choice(dictionary) if len(sentence) % 3 == 0 else [rand.choice(WORDS)])
+    return sentence
+
+
+def reference_tag(tagger, tokens):
+    """The previous implementation of :meth:`DictionaryTagger.tag`, which checked every pair of start and end
+    characters with a separate DAWG query."""
+    tags = [None] * len(tokens)
+    norm = tagger._normalize(tokens)
+    length = len(norm)
+    delims = [0] + [i for span in [m.span() for m in tagger.delimiters.finditer(norm)] for i in span] + [length]
+    token_at_index = []
+    for i, t in enumerate(tokens):
+        token_at_index.extend([i] * (len(tagger.lexicon[t].normalized) + 1))
+    start_i = 0
+    end_i = 1
+    matches = {}
+    next_start = end_i
+    while True:
+        current = norm[start_i:end_i]
+        if tagger._dawg.has_keys_with_prefix(current):
+            if current in tagger._dawg and start_i in delims and end_i in delims:
+                matches[start_i] = (start_i, end_i, current)
+                next_start = end_i
+            if end_i < length:
+                end_i += 1
+                continue
+        start_i = next_start
+        if start_i >= length - 1:
+            break
+        end_i = start_i + 1
+        next_start = end_i
+    for start_i, end_i, current in sorted(matches.values()):
+        start_token = token_at_index[start_i]
+        end_token = token_at_index[end_i]
+        if not tags[start_token] == 'I-%s' % tagger.entity:
+            tags[start_token] = 'B-%s' % tagger.entity
+        tags[start_token+1:end_token+1] = ['I-%s' % tagger.entity] * (end_token - start_token)
+    return list(zip(tokens, tags))
+
+
+def main(args):
+    tokens = 300
+    if '--tokens' in args:
+        i = args.index('--tokens')
+        tokens = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    count = int(args[0]) if args else 200
+    rand = random.Random(1)
+    dictionary = make_dictionary(rand)
+    sentences = [make_sentence(rand, dictionary, tokens) for _ in range(count)]
+    same = True
+    for case_sensitive in [False, True]:
+        tagger = DictionaryTagger(words=dictionary, case_sensitive=case_sensitive)
+        # Compute the lexemes first, so only the matching is timed
+        tagger.tag(sentences[0])
+        for sentence in sentences:
+            tagger._normalize(sentence)
+        start = time.time()
+        expected = [reference_tag(tagger, sentence) for sentence in sentences]
+        reference_time = time.time() - start
+        start = time.time()
+        tagged = [tagger.tag(sentence) for sentence in sentences]
+        tag_time = time.time() - start
+        print('case_sensitive=%s: %s sentences of %s tokens, %s matches: previous %.3fs, now %.3fs (%.1fx)'
+              % (case_sensitive, count, tokens, sum(tag == 'B-CM' for sent in tagged for _, tag in sent),
+                 reference_time, tag_time, reference_time / tag_time))
+        if tagged != expected:
+            print('Tags differ')
+            same = False
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+bench_figure_links
+~~~~~~~~~~~~~~~~~~
+
+Benchmark finding the links of each figure in :class:`~chemdataextractor.reader.elsevier.ElsevierXmlReader` from a
+map of object refs, built once per document, against searching all the objects of the document for each figure, as
+the reader did before.
+
+Usage::
+
+    python scripts/bench_figure_links.py [figures per paper ...]
+
+The papers are generated with the given numbers of figures, each with four objects (thumbnail, standard, high
+resolution and alt text image) listed before the article as in full-text retrieval responses. The figure links of each
+paper are checked to be identical both ways.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import sys
+import time
+
+from chemdataextractor.reader.elsevier import ElsevierXmlReader
+
+PAPER = """<?xml version="1.0" encoding="UTF-8"?>
+<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd"
+    xmlns:ce="http://www.elsevier.com/xml/common/dtd" xmlns:ja="http://www.elsevier.com/xml/ja/dtd"
+    xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd" xmlns:xlink="http://www.w3.org/1999/xlink">
+<objects>%(objects)s</objects>
+<originalText><xocs:doc><xocs:serial-item><ja:article><ja:body><ce:sections><ce:section>
+<ce:section-title>Results</ce:section-title>
+%(figures)s
+</ce:section></ce:sections></ja:body></ja:article></xocs:serial-item></xocs:doc></originalText>
+</full-text-retrieval-response>"""
+
+OBJECT = '<object ref="gr%s" category="%s">https://api.elsevier.com/content/object/eid/gr%s.%s</object>'
+
+FIGURE = ('<ce:para>Grain size in Fig. %s.</ce:para><ce:figure id="f%s"><ce:label>Fig. %s</ce:label>'
+          '<ce:caption><ce:simple-para>Grains.</ce:simple-para></ce:caption>'
+          '<ce:link locator="gr%s" xlink:href="pii:S0000:gr%s"/></ce:figure>')
+
+
+def make_paper(figures):
+    """An Elsevier paper with the given number of figures."""
+    objects = ''.join(OBJECT % (i, category, i, extension) for i in range(figures)
+                      for category, extension in [('thumbnail', 'sml'), ('standard', 'jpg'), ('high', 'jpg'),
+                                                  ('alt', 'gif')])
+    return (PAPER % {'objects': objects, 'figures': ''.join(FIGURE % ((i,) * 5) for i in range(figures))}).encode('utf-8')
+
+
+def searching_parse_figure_links(self, el):
+    """Figure links before the map of object refs: all the objects are searched for each figure."""
+    figure_link_css = self._css('ce|link', el)
+    figure_link_locator = figure_link_css[0].get('locator', '') if figure_link_css else None
+    links = []
+    for obj in self._css(self.object_css, self.root):
+        if obj.get('ref', '0') == figure_link_locator:
+            links.append(obj.text)
+    return links
+
+
+def read(fstring):
+    """Read a paper, returning the elapsed time and the links of each figure."""
+    start = time.time()
+    doc = ElsevierXmlReader().parse(fstring)
+    return time.time() - start, [figure.links for figure in doc.figures]
+
+
+def main(args):
+    # Captions with unknown words are logged for every figure
+    logging.disable(logging.WARNING)
+    sizes = [int(arg) for arg in args] or [10, 100, 500, 1000]
+    # Load the taggers used to build the captions before timing
+    read(make_paper(1))
+    same = True
+    for figures in sizes:
+        fstring = make_paper(figures)
+        mapped_parse_figure_links = ElsevierXmlReader._parse_figure_links
+        ElsevierXmlReader._parse_figure_links = searching_parse_figure_links
+        try:
+            old_time, old_links = read(fstring)
+        finally:
+            ElsevierXmlReader._parse_figure_links = mapped_parse_figure_links
+        new_time, new_links = read(fstring)
+        print('%4s figures: searching %.3fs, mapped %.3fs (%.1fx)' % (
+            figures, old_time, new_time, old_time / new_time))
+        if new_links != old_links:
+            print('Figure links differ')
+            same = False
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+bench_merge
+~~~~~~~~~~~
+
+Benchmark the record merging at the end of :attr:`Document.records <chemdataextractor.doc.document.Document.records>`
+against the all-pairs loops it replaced, for increasing numbers of records.
+
+Usage::
+
+    python scripts/bench_merge.py [number of records ...]
+
+Each size is merged both ways from the same synthetic records, and the results are checked to be identical.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import copy
+import random
+import sys
+import time
+
+import six
+
+from chemdataextractor.doc.document import Document
+from chemdataextractor.model.base import ModelList
+from chemdataextractor.model.model import Compound, YieldStrength, GrainSize
+
+
+def make_records(n, seed=0):
+    """Records like those from a long review: compound records, and property records for a few hundred materials."""
+    rng = random.Random(seed)
+    materials = ['Ti-%sAl-%sV' % (i, j) for i in range(1, 20) for j in range(1, 20)]
+    labels = [six.text_type(i) for i in range(1, 40)]
+    records = []
+    for _ in range(n):
+        compound = Compound(names=[rng.choice(materials)])
+        if rng.random() < 0.3:
+            compound.labels = [rng.choice(labels)]
+        if rng.random() < 0.2:
+            records.append(compound)
+            continue
+        model = rng.choice([YieldStrength, GrainSize])
+        record = model(raw_value=six.text_type(rng.randint(1, 1000)), raw_units='MPa' if model is YieldStrength else 'μm')
+        if rng.random() < 0.8:
+            record.compound = compound
+        records.append(record)
+    return records
+
+
+def all_pairs_merge(records):
+    """The merging previously done in Document.records, comparing every pair of records."""
+    len_l = len(records)
+    i = 0
+    while i < (len_l - 1):
+        j = i + 1
+        while j < len_l:
+            r = records[i]
+            other_r = records[j]
+            r_compound = Document._record_compound(r)
+            other_r_compound = Document._record_compound(other_r)
+            if r_compound and other_r_compound:
+                rnames_std = {''.join(n.split()).lower() for n in r_compound.names}
+                onames_std = {''.join(n.split()).lower() for n in other_r_compound.names}
+                if len(set(r_compound.labels) - set(other_r_compound.labels)) > 0 and len(set(other_r_compound.labels) - set(r_compound.labels)) > 0:
+                    j += 1
+                    continue
+                if any(n in rnames_std for n in onames_std) or any(l in r_compound.labels for l in other_r_compound.labels):
+                    r_compound.merge(other_r_compound)
+                    other_r_compound.merge(r_compound)
+                    if isinstance(r, Compound) and isinstance(other_r, Compound):
+                        records.pop(j)
+                        records.pop(i)
+                        records.append(r_compound)
+                        len_l -= 1
+                        i -= 1
+                    break
+            j += 1
+        i += 1
+    for i in range(len(records)):
+        for j in range(len(records)):
+            if i != j:
+                records[j].merge_contextual(records[i])
+    # remove_subsets, comparing every pair of records of the same type
+    typed_list = {}
+    for element in records:
+        typed_list.setdefault(type(element), []).append(element)
+    new_models = []
+    for elements in typed_list.values():
+        to_remove = []
+        for i in range(len(elements)):
+            for j in range(len(elements)):
+                if i != j and elements[i].is_subset(elements[j]) and j not in to_remove:
+                    to_remove.append(i)
+        new_models.extend(element for i, element in enumerate(elements) if i not in to_remove)
+    return ModelList(*new_models)
+
+
+def indexed_merge(records):
+    """The merging now done in Document.records."""
+    records = Document()._merge_compound_records(ModelList(*records))
+    Document._merge_contextual_records(records)
+    records.remove_subsets()
+    return records
+
+
+def main(sizes):
+    print('%8s %12s %12s %8s' % ('records', 'all pairs/s', 'indexed/s', 'speedup'))
+    for n in sizes:
+        records = make_records(n)
+        times = []
+        results = []
+        for merge in (all_pairs_merge, indexed_merge):
+            copied = copy.deepcopy(records)
+            start = time.time()
+            results.append(merge(copied).serialize())
+            times.append(time.time() - start)
+        if results[0] != results[1]:
+            raise AssertionError('Merged records differ for %s records' % n)
+        print('%8d %12.3f %12.3f %7.1fx' % (n, times[0], times[1], times[0] / times[1]))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [125, 250, 500, 1000])
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+bench_reader
+~~~~~~~~~~~~
+
+Benchmark the CSS selectors of :class:`~chemdataextractor.reader.markup.LxmlReader`, compiled once per reader class,
+against translating every selector on each query, as readers did before.
+
+Usage::
+
+    python scripts/bench_reader.py [path to Elsevier XML ...] [--repeat N]
+
+Defaults to the Elsevier papers in ``tests/data/elsevier``. The selector queries made while reading each file are
+recorded and replayed both ways, and the files are then read in full both ways, checking the documents are identical.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import glob
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.reader.elsevier import ElsevierXmlReader
+from chemdataextractor.reader.markup import LxmlReader
+from chemdataextractor.scrape.csstranslator import CssHTMLTranslator
+
+
+def uncompiled_css(self, query, root):
+    """The selector lookup before compilation: a new translator and XPath string for each query."""
+    return self._xpath(CssHTMLTranslator().css_to_xpath(query), root)
+
+
+def record_queries(fstrings):
+    """The (selector, element) pairs queried while reading each file."""
+    queries = []
+    compiled_css = LxmlReader._css
+
+    def recording_css(self, query, root):
+        queries.append((query, root))
+        return compiled_css(self, query, root)
+
+    LxmlReader._css = recording_css
+    try:
+        # Keep the documents, so the recorded elements stay in their trees
+        docs = [ElsevierXmlReader().parse(fstring) for fstring in fstrings]
+    finally:
+        LxmlReader._css = compiled_css
+    return queries, docs
+
+
+def replay(css, queries, repeat):
+    """Run the recorded queries ``repeat`` times, returning the elapsed time."""
+    reader = ElsevierXmlReader()
+    start = time.time()
+    for _ in range(repeat):
+        for query, root in queries:
+            css(reader, query, root)
+    return time.time() - start
+
+
+def read(fstrings, repeat):
+    """Read each file ``repeat`` times, returning the elapsed time and a summary of the last documents."""
+    reader = ElsevierXmlReader()
+    start = time.time()
+    for _ in range(repeat):
+        docs = [reader.parse(fstring) for fstring in fstrings]
+    elapsed = time.time() - start
+    return elapsed, [[(type(el).__name__, getattr(el, 'text', None)) for el in doc.elements] for doc in docs]
+
+
+def main(args):
+    repeat = 5
+    if '--repeat' in args:
+        i = args.index('--repeat')
+        repeat = int(args[i + 1])
+        args = args[:i] + args[i + 2:]
+    paths = args or sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'tests', 'data', 'elsevier', '*.xml')))
+    fstrings = []
+    for path in paths:
+        with io.open(path, 'rb') as f:
+            fstrings.append(f.read())
+
+    queries, _ = record_queries(fstrings)
+    old_time = replay(uncompiled_css, queries, repeat * 10)
+    new_time = replay(LxmlReader._css, queries, repeat * 10)
+    print('%s selector queries x %s: uncompiled %.3fs, compiled %.3fs (%.1fx)' % (
+        len(queries), repeat * 10, old_time, new_time, old_time / new_time))
+
+    compiled_css = LxmlReader._css
+    LxmlReader._css = uncompiled_css
+    try:
+        old_time, old_docs = read(fstrings, repeat)
+    finally:
+        LxmlReader._css = compiled_css
+    new_time, new_docs = read(fstrings, repeat)
+    print('%s files x %s: uncompiled %.3fs, compiled %.3fs (%.1fx)' % (
+        len(fstrings), repeat, old_time, new_time, old_time / new_time))
+    if new_docs != old_docs:
+        print('Documents differ')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
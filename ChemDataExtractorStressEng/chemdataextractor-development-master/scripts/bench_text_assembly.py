@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+bench_text_assembly
+~~~~~~~~~~~~~~~~~~~
+
+Benchmark building text elements from markup in :class:`~chemdataextractor.reader.markup.LxmlReader`, where the pieces
+of text are collected and each element is built once, against adding text elements together piece by piece, as
+readers did before.
+
+Usage::
+
+    python scripts/bench_text_assembly.py [--pieces N] [--repeat N]
+
+Reads the Elsevier papers in ``tests/data/elsevier``, an Elsevier article made of long references and table cells with
+``N`` marked-up pieces each, and HTML paragraphs with ``N`` inline elements each, checking the documents are identical
+both ways. Figures are left out of the generated article, as building them tags every sentence of their captions,
+which takes far longer than reading them.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import glob
+import io
+import os
+import sys
+import time
+
+import six
+from lxml import etree
+
+from chemdataextractor.doc.text import Paragraph, Text, Sentence
+from chemdataextractor.reader.elsevier import ElsevierXmlReader
+from chemdataextractor.reader.markup import LxmlReader, HtmlReader
+
+ELSEVIER = """<?xml version="1.0" encoding="UTF-8"?>
+<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd"
+    xmlns:ce="http://www.elsevier.com/xml/common/dtd" xmlns:ja="http://www.elsevier.com/xml/ja/dtd"
+    xmlns:sb="http://www.elsevier.com/xml/common/struct-bib/dtd" xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd"
+    xmlns:cals="http://www.elsevier.com/xml/common/cals/dtd">
+<originalText><xocs:doc><xocs:serial-item><ja:article><ja:body><ce:sections><ce:section>
+<ce:section-title>Results</ce:section-title>
+<ce:para>The yield strength was measured.</ce:para>
+%(tables)s
+</ce:section></ce:sections></ja:body>
+<ja:tail><ce:bibliography><ce:bibliography-sec>%(references)s</ce:bibliography-sec></ce:bibliography></ja:tail>
+</ja:article></xocs:serial-item></xocs:doc></originalText>
+</full-text-retrieval-response>"""
+
+
+def make_elsevier(pieces, count=20):
+    """An Elsevier article with references and table cells of ``pieces`` marked-up pieces each."""
+    authors = ''.join('<sb:author><ce:given-name>A.</ce:given-name><ce:surname>Author%s</ce:surname></sb:author>' % i
+                      for i in range(pieces))
+    references = ''.join('<ce:bib-reference id="b%s"><ce:label>[%s]</ce:label><sb:reference><sb:contribution>'
+                         '<sb:authors>%s</sb:authors></sb:contribution></sb:reference></ce:bib-reference>'
+                         % (i, i, authors) for i in range(count))
+    cell = ''.join('<ce:simple-para>%s MPa</ce:simple-para>' % i for i in range(pieces))
+    rows = ''.join('<cals:row><ce:entry>Sample %s</ce:entry><ce:entry>%s</ce:entry></cals:row>' % (i, cell)
+                   for i in range(count))
+    tables = ('<ce:table id="t1"><ce:label>Table 1</ce:label><ce:caption><ce:simple-para>Yield strengths.'
+              '</ce:simple-para></ce:caption><cals:tgroup><cals:tbody>%s</cals:tbody></cals:tgroup></ce:table>' % rows)
+    return (ELSEVIER % {'references': references, 'tables': tables}).encode('utf-8')
+
+
+def make_html(pieces, count=50):
+    """HTML paragraphs of ``pieces`` inline elements each."""
+    para = ''.join('The yield strength of Ti<sub>%s</sub>Al<i> alloys</i> was <b>%s MPa</b>; ' % (i, i)
+                   for i in range(pieces))
+    return ('<html><body>%s</body></html>' % ''.join('<p>%s</p>' % para for _ in range(count))).encode('utf-8')
+
+
+def adding_parse_element_r(self, el, specials, refs, id=None, element_cls=Paragraph):
+    """Text assembly before collecting the pieces: each inline piece is added to the element so far."""
+    elements = []
+    if el.tag in {etree.Comment, etree.ProcessingInstruction}:
+        return []
+    if el in specials:
+        return specials[el]
+    id = el.get('id', id)
+    references = refs.get(el, [])
+    if el.text is not None:
+        elements.append(element_cls(six.text_type(el.text), id=id, references=references))
+    elif references:
+        elements.append(element_cls('', id=id, references=references))
+    for child in el:
+        if child.tag not in {etree.Comment, etree.ProcessingInstruction} and child.tag.lower() == 'br':
+            elements.append(element_cls(''))
+        child_elements = adding_parse_element_r(self, child, specials=specials, refs=refs, id=id, element_cls=element_cls)
+        if (self._is_inline(child) and len(elements) > 0 and len(child_elements) > 0 and
+                isinstance(elements[-1], (Text, Sentence)) and isinstance(child_elements[0], (Text, Sentence)) and
+                type(elements[-1]) == type(child_elements[0])):
+            elements[-1] += child_elements.pop(0)
+        elements.extend(child_elements)
+        if child.tail is not None:
+            if self._is_inline(child) and len(elements) > 0 and isinstance(elements[-1], element_cls):
+                elements[-1] += element_cls(six.text_type(child.tail), id=id)
+            else:
+                elements.append(element_cls(six.text_type(child.tail), id=id))
+    return elements
+
+
+def adding_parse_text(self, el, refs=None, specials=None, element_cls=Paragraph):
+    """Text assembly before collecting the pieces: each element is added to the element so far."""
+    elements = adding_parse_element_r(self, el, specials=specials or {}, refs=refs or {}, element_cls=element_cls)
+    if not elements:
+        return [element_cls('')]
+    element = elements[0]
+    for next_element in elements[1:]:
+        try:
+            element += element_cls(' ') + next_element
+        except TypeError:
+            pass
+    return [element]
+
+
+def summary(doc):
+    """The type, id, text and references of each element, including captions, and the table data."""
+    out = []
+    for el in doc.elements:
+        caption = getattr(el, 'caption', None)
+        if caption is not None:
+            out.append((type(el).__name__, caption.text, caption.id, caption.references))
+            tde_table = getattr(el, 'tde_table', None)
+            if tde_table is not None:
+                out.append(tde_table.raw_table.tolist())
+        else:
+            out.append((type(el).__name__, getattr(el, 'text', None), el.id, getattr(el, 'references', None)))
+    return out
+
+
+def read(reader, fstrings, repeat):
+    """Read each string ``repeat`` times, returning the elapsed time and a summary of the last documents."""
+    start = time.time()
+    for _ in range(repeat):
+        docs = [reader.parse(fstring) for fstring in fstrings]
+    return time.time() - start, [summary(doc) for doc in docs]
+
+
+def compare(name, reader, fstrings, repeat):
+    """Read both ways, print the times and return whether the documents are identical."""
+    collected_parse_element_r, collected_parse_text = LxmlReader._parse_element_r, LxmlReader._parse_text
+    LxmlReader._parse_element_r, LxmlReader._parse_text = adding_parse_element_r, adding_parse_text
+    try:
+        old_time, old_docs = read(reader, fstrings, repeat)
+    finally:
+        LxmlReader._parse_element_r, LxmlReader._parse_text = collected_parse_element_r, collected_parse_text
+    new_time, new_docs = read(reader, fstrings, repeat)
+    print('%-28s x %s: adding %.3fs, collecting %.3fs (%.1fx)' % (
+        name, repeat, old_time, new_time, old_time / new_time))
+    if new_docs != old_docs:
+        print('Documents differ')
+        return False
+    return True
+
+
+def main(args):
+    pieces, repeat = 200, 3
+    if '--pieces' in args:
+        pieces = int(args[args.index('--pieces') + 1])
+    if '--repeat' in args:
+        repeat = int(args[args.index('--repeat') + 1])
+    papers = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'tests', 'data', 'elsevier', '*.xml'))):
+        with io.open(path, 'rb') as f:
+            papers.append(f.read())
+    same = all([
+        compare('Elsevier test papers', ElsevierXmlReader(), papers, repeat),
+        compare('Elsevier, %s pieces' % pieces, ElsevierXmlReader(), [make_elsevier(pieces)], repeat),
+        compare('HTML, %s inline pieces' % pieces, HtmlReader(), [make_html(pieces)], repeat),
+    ])
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+test_corpus
+~~~~~~~~~~~
+
+Test running extraction over a corpus of documents.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from chemdataextractor.corpus import CorpusRunner, parsing_method, file_name, screen_file, TABLE_PARSING, TEXT_PARSING
+from chemdataextractor.model.model import YieldStrength, GrainSize, TableYieldStrength, TableGrainSize
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+ELSEVIER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2017.07.006.xml')
+
+
+class TestCorpusRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.dir, 'records.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def read_output(self):
+        with io.open(self.output, encoding='utf8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_parsing_method(self):
+        self.assertEqual(parsing_method(YieldStrength), TEXT_PARSING)
+        self.assertEqual(parsing_method(GrainSize), TEXT_PARSING)
+        self.assertEqual(parsing_method(TableYieldStrength), TABLE_PARSING)
+        self.assertEqual(parsing_method(TableGrainSize), TABLE_PARSING)
+
+    def test_file_name(self):
+        self.assertEqual(file_name('/data/papers/10.1016-j.actamat.2019.01.001.xml'), '10.1016/j.actamat.2019.01.001.xml')
+
+    def test_error_is_recorded(self):
+        """A document that fails is noted as finished with its error, and the run carries on."""
+        missing = os.path.join(self.dir, 'missing.xml')
+        runner = CorpusRunner(models=[YieldStrength], processes=1)
+        self.assertEqual(runner.run([missing], self.output), 0)
+        self.assertEqual(CorpusRunner.finished(self.output), {missing})
+        with io.open(CorpusRunner.done_path(self.output), encoding='utf8') as f:
+            self.assertIn('IOError' if str is bytes else 'FileNotFoundError', f.read())
+
+    def test_screen(self):
+        """Documents that are not full-length articles are skipped before they are read in full."""
+        self.assertIsNone(screen_file(ELSEVIER_PATH))
+        self.assertEqual(screen_file(ELSEVIER_PATH, open_access_only=True), 'not open access')
+        with io.open(ELSEVIER_PATH, 'rb') as f:
+            content = f.read()
+        review = os.path.join(self.dir, 'review.xml')
+        with io.open(review, 'wb') as f:
+            f.write(content.replace(b'<xocs:document-subtype>fla<', b'<xocs:document-subtype>rev<'))
+        self.assertEqual(screen_file(review), 'document subtype rev')
+        self.assertIsNone(screen_file(review, subtypes=None))
+        runner = CorpusRunner(models=[YieldStrength], processes=1, screen=True)
+        self.assertEqual(runner.run([review], self.output), 0)
+        with io.open(CorpusRunner.done_path(self.output), encoding='utf8') as f:
+            self.assertEqual(f.read(), '%s\tskipped: document subtype rev\t0\n' % review)
+
+    def test_resume(self):
+        """Records for all models come from one pass, and finished documents are skipped when resuming."""
+        runner = CorpusRunner(models=[YieldStrength, GrainSize], processes=1)
+        count = runner.run([ELSEVIER_PATH], self.output)
+        records = self.read_output()
+        self.assertEqual(count, len(records))
+        for record in records:
+            self.assertEqual(record['file_name'], 'j.jnoncrysol.2017.07.006.xml')
+            self.assertEqual(record['parsing_method'], TEXT_PARSING)
+            self.assertIn(record['extraction_model'], [str(YieldStrength), str(GrainSize)])
+            self.assertNotIn('Compound', record)
+        with io.open(CorpusRunner.done_path(self.output), encoding='utf8') as f:
+            self.assertEqual(f.read(), '%s\tok\t%s\n' % (os.path.abspath(ELSEVIER_PATH), os.path.getsize(self.output)))
+        self.assertEqual(runner.run([ELSEVIER_PATH], self.output), 0)
+        self.assertEqual(self.read_output(), records)
+
+    def test_resume_interrupted(self):
+        """Records written for a document that wasn't noted as finished are removed when resuming."""
+        first, second = os.path.join(self.dir, 'first.xml'), os.path.join(self.dir, 'second.xml')
+        runner = CorpusRunner(models=[YieldStrength], processes=1)
+        runner.run([first], self.output)
+        with io.open(CorpusRunner.done_path(self.output), encoding='utf8') as f:
+            done = f.read()
+        # A run stopped after writing the records of the second document, part way through noting it as finished
+        with io.open(self.output, 'a', encoding='utf8') as f:
+            f.write('{"file_name": "second.xml"}\n')
+        with io.open(CorpusRunner.done_path(self.output), 'a', encoding='utf8') as f:
+            f.write(second)
+        self.assertEqual(CorpusRunner.finished(self.output), {first})
+        runner.run([first, second], self.output)
+        self.assertEqual(self.read_output(), [])
+        with io.open(CorpusRunner.done_path(self.output), encoding='utf8') as f:
+            lines = f.read().splitlines(True)
+        self.assertEqual(lines[0], done)
+        self.assertTrue(lines[1].startswith('%s\t' % second))
+        self.assertEqual(len(lines), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
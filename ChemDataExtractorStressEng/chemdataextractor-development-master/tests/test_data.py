@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+test_data
+~~~~~~~~~
+
+Test packing models.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import defaultdict
+import io
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from chemdataextractor.data import (load_packed, pack_pickle, PackedIntDict, PackedSet, PackedTextDict,
+                                    PackedWeights)
+from chemdataextractor.nlp.tag import AveragedPerceptron
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestPackPickle(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def pack(self, model):
+        src = os.path.join(self.path, 'model.pickle')
+        with io.open(src, 'wb') as f:
+            pickle.dump(model, f, protocol=2)
+        return pack_pickle(src, os.path.join(self.path, 'model.packed'))
+
+    def test_clusters(self):
+        """Test a dictionary of words to Brown clusters is packed into a DAWG."""
+        clusters = {'word%s' % i: '{0:b}'.format(i) for i in range(1500)}
+        clusters['(Δθ)2'] = '11011'
+        packed = load_packed(self.pack(clusters))
+        self.assertIsInstance(packed, PackedTextDict)
+        self.assertEqual(dict(packed), clusters)
+        self.assertEqual(packed['(Δθ)2'], '11011')
+        self.assertEqual(packed.get('alloy'), None)
+        self.assertEqual(len(packed), 1501)
+
+    def test_perceptron(self):
+        """Test averaged perceptron weights are packed into arrays and predict the same labels."""
+        labels = ['NN', 'JJ', 'VBD', 'CD']
+        weights = {'w=%s' % i: {labels[j % 4]: round((i - j) / 7, 3) for j in range(i % 3 + 1)} for i in range(2000)}
+        tagdict = {'word%s' % i: labels[i % 4] for i in range(1000)}
+        packed_weights, packed_tagdict, classes, clusters = load_packed(self.pack((weights, tagdict, set(labels), True)))
+        self.assertIsInstance(packed_weights, PackedWeights)
+        self.assertIsInstance(packed_tagdict, PackedTextDict)
+        self.assertEqual(dict(packed_weights.items()), weights)
+        self.assertEqual(dict(packed_tagdict), tagdict)
+        self.assertEqual((classes, clusters), (set(labels), True))
+        perceptron, packed_perceptron = AveragedPerceptron(), AveragedPerceptron()
+        perceptron.weights, perceptron.classes = weights, classes
+        packed_perceptron.weights, packed_perceptron.classes = packed_weights, classes
+        features = [['w=%s' % (i * j % 2500) for j in range(10)] for i in range(100)]
+        self.assertEqual([packed_perceptron.predict(f) for f in features], [perceptron.predict(f) for f in features])
+        self.assertEqual(dict(pickle.loads(pickle.dumps(packed_weights)).items()), weights)
+
+    def test_punkt_parameters(self):
+        """Test only large sets and dictionaries of text are packed, keeping the default of a defaultdict."""
+        ortho_context = defaultdict(int, (('word%s' % i, i % 64) for i in range(1000)))
+        starters = set('word%s' % i for i in range(1000))
+        model = {'ortho_context': ortho_context, 'sent_starters': starters, 'abbrev_types': {'fig', 'eq'},
+                 'collocations': set(('word%s' % i, 'word') for i in range(1000))}
+        packed = load_packed(self.pack(model))
+        self.assertIsInstance(packed['ortho_context'], PackedIntDict)
+        self.assertEqual(dict(packed['ortho_context']), ortho_context)
+        self.assertEqual(packed['ortho_context']['alloy'], 0)
+        self.assertIsInstance(packed['sent_starters'], PackedSet)
+        self.assertEqual(set(packed['sent_starters']), starters)
+        self.assertFalse(('word1', 'word') in packed['sent_starters'])
+        self.assertEqual(packed['abbrev_types'], {'fig', 'eq'})
+        self.assertEqual(packed['collocations'], model['collocations'])
+
+    def test_nothing_to_pack(self):
+        """Test models that aren't pickles or have nothing large enough to pack are left alone."""
+        self.assertEqual(self.pack({'fig': 'NN'}), None)
+        with io.open(os.path.join(self.path, 'model.crf'), 'wb') as f:
+            f.write(b'lCRF\x00\x00\x00\x00')
+        self.assertEqual(pack_pickle(os.path.join(self.path, 'model.crf'), os.path.join(self.path, 'crf.packed')), None)
+        self.assertEqual(sorted(os.listdir(self.path)), ['model.crf', 'model.pickle'])
+
+
+if __name__ == '__main__':
+    unittest.main()
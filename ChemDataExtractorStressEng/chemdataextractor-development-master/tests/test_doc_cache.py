@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+test_doc_cache
+~~~~~~~~~~~~~~
+
+Test the persistent annotation cache.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from chemdataextractor.doc import Document, Paragraph, Sentence
+from chemdataextractor.doc.cache import AnnotationCache
+from chemdataextractor.model.model import YieldStrength
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestAnnotationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = AnnotationCache(os.path.join(self.dir, 'annotations.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.dir)
+
+    def test_key(self):
+        """Test the key depends on the sentence text and models, but not its position."""
+        s1 = Sentence('The yield strength was 900 MPa.')
+        s2 = Sentence('The yield strength was 900 MPa.', start=40, end=71)
+        s3 = Sentence('The yield strength was 950 MPa.')
+        s4 = Sentence('The yield strength was 900 MPa.', models=[YieldStrength])
+        self.assertEqual(self.cache.key(s1), self.cache.key(s2))
+        self.assertNotEqual(self.cache.key(s1), self.cache.key(s3))
+        self.assertNotEqual(self.cache.key(s1), self.cache.key(s4))
+
+    def test_pickle(self):
+        """Test the cache can be sent to worker processes."""
+        self.cache.connection
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(cache.path, self.cache.path)
+        self.assertEqual(cache.load([Sentence('Not in the cache.')]), 0)
+        cache.close()
+
+    def test_load(self):
+        """Test annotations loaded from the cache are the same as those computed."""
+        text = 'The yield strength of 2,4,6-trinitrotoluene (TNT) was 900 MPa.'
+        s1 = Sentence(text, models=[YieldStrength])
+        self.assertEqual(self.cache.load([s1]), 0)
+        self.assertEqual(self.cache.store([s1]), 1)
+        s2 = Sentence(text, start=10, end=10 + len(text), models=[YieldStrength])
+        self.assertEqual(self.cache.load([s2]), 1)
+        self.assertEqual(self.cache.store([s2]), 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual([(t.text, t.start - 10, t.end - 10) for t in s2.tokens], [(t.text, t.start, t.end) for t in s1.tokens])
+        self.assertEqual(s2.pos_tagged_tokens, s1.pos_tagged_tokens)
+        self.assertEqual(s2.unprocessed_ner_tags, s1.unprocessed_ner_tags)
+        self.assertEqual(s2.abbreviation_definitions, s1.abbreviation_definitions)
+        self.assertEqual(s2.ner_tags, s1.ner_tags)
+        self.assertEqual([c.text for c in s2.cems], [c.text for c in s1.cems])
+
+    def test_document_annotate(self):
+        """Test a Document annotated from the cache gives the same records."""
+        text = 'The yield strength of Ti-6Al-4V was 900 MPa.'
+        expected = Document(Paragraph(text), models=[YieldStrength]).records.serialize()
+        Document(Paragraph(text)).annotate(models=[YieldStrength], cache=self.cache)
+        d = Document(Paragraph(text)).annotate(models=[YieldStrength], cache=self.cache)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(d.records.serialize(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
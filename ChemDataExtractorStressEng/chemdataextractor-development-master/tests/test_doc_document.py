@@ -15,6 +15,7 @@ import logging
 import unittest
 
 from chemdataextractor.doc.document import Document
+from chemdataextractor.model.model import YieldStrength, GrainSize
 
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
@@ -77,5 +78,38 @@ class TestDocument(unittest.TestCase):
         expected = {'MetaData': {'title': 'STRUCTURALELECTROCHEMICALCHARACTERIZATIONCA50MG20CU25ZN5AMORPHOUSALLOY', 'authors': ['BABILAS'], 'publisher': '© 2017 Elsevier B.V. All rights reserved.', 'journal': 'Journal of Non-Crystalline Solids', 'date': '2017-07-14', 'volume': '471', 'issue': '0022-3093', 'firstpage': '467', 'lastpage': '475', 'doi': '10.1016/j.jnoncrysol.2017.07.006', 'html_url': 'https://sciencedirect.com/science/article/pii/S0022309317303496'}}
         self.assertEqual(result, expected)
 
+    def test_annotate_keeps_annotations(self):
+        """Test annotations are reused after the models change, and the new models reach existing sentences."""
+        d = Document('The yield strength of Ti-6Al-4V was 900 MPa. It was then annealed.').annotate()
+        tokens = d.elements[0].sentences[0].tokens
+        d.models = [YieldStrength]
+        self.assertIs(d.elements[0].sentences[0].tokens, tokens)
+        for sentence in d.elements[0].sentences:
+            self.assertEqual(sentence.models, [YieldStrength])
+
+    def test_records_for_groups(self):
+        """Test each model group gives the same records as a separately parsed Document."""
+        els = ['The yield strength of Ti-6Al-4V was 900 MPa.', 'The grain size of Ti-6Al-4V was 20 μm.']
+        groups = [[YieldStrength], [GrainSize], [YieldStrength, GrainSize]]
+        results = Document(*els).records_for_groups(groups)
+        for models, records in zip(groups, results):
+            expected = Document(*els, models=models).records
+            self.assertEqual(records.serialize(), expected.serialize())
+
+    def test_iter_records(self):
+        """Test records are yielded element by element, and match records when merged over the whole Document."""
+        els = ['The yield strength of Ti-6Al-4V was 900 MPa.', 'The yield strength of Ti-6Al-4V was 900 MPa.',
+               'The yield strength of Ti-6Al-2Sn was 950 MPa.']
+        expected = Document(*els, models=[YieldStrength]).records.serialize()
+        d = Document(*els, models=[YieldStrength])
+        self.assertEqual([r.serialize() for r in d.iter_records(window=None)], expected)
+        records = d.iter_records()
+        first = next(records)
+        self.assertEqual(first.serialize(), expected[0])
+        # The duplicate in the second element is only removed when merging over both elements
+        self.assertEqual(len(list(records)), 2)
+        self.assertEqual([r.serialize() for r in d.iter_records(window=2)], expected)
+
+
 if __name__ == '__main__':
     unittest.main()
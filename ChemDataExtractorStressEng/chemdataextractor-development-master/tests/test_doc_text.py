@@ -16,7 +16,7 @@ import unittest
 import os
 
 from chemdataextractor.doc.document import Document
-from chemdataextractor.doc.text import Paragraph, Title, Heading, Caption, Footnote
+from chemdataextractor.doc.text import Paragraph, Title, Heading, Caption, Footnote, Citation, tag_sentences
 from chemdataextractor.config import Config
 from chemdataextractor.model import Compound, NmrSpectrum, IrSpectrum, UvvisSpectrum, MeltingPoint, GlassTransition
 from chemdataextractor.nlp import *
@@ -80,3 +80,11 @@ class TestText(unittest.TestCase):
         self.assertEqual(type(title.lexicon), ChemLexicon)
         self.assertEqual(type(title.sentence_tokenizer), ChemSentenceTokenizer)
         self.assertEqual(type(title.word_tokenizer), ChemWordTokenizer)
+
+    def test_tag_sentences(self):
+        """Test batch tagging gives each sentence the same tags as tagging it on its own."""
+        els = ['UV-vis spectrum of Coumarin 343 in THF. It was dried.', 'Smith et al., J. Chem. Phys. 2001, 3, 45.']
+        expected = [sent.unprocessed_ner_tagged_tokens for sent in Paragraph(els[0]).sentences + Citation(els[1]).sentences]
+        sentences = Paragraph(els[0]).sentences + Citation(els[1]).sentences
+        tag_sentences(sentences)
+        self.assertEqual([sent._unprocessed_ner_tagged_tokens for sent in sentences], expected)
@@ -12,12 +12,13 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import logging
+import threading
 import unittest
 
 from chemdataextractor.model import Compound, MeltingPoint, UvvisSpectrum, UvvisPeak, Apparatus, BaseModel
 from chemdataextractor.model.units.temperature import TemperatureModel
 from chemdataextractor.parse.elements import I, W
-from chemdataextractor.model.base import StringType, ModelType
+from chemdataextractor.model.base import StringType, ModelType, ModelList, UpdatableContext
 from chemdataextractor.doc.text import Sentence
 from chemdataextractor.parse.auto import AutoSentenceParser
 from chemdataextractor.doc import Document
@@ -184,6 +185,62 @@ class TestModel(unittest.TestCase):
         self.assertTrue(b_list[2].is_subset(b_list[3]))
         self.assertFalse(b_list[2].is_subset(b_list[0]))
 
+    def test_remove_subsets(self):
+        class A(BaseModel):
+            attribute_1 = StringType()
+            attribute_2 = StringType()
+
+        a_list = [
+            A(attribute_1='test'),
+            A(attribute_1='test', attribute_2='test'),
+            A(attribute_1='other'),
+            A(attribute_1='test', attribute_2='test'),
+            A(),
+        ]
+        models = ModelList(*a_list)
+        models.remove_subsets()
+        # Only the last of any duplicates is kept
+        self.assertEqual(models.models, [a_list[2], a_list[3]])
+        models = ModelList(*a_list)
+        models.remove_subsets(strict=True)
+        self.assertEqual(models.models, [a_list[1], a_list[2], a_list[3]])
+
+        # A raw value of 'NoValue' is a subset of any other raw value
+        mp_list = [
+            MeltingPoint(raw_value='NoValue', raw_units='°C'),
+            MeltingPoint(raw_value='100', raw_units='°C'),
+            MeltingPoint(raw_value='120', raw_units='°C'),
+        ]
+        models = ModelList(*mp_list)
+        models.remove_subsets()
+        self.assertEqual(models.models, mp_list[1:])
+
+    def test_updatable_context(self):
+        """Test updates made in a context are only seen in that context, and not by other threads."""
+        class A(BaseModel):
+            specifier = StringType(parse_expression=I('Néel') + I('temperature'), updatable=True)
+
+        definition = {'tokens': [('Néel', 'NNP'), ('temperature', 'NN'), (',', ','), ('TN', 'NNP')], 'specifier': 'TN'}
+        tokens = [('TN', 'NNP')]
+        original = A.specifier.parse_expression
+        context = UpdatableContext()
+        with context:
+            A.update([definition])
+            self.assertTrue(A().was_updated)
+            self.assertEqual(len(list(A.specifier.parse_expression.scan(tokens))), 1)
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(list(A.specifier.parse_expression.scan(tokens))))
+            thread.start()
+            thread.join()
+            self.assertEqual(seen, [[]])
+        self.assertIs(A.specifier.parse_expression, original)
+        self.assertFalse(A().was_updated)
+        with context:
+            self.assertEqual(len(list(A.specifier.parse_expression.scan(tokens))), 1)
+            A.reset_updatables()
+            self.assertEqual(list(A.specifier.parse_expression.scan(tokens)), [])
+            self.assertFalse(A().was_updated)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,7 +16,9 @@ import logging
 import unittest
 
 from chemdataextractor.doc import Span, Document
-from chemdataextractor.nlp.cem import CiDictCemTagger, CrfCemTagger, CemTagger
+from chemdataextractor.nlp.cem import (CiDictCemTagger, CrfCemTagger, CemTagger, ignored_prefix, ignored_suffix, is_split,
+                                      match_special)
+from chemdataextractor.nlp.lexicon import Lexicon
 
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
@@ -48,6 +50,25 @@ class TestCrfCemTagger(unittest.TestCase):
             ])
         )
 
+    def test_sentence_features(self):
+        """Test the features of a sentence built from the features cached on each lexeme are the same as the features
+        of each token in turn."""
+        # Lexicons are singletons, so the test needs a lexicon class of its own
+        lexicon = type(str('TestLexicon'), (Lexicon,), {})()
+        lexicon.clusters = {'spectrum': '0110100111', 'THF': '11001011100100'}
+        lexicon._loaded_clusters = True
+        sents = [
+            [('UV-vis', 'JJ'), ('spectrum', 'NN'), ('of', 'IN'), ('Coumarin', 'NN'), ('343', 'CD'), ('in', 'IN'), ('THF', 'NN')],
+            [('(', '-LRB-'), ('see', 'VB'), ('http://example.com', 'NN'), (')', '-RRB-')],
+            [('THF', 'NN'), ('spectrum', 'NN')],
+            [('THF', 'NN')],
+            [],
+        ]
+        for dt in [CrfCemTagger(lexicon=lexicon), CrfCemTagger(lexicon=lexicon, clusters=False)]:
+            for sent in sents:
+                self.assertEqual([dt._get_features(sent, i) for i in range(len(sent))], dt._get_sentence_features(sent))
+        self.assertEqual(sorted(lexicon['THF'].tagger_features), ['cem', 'cem.clusters'])
+
 
 class TestCemDictionaryTagger(unittest.TestCase):
 
@@ -89,6 +110,45 @@ class TestCemTagger(unittest.TestCase):
         self.assertEqual([], Document('-aromatic').cems)
         self.assertEqual([], Document('non-aromatic').cems)
 
+    def test_tag_sents(self):
+        """Test tagging a batch of sentences gives the same tags as tagging each sentence on its own."""
+        ct = CemTagger()
+        sents = [
+            [('UV-vis', 'JJ'), ('spectrum', 'NN'), ('of', 'IN'), ('Coumarin', 'NN'), ('343', 'CD'), ('in', 'IN'), ('THF', 'NN')],
+            [('benzene-aromatic', 'NN')],
+            [],
+            [('non-aromatic', 'JJ'), ('1H', 'CD'), ('NMR', 'NN')],
+        ]
+        self.assertEqual([ct.tag(sent) for sent in sents], ct.tag_sents(sents))
+
+
+class TestStopLists(unittest.TestCase):
+    """Test matching the compiled prefix, suffix, split and special case lists."""
+
+    def test_ignored_affixes(self):
+        """Test the first matching prefix or suffix in each list is found."""
+        self.assertEqual('non-', ignored_prefix('non-aromatic'))
+        self.assertEqual('-aromatic', ignored_suffix('non-aromatic'))
+        self.assertEqual(None, ignored_prefix('benzene-based'))
+        self.assertEqual('-based', ignored_suffix('benzene-based'))
+        # -s-transferase comes before -transferase in IGNORE_SUFFIX
+        self.assertEqual('-s-transferase', ignored_suffix('glutathione-s-transferase'))
+        self.assertEqual(None, ignored_suffix('benzene'))
+
+    def test_is_split(self):
+        """Test mentions are split only if every component matches the same split pattern."""
+        self.assertTrue(is_split(['Ag', 'Au']))
+        self.assertTrue(is_split(['Ala12', 'Gly']))
+        self.assertFalse(is_split(['gold', 'Au']))
+        self.assertFalse(is_split(['benzene', 'aromatic']))
+
+    def test_match_special(self):
+        """Test the first matching special case is used."""
+        self.assertEqual(('ZnO',), match_special('ZnO-NPs').groups())
+        self.assertEqual(('UDP',), match_special('UDP-glucuronosyltransferase').groups())
+        self.assertEqual(('Ti', 'Al'), match_special('Ti-doped-Al').groups())
+        self.assertEqual(None, match_special('benzene'))
+
 
 # TODO: Test entity recognition on a sentence containing a generic abbreviation that is only picked up through its definition
 
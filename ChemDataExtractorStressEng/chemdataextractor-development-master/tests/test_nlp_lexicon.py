@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+test_nlp_lexicon
+~~~~~~~~~~~~~~~~
+
+Test the lexicon.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import unittest
+
+from chemdataextractor.nlp.lexicon import Lexicon, Lexeme
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+def features(lexeme):
+    return tuple(getattr(lexeme, name) for name in Lexeme.__slots__)
+
+
+class TestLexicon(unittest.TestCase):
+
+    def setUp(self):
+        # Lexicons are singletons, so each test needs a lexicon class of its own
+        self.lexicon = type(str('TestLexicon'), (Lexicon,), {})()
+
+    def test_unbounded(self):
+        """Test every lexeme is kept by default."""
+        for text in ['Ti', 'alloy', '900', 'Ti']:
+            self.lexicon.add(text)
+        self.assertEqual(len(self.lexicon), 3)
+        self.assertEqual(self.lexicon.misses, 3)
+        self.assertEqual(self.lexicon['alloy'].is_lower, True)
+        self.assertEqual(self.lexicon.evictions, 0)
+
+    def test_max_size(self):
+        """Test the least recently used lexemes are evicted, and are the same if computed again."""
+        lexicon = self.lexicon
+        lexicon.add('1.5')
+        expected = features(lexicon['1.5'])
+        lexicon.max_size = 3
+        for text in ['Ti', 'alloy', '1.5', '900']:
+            lexicon.add(text)
+        self.assertEqual(list(lexicon.lexemes), ['alloy', '1.5', '900'])
+        self.assertEqual((lexicon.hits, lexicon.misses, lexicon.evictions), (1, 4, 1))
+        lexicon.max_size = 1
+        self.assertEqual(list(lexicon.lexemes), ['900'])
+        self.assertEqual(features(lexicon['1.5']), expected)
+        self.assertEqual(list(lexicon.lexemes), ['1.5'])
+
+    def test_pin(self):
+        """Test pinned lexemes are never evicted, and don't count towards the size."""
+        lexicon = self.lexicon
+        lexicon.add('alloy')
+        lexicon.pin(['alloy', 'strength'])
+        lexicon.max_size = 0
+        lexicon.add('900')
+        self.assertEqual(len(lexicon), 2)
+        self.assertEqual(sorted(lexicon.pinned), ['alloy', 'strength'])
+        self.assertIs(lexicon['strength'], lexicon.pinned['strength'])
+        self.assertEqual(lexicon['900'].like_number, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
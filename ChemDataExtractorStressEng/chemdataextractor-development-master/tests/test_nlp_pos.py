@@ -16,7 +16,8 @@ import logging
 import unittest
 
 from chemdataextractor.doc.text import Text
-from chemdataextractor.nlp import ApPosTagger, ChemApPosTagger
+from chemdataextractor.nlp import ApPosTagger, ChemApPosTagger, CrfPosTagger
+from chemdataextractor.nlp.lexicon import Lexicon
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -69,5 +70,27 @@ class TestChemApPosTagger(unittest.TestCase):
         )
 
 
+class TestCrfPosTagger(unittest.TestCase):
+    """Test CrfPosTagger."""
+
+    def test_sentence_features(self):
+        """Test the features of a sentence built from the features cached on each lexeme are the same as the features
+        of each token in turn."""
+        # Lexicons are singletons, so the test needs a lexicon class of its own
+        lexicon = type(str('TestLexicon'), (Lexicon,), {})()
+        lexicon.clusters = {'something': '0110100111', 'different': '11001011100100'}
+        lexicon._loaded_clusters = True
+        sents = [
+            ['And', 'now', 'for', 'something', 'completely', 'different'],
+            ['(', 'see', 'http://example.com', ',', '1.5', ')'],
+            ['something', 'different'],
+            ['different'],
+            [],
+        ]
+        for t in [CrfPosTagger(lexicon=lexicon), CrfPosTagger(lexicon=lexicon, clusters=True)]:
+            for sent in sents:
+                self.assertEqual([t._get_features(sent, i) for i in range(len(sent))], t._get_sentence_features(sent))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -100,6 +100,24 @@ class TestDictionaryTagger(unittest.TestCase):
             dt.tag(['The', 'Washington', 'Monument', 'is', 'the', 'most', 'prominent', 'structure', 'in', 'Washington', ',', 'D.C.'])
         )
 
+    def test_dictionary_delimiters(self):
+        """Test the Dictionary Tagger only matches the longest word that starts and ends at delimiters."""
+        dt = DictionaryTagger(words=[['Ti'], ['Ti6Al4V'], ['Ti6Al4V', 'alloy'], ['Al']])
+        self.assertEqual(
+            [('Ti6Al4V', 'B-CM'), ('alloy', 'I-CM'), ('and', None), ('Ti', 'B-CM'), ('Tix', None), ('(', None),
+             ('Al', 'B-CM'), (')', None)],
+            dt.tag(['Ti6Al4V', 'alloy', 'and', 'Ti', 'Tix', '(', 'Al', ')'])
+        )
+
+    def test_dictionary_walk_length(self):
+        """Test the Dictionary Tagger matches words longer than it walks the DAWG along at first."""
+        dt = DictionaryTagger(words=[['Washington'], ['Washington', ',', 'D.C.']])
+        dt.walk_length = 3
+        self.assertEqual(
+            [('in', None), ('Washington', 'B-CM'), (',', 'I-CM'), ('D.C.', 'I-CM'), ('and', None), ('Washington', 'B-CM')],
+            dt.tag(['in', 'Washington', ',', 'D.C.', 'and', 'Washington'])
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
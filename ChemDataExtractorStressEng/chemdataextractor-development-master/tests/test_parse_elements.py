@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+test_parse_elements
+~~~~~~~~~~~~~~~~~~~
+
+Test the first tokens and memoized parsing of parser elements.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import unittest
+
+from lxml import etree
+
+from chemdataextractor.parse.elements import W, I, R, T, Optional, ZeroOrMore, OneOrMore, Not, Any, Group, ScanTokens, ParseException
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestFirstTokens(unittest.TestCase):
+
+    def test_sequence(self):
+        """Test a sequence starts with its first part, or a later one if the first parts can match nothing."""
+        first, nullable = (I('yield') + I('strength')).first_tokens()
+        self.assertEqual(first.lower_words, {'yield'})
+        self.assertFalse(nullable)
+        first, nullable = (Optional(W('The')) + Not(W('stress')) + (I('yield') | T('NN'))).first_tokens()
+        self.assertEqual((first.words, first.lower_words, first.tags), ({'The'}, {'yield'}, {'NN'}))
+        self.assertFalse(nullable)
+        first, nullable = (ZeroOrMore(W('a')) + Optional(R('^b$'))).first_tokens()
+        self.assertEqual(first.words, {'a'})
+        self.assertEqual(len(first.regexes), 1)
+        self.assertTrue(nullable)
+
+    def test_any(self):
+        """Test any token can start an expression that starts with Any."""
+        self.assertEqual((Not(W('a')) + Any()).first_tokens(), (None, False))
+        self.assertEqual(Group(OneOrMore(W('a') | Any()))('g').first_tokens(), (None, False))
+
+
+class TestScan(unittest.TestCase):
+
+    def test_scan(self):
+        """Test scanning gives the same matches with first token pruning and memoization."""
+        tokens = [('The', 'DT'), ('yield', 'NN'), ('strength', 'NN'), ('was', 'VBD'), ('900', 'CD'), ('MPa', 'NN'),
+                  ('and', 'CC'), ('yield', 'NN'), ('point', 'NN'), ('800', 'CD'), ('MPa', 'NN')]
+        phrase = Group(I('yield') + (I('strength') | I('point')) + ZeroOrMore(Not(R('^\d+$')) + Any()).hide() +
+                       R('^\d+$')('value') + W('MPa')('units'))('phrase')
+        results = [(etree.tostring(result), start, end) for result, start, end in phrase.scan(tokens)]
+        self.assertEqual(results, [
+            (b'<phrase><NN>yield</NN><NN>strength</NN><value>900</value><units>MPa</units></phrase>', 1, 6),
+            (b'<phrase><NN>yield</NN><NN>point</NN><value>800</value><units>MPa</units></phrase>', 7, 11),
+        ])
+
+    def test_memo(self):
+        """Test failures are remembered for the rest of a scan."""
+        tokens = ScanTokens([('The', 'DT'), ('yield', 'NN'), ('point', 'NN')])
+        phrase = I('yield') + I('strength')
+        with self.assertRaises(ParseException):
+            phrase.parse(tokens, 1)
+        self.assertIn((id(phrase), 1, True), tokens.memo)
+        with self.assertRaises(ParseException):
+            phrase.parse(tokens, 1)
+        self.assertEqual(phrase.try_parse(ScanTokens([('yield', 'NN'), ('strength', 'NN')]), 0), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,14 @@
+# -*- coding: utf-8 -*-
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import logging
 import unittest
-from chemdataextractor.model.model import CurieTemperature
+from chemdataextractor.model.base import StringType, ModelType, UpdatableContext
+from chemdataextractor.model.model import Compound, CurieTemperature
+from chemdataextractor.model.units.temperature import TemperatureModel
+from chemdataextractor.parse.elements import I
 from chemdataextractor.doc import Sentence, Document, Paragraph, Figure, Caption, Title
 from chemdataextractor.parse.template import QuantityModelTemplateParser, MultiQuantityModelTemplateParser
 from lxml import etree
@@ -67,6 +71,27 @@ class TestQuantityModelTemplate(unittest.TestCase):
         expected = b'<root_phrase><raw_value>1100</raw_value><raw_units>K</raw_units><COMMA>,</COMMA><specifier>Curie temperature</specifier><cem_phrase><compound><names>BiFeO3</names></compound></cem_phrase></root_phrase>'
         self.assertEqual(expected, self.parse(s, 'value_specifier_cem_phrase'))
 
+    def test_root_cache(self):
+        """Test the root phrase is reused until the model's definitions are updated."""
+        class NeelTemperature(TemperatureModel):
+            specifier = StringType(parse_expression=I('Néel') + I('temperature'), required=True, updatable=True)
+            compound = ModelType(Compound)
+
+        parser = QuantityModelTemplateParser()
+        parser.model = NeelTemperature
+        root = parser.root
+        self.assertIs(parser.root, root)
+        tokens = [('TN', 'NNP'), ('=', 'SYM'), ('300', 'CD'), ('K', 'NNP')]
+        self.assertEqual(list(root.scan(tokens)), [])
+        definition = {'tokens': [('Néel', 'NNP'), ('temperature', 'NN'), (',', ','), ('TN', 'NNP')], 'specifier': 'TN'}
+        with UpdatableContext():
+            NeelTemperature.update([definition])
+            updated = parser.root
+            self.assertIsNot(updated, root)
+            self.assertIs(parser.root, updated)
+            self.assertEqual(len(list(updated.scan(tokens))), 1)
+        self.assertEqual(list(parser.root.scan(tokens)), [])
+
 
 class TestMultiQuantityTemplate(unittest.TestCase):
     maxDiff = None
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+test_parse_trigger
+~~~~~~~~~~~~~~~~~~
+
+Test the trigger phrase pre-filters for parsers.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import unittest
+
+from chemdataextractor.model.model import CurieTemperature
+from chemdataextractor.parse.elements import W, I, R, T, Optional, Not, Any, NoMatch, OneOrMore
+from chemdataextractor.parse.template import QuantityModelTemplateParser
+from chemdataextractor.parse.trigger import Trigger, skip_stats
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestTrigger(unittest.TestCase):
+
+    def test_sequence(self):
+        """Test every required word of a sequence must be present."""
+        trigger = Trigger.from_element(I('yield') + I('strength') + Optional(W('σy')))
+        self.assertTrue(trigger.matches([('The', 'DT'), ('Yield', 'NN'), ('strength', 'NN')]))
+        self.assertFalse(trigger.matches([('The', 'DT'), ('yield', 'NN'), ('point', 'NN')]))
+        self.assertEqual(len(trigger.clauses), 2)
+
+    def test_alternatives(self):
+        """Test any one alternative is enough."""
+        trigger = Trigger.from_element((I('Curie') + I('temperature')) | W('TC') | R('^T[Cc]\d$') | T('SYM'))
+        self.assertTrue(trigger.matches([('curie', 'NN'), ('point', 'NN')]))
+        self.assertTrue(trigger.matches([('TC', 'NN')]))
+        self.assertTrue(trigger.matches([('Tc1', 'NN')]))
+        self.assertTrue(trigger.matches([('x', 'SYM')]))
+        self.assertFalse(trigger.matches([('tc', 'NN'), ('Tc12', 'NN')]))
+
+    def test_no_trigger(self):
+        """Test there is no trigger when no token is required for a match."""
+        self.assertIsNone(Trigger.from_element(Optional(I('yield'))))
+        self.assertIsNone(Trigger.from_element(Not(I('yield')) + Any()))
+        self.assertIsNone(Trigger.from_element(I('yield') | Any()))
+        self.assertIsNotNone(Trigger.from_element(OneOrMore(I('yield'))))
+        self.assertFalse(Trigger.from_element(NoMatch()).matches([('yield', 'NN')]))
+
+    def test_parser_skips(self):
+        """Test sentences without the specifier are skipped by the template parser, and counted."""
+        parser = QuantityModelTemplateParser()
+        parser.model = CurieTemperature
+        self.assertEqual(list(parser.parse_sentence([('The', 'DT'), ('melting', 'NN'), ('point', 'NN')])), [])
+        list(parser.parse_sentence([('The', 'DT'), ('Curie', 'NNP'), ('temperature', 'NN')]))
+        self.assertEqual(parser.sentences_parsed, 2)
+        self.assertEqual(parser.sentences_skipped, 1)
+
+    def test_skip_stats(self):
+        """Test the skip rate is reported for each model."""
+        stats = skip_stats([CurieTemperature])
+        self.assertEqual(list(stats.keys()), ['CurieTemperature'])
+        self.assertEqual(set(stats['CurieTemperature'].keys()), {'sentences', 'skipped', 'skip_rate'})
+
+
+if __name__ == '__main__':
+    unittest.main()
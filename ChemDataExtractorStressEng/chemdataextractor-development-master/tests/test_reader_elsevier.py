@@ -15,8 +15,13 @@ import logging
 import io
 import os
 
+from lxml import etree
+
 from chemdataextractor import Document
-from chemdataextractor.reader.elsevier import ElsevierXmlReader
+from chemdataextractor.reader.elsevier import (ElsevierXmlReader, clean_els_xml, fix_elsevier_xml_whitespace,
+                                               els_xml_whitespace, strip_els_xml)
+from chemdataextractor.reader.markup import XmlReader
+from chemdataextractor.scrape.clean import clean
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
@@ -72,6 +77,139 @@ class TestElsXMLReader(unittest.TestCase):
         expected = [['1500', ['Tm (K)'], ['MD simulations with ReaxFF potential []']], ['1750', ['Tm (K)'], ['MC simulations with ARK parameters []']], ['1775', ['Tm (K)'], ['MD simulations with SW potential []']], ['2.36\u202f×\u202f1011', ['γC (K/s)'], ['MD simulations with ReaxFF potential []']], ['4.25\u202f×\u202f1011', ['γC (K/s)'], ['MC simulations with ARK parameters []']], ['4.95\u202f×\u202f1011', ['γC (K/s)'], ['MD simulations with SW potential []']]]
         self.assertEqual(table_1, expected)
 
+    def test_stream(self):
+        """Test stream mode gives the same elements as building the whole tree."""
+        for fname in ['j.jnoncrysol.2017.07.006.xml', 'j.jnoncrysol.2018.02.024.xml']:
+            f = io.open(os.path.join(os.path.dirname(__file__), 'data', 'elsevier', fname), 'rb')
+            content = f.read()
+            f.close()
+            d = ElsevierXmlReader().readstring(content)
+            streamed = ElsevierXmlReader(stream=True).readstring(content)
+            self.assertEqual([(type(el), el.id, getattr(el, 'text', None)) for el in streamed.elements],
+                             [(type(el), el.id, getattr(el, 'text', None)) for el in d.elements])
+            self.assertEqual([fig.links for fig in streamed.figures], [fig.links for fig in d.figures])
+
+    def test_stream_cleaning(self):
+        """Test stream mode applies the Elsevier cleaning rules to each part as it is read."""
+        content = b'''<?xml version="1.0" encoding="UTF-8"?>
+<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd"
+    xmlns:ce="http://www.elsevier.com/xml/common/dtd" xmlns:ja="http://www.elsevier.com/xml/ja/dtd"
+    xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd">
+  <originalText><xocs:doc><xocs:serial-item><ja:article><ja:body><ce:sections>
+    <ce:section id="s1">
+      <ce:section-title>Results</ce:section-title>
+      <ce:para id="p1">A cooling rate of 10<ce:sup>11</ce:sup>
+        <ce:hsp sp="0.5"/>K s<ce:sup>-1</ce:sup> [<ce:cross-ref refid="b1">1</ce:cross-ref>].</ce:para>
+      <ce:acknowledgment><ce:para>Thanks.</ce:para></ce:acknowledgment>
+      <!-- comment -->Loose <ce:italic>text</ce:italic>
+    </ce:section>
+  </ce:sections></ja:body></ja:article></xocs:serial-item></xocs:doc></originalText>
+</full-text-retrieval-response>'''
+        d = ElsevierXmlReader().readstring(content)
+        elements = list(ElsevierXmlReader(stream=True).iter_elements(io.BytesIO(content)))
+        self.assertEqual([(type(el), el.id, el.text) for el in elements],
+                         [(type(el), el.id, el.text) for el in d.elements])
+        self.assertEqual([el.text for el in elements], ['Results', 'A cooling rate of 1011\nK s-1 [].', '\nLoose text'])
+
+    def test_read_header(self):
+        """Test the header is read without reading the article body."""
+        path = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2018.02.024.xml')
+        self.assertEqual(ElsevierXmlReader().read_header(path), {
+            'doi': '10.1016/j.jnoncrysol.2018.02.024',
+            'title': 'Crystallization of supercooled liquid and amorphous silicene',
+            'subtype': 'fla',
+            'open_access': False,
+            'rawtext_only': False,
+        })
+        f = io.open(path, 'rb')
+        content = f.read()
+        f.close()
+        # Replace the article with raw text, and leave the rest of the file unreadable
+        content = content[:content.index(b'<xocs:serial-item>')] + b'<xocs:rawtext>Raw text</xocs:rawtext><broken'
+        header = ElsevierXmlReader().read_header(io.BytesIO(content))
+        self.assertEqual((header['doi'], header['subtype'], header['rawtext_only']),
+                         ('10.1016/j.jnoncrysol.2018.02.024', 'fla', True))
+        self.assertIsNone(ElsevierXmlReader().read_header(io.BytesIO(b'<html><body><p>Not Elsevier</p></body></html>')))
+
+    def test_figure_links(self):
+        """Test each figure links to all the objects with its locator as their ref."""
+        r = ElsevierXmlReader()
+        f = io.open(os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2018.02.024.xml'), 'rb')
+        r.root = etree.fromstring(f.read())
+        f.close()
+        figures = r._css(r.figure_css, r.root)
+        links = r._parse_figure_links(figures[0])
+        self.assertEqual(len(links), 3)
+        self.assertEqual(links[0], 'https://api.elsevier.com/content/object/eid/1-s2.0-S0022309318300917-gr1.sml?httpAccept=%2A%2F%2A')
+        for link in links:
+            self.assertIn('-gr1', link)
+        self.assertEqual(len(r._parse_figure_links(figures[-1])), 3)
+        self.assertIn('-gr8', r._parse_figure_links(figures[-1])[0])
+        self.assertEqual(r._parse_figure_links(etree.fromstring('<figure/>')), [])
+
+    def test_compiled_css(self):
+        """Test CSS selectors are compiled once with the Elsevier namespaces and reused by every reader."""
+        xpath = ElsevierXmlReader._compile_css(ElsevierXmlReader.table_cell_css)
+        self.assertIs(ElsevierXmlReader()._compile_css('ce|entry'), xpath)
+        self.assertEqual(xpath.path, "descendant-or-self::ce:entry")
+        self.assertNotIn('_compiled_css', XmlReader.__dict__)
+
+    def test_lazy(self):
+        """Test a lazy read leaves the tables to be analysed and the figure captions to be tagged when first used."""
+        fname = 'j.jnoncrysol.2018.02.024.xml'
+        f = io.open(os.path.join(os.path.dirname(__file__), 'data', 'elsevier', fname), 'rb')
+        d = Document.from_file(f, readers=[ElsevierXmlReader(lazy=True)])
+        f.close()
+        self.assertEqual(d.metadata.doi, '10.1016/j.jnoncrysol.2018.02.024')
+        self.assertTrue(all(not table._tde_analysed for table in d.tables))
+        self.assertTrue(all('_caption_tokens' not in vars(figure) for figure in d.figures))
+        self.assertEqual(d.tables[0].heading, 0)
+        self.assertTrue(d.tables[0]._tde_analysed)
+        self.assertEqual(d.tables[0].tde_table.category_table[0], ['1500', ['Tm (K)'], ['MD simulations with ReaxFF potential []']])
+        self.assertFalse(d.tables[1]._tde_analysed)
+
+    def test_table_processes(self):
+        """Test tables analysed as a batch in worker processes give the same TDE tables as analysing each in turn."""
+        path = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2018.02.024.xml')
+        d = Document.from_file(path, readers=[ElsevierXmlReader(lazy=True)])
+        for reader in [ElsevierXmlReader(lazy=True, table_processes=2),
+                       ElsevierXmlReader(stream=True, lazy=True, table_processes=2)]:
+            with reader:
+                batched = Document.from_file(path, readers=[reader])
+                pool = reader._table_pool
+                self.assertIsNotNone(pool)
+                self.assertTrue(all(table._tde_analysed for table in batched.tables))
+                self.assertEqual([table.tde_table.category_table for table in batched.tables],
+                                 [table.tde_table.category_table for table in d.tables])
+                self.assertEqual([table.heading for table in batched.tables], [table.heading for table in d.tables])
+                # The worker processes are kept for the next document
+                Document.from_file(path, readers=[reader])
+                self.assertIs(reader._table_pool, pool)
+            self.assertIsNone(reader._table_pool)
+
+    def test_clean_els_xml(self):
+        """Test the single walk cleaner gives the same document as applying each Elsevier cleaner in turn."""
+        cleaners = [clean, fix_elsevier_xml_whitespace, els_xml_whitespace, strip_els_xml]
+        fixture = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2017.07.006.xml')
+        f = io.open(fixture, 'rb')
+        contents = [f.read(), b'''<ce:section xmlns:ce="http://www.elsevier.com/xml/common/dtd">
+  <ce:para>A  cooling rate of 10<ce:sup>11</ce:sup>
+    <ce:hsp sp="0.5"/>K s<ce:inf>-1 <!-- x --></ce:inf> <ce:hsp>\t</ce:hsp><ce:bold>was <ce:italic>used</ce:italic>
+    </ce:bold>[<ce:cross-refs>1, <ce:sup>2</ce:sup></ce:cross-refs>].<div style="display:none;">Hidden</div> <div/>
+  </ce:para>
+</ce:section>''']
+        f.close()
+        for content in contents:
+            separate = etree.fromstring(content)
+            for cleaner in cleaners:
+                cleaner(separate)
+            fused = etree.fromstring(content)
+            clean_els_xml(fused)
+            self.assertEqual(etree.tostring(fused), etree.tostring(separate))
+        self.assertEqual(etree.tostring(fused), b'<ce:section xmlns:ce="http://www.elsevier.com/xml/common/dtd">'
+                                                b'<ce:para>A cooling rate of 1011\nK s-1 was used[].\n<div/>\n</ce:para>'
+                                                b'</ce:section>')
+
 
 
 
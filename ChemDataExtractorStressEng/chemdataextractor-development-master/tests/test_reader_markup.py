@@ -66,6 +66,18 @@ class TestReaderHtml(unittest.TestCase):
         for el in d.elements:
             self.assertIsInstance(el, Paragraph)
 
+    def test_inline(self):
+        """Test inline elements are joined into one element, except for citations."""
+        r = HtmlReader()
+        d = r.parse('<h2 id="s1">Results <i>and</i><div>Discussion</div></h2>'
+                    '<p id="p1">Ti<sub>3</sub>Al <i>alloys</i> have <cite>[1]</cite> high <b>strength</b>.</p>')
+        self.assertEqual([(type(el).__name__, el.text, el.id) for el in d.elements], [
+            ('Heading', 'Results and\n Discussion \n', 's1'),
+            ('Paragraph', 'Ti3Al alloys have ', 'p1'),
+            ('Citation', '[1]', None),
+            ('Paragraph', ' high strength.', 'p1'),
+        ])
+
 
 if __name__ == '__main__':
     unittest.main()
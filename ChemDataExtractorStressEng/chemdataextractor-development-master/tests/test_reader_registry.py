@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+test_reader_registry
+~~~~~~~~~~~~~~~~~~~~
+
+Test choosing readers by sniffing the start of each file.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from chemdataextractor import Document
+from chemdataextractor.doc.text import Paragraph
+from chemdataextractor.errors import ReaderError
+from chemdataextractor.reader import (DEFAULT_READERS, DEFAULT_REGISTRY, ReaderRegistry, sniff_format,
+                                      ElsevierXmlReader, HtmlReader, PdfReader, PlainTextReader, XmlReader)
+from chemdataextractor.reader.base import BaseReader
+from chemdataextractor.reader.registry import detect_size, map_file
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class StrengthReader(BaseReader):
+    """A custom reader for plain text that starts with a signature."""
+
+    formats = {'text'}
+
+    def detect(self, fstring, fname=None):
+        return fstring.startswith(b'STRENGTH')
+
+    def parse(self, fstring):
+        return Document(Paragraph(fstring[len(b'STRENGTH'):].strip().decode('utf-8')))
+
+
+class SignedHtmlReader(HtmlReader):
+    """A custom HTML reader that looks for a signature anywhere in the file."""
+
+    def detect(self, fstring, fname=None):
+        return b'SIGNED' in fstring
+
+
+class TestSniff(unittest.TestCase):
+
+    def test_sniff_format(self):
+        """Test the format of a file is told from the start of it."""
+        self.assertEqual(sniff_format(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3'), 'pdf')
+        self.assertEqual(sniff_format(b'<!DOCTYPE html>\n<html><body></body></html>'), 'html')
+        self.assertEqual(sniff_format(b'\xef\xbb\xbf <?xml version="1.0"?><!-- c --><HTML></HTML>'), 'html')
+        self.assertEqual(sniff_format(b'<?xml version="1.0"?>\n<!DOCTYPE us-patent-grant>'), 'xml')
+        self.assertEqual(sniff_format(b'<full-text-retrieval-response xmlns="http://www.elsevier.com">'), 'markup')
+        self.assertEqual(sniff_format(b'The yield strength was 900 MPa.'), 'text')
+        self.assertIsNone(sniff_format(b'\xff\xfe<\x00h\x00'))
+        self.assertIsNone(sniff_format(b'\x89PNG\r\n\x1a\n\x00\x00'))
+        self.assertIsNone(sniff_format(b''))
+
+
+class TestReaderRegistry(unittest.TestCase):
+
+    def test_candidates(self):
+        """Test readers of other formats are skipped, keeping the order of the rest."""
+        self.assertIs(DEFAULT_REGISTRY.readers, DEFAULT_READERS)
+        candidates = [type(r) for r in DEFAULT_REGISTRY.candidates(b'<html><body><p>Text</p></body></html>')]
+        self.assertEqual(candidates, [HtmlReader, PlainTextReader])
+        candidates = [type(r) for r in DEFAULT_REGISTRY.candidates(b'The yield strength was 900 MPa.')]
+        self.assertEqual(candidates, [PlainTextReader])
+        candidates = [type(r) for r in DEFAULT_REGISTRY.candidates(b'%PDF-1.4\n')]
+        self.assertEqual(candidates, [PdfReader, PlainTextReader])
+        path = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2017.07.006.xml')
+        f = io.open(path, 'rb')
+        content = f.read()
+        f.close()
+        candidates = [type(r) for r in DEFAULT_REGISTRY.candidates(content, fname='j.jnoncrysol.2017.07.006.xml')]
+        self.assertEqual(candidates, [ElsevierXmlReader, XmlReader])
+
+    def test_read(self):
+        """Test a file is read by the first reader that can, and the counts for each reader are kept."""
+        registry = ReaderRegistry([XmlReader(), HtmlReader(), PdfReader(), PlainTextReader()])
+        d = registry.read(b'The yield strength\n\nwas 900 MPa.')
+        self.assertEqual([el.text for el in d.elements], ['The yield strength', 'was 900 MPa.'])
+        self.assertEqual(registry.stats['XmlReader'], {'skipped': 1})
+        self.assertEqual(registry.stats['PlainTextReader'], {'read': 1})
+        registry.read(b'<html><body><p>The yield strength</p></body></html>')
+        self.assertEqual(registry.stats['HtmlReader'], {'skipped': 1, 'read': 1})
+        with self.assertRaises(ReaderError):
+            ReaderRegistry([XmlReader()]).read(b'The yield strength was 900 MPa.')
+
+    def test_register(self):
+        """Test custom readers are tried before the default readers, or before a given class of reader."""
+        registry = ReaderRegistry(list(DEFAULT_READERS))
+        registry.register(StrengthReader(), before=PlainTextReader)
+        self.assertIsInstance(registry.readers[-2], StrengthReader)
+        self.assertEqual(registry.read(b'STRENGTH 900 MPa').elements[0].text, '900 MPa')
+        self.assertEqual(registry.stats['StrengthReader'], {'read': 1})
+        registry.unregister(StrengthReader)
+        registry.register(StrengthReader())
+        self.assertIsInstance(registry.readers[0], StrengthReader)
+        registry.unregister(StrengthReader)
+        self.assertEqual([type(r) for r in registry.readers], [type(r) for r in DEFAULT_READERS])
+
+    def test_document(self):
+        """Test documents are read with the sniffed readers."""
+        d = Document.from_string(b'The yield strength\n\nwas 900 MPa.')
+        self.assertEqual(len(d.elements), 2)
+        d = Document.from_string(b'STRENGTH 900 MPa', readers=[StrengthReader(), PlainTextReader()])
+        self.assertEqual(d.elements[0].text, '900 MPa')
+
+
+class TestReadFile(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_map_file(self):
+        """Test only files on disk that have not been read from are mapped."""
+        path = self.write('paper.txt', b'The yield strength was 900 MPa.')
+        with io.open(path, 'rb') as f:
+            mapped = map_file(f)
+            self.assertEqual(mapped[:9], b'The yield')
+            mapped.close()
+            f.read(3)
+            self.assertIsNone(map_file(f))
+        with io.open(self.write('empty.txt', b''), 'rb') as f:
+            self.assertIsNone(map_file(f))
+        self.assertIsNone(map_file(io.BytesIO(b'The yield strength')))
+
+    def test_detect_size(self):
+        """Test readers are given the start of the file to detect only if the class that defines detect says so."""
+        self.assertEqual(detect_size(ElsevierXmlReader()), 4096)
+        self.assertEqual(detect_size(XmlReader()), 0)
+        self.assertIsNone(detect_size(SignedHtmlReader()))
+        self.assertIsNone(detect_size(StrengthReader()))
+
+    def test_read_file(self):
+        """Test files are read from a memory map in the same way as from a byte string."""
+        path = os.path.join(os.path.dirname(__file__), 'data', 'elsevier', 'j.jnoncrysol.2018.02.024.xml')
+        f = io.open(path, 'rb')
+        content = f.read()
+        f.close()
+        d = ElsevierXmlReader(lazy=True).readstring(content)
+        expected = [(type(el), el.id, getattr(el, 'text', None)) for el in d.elements]
+        for reader in [ElsevierXmlReader(lazy=True), ElsevierXmlReader(stream=True, lazy=True)]:
+            d = Document.from_file(path, readers=[reader])
+            self.assertEqual([(type(el), el.id, getattr(el, 'text', None)) for el in d.elements], expected)
+        # The signature is past the start of the file, so the whole file is given to detect
+        content = b'<html><body><p>The yield strength was 900 MPa.</p>' + b' ' * 10000 + b'SIGNED</body></html>'
+        path = self.write('signed.html', content)
+        registry = ReaderRegistry([SignedHtmlReader()])
+        with io.open(path, 'rb') as f:
+            self.assertEqual(registry.read_file(f).elements[0].text, 'The yield strength was 900 MPa.')
+        self.assertEqual(registry.stats['SignedHtmlReader'], {'read': 1})
+        path = self.write('paper.txt', b'The yield strength\n\nwas 900 MPa.')
+        self.assertEqual(len(Document.from_file(path).elements), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -191,6 +191,13 @@ class TestCleaner(unittest.TestCase):
         cleaner(tree)
         self.assertEqual(STRIPKS4, tostring(tree).decode())
 
+    def test_strip_allow(self):
+        """Test applying a ``Cleaner`` instance that strips all tags except sub and sup."""
+        cleaner = Cleaner(fix_whitespace=False, strip_xpath='.//*', allow_xpath='.//sub | .//sup')
+        tree = html.fromstring('<div><p>Ti<sub>3</sub>Al at <b>10<sup>-3</sup> s<sup>-1</sup></b></p></div>')
+        cleaner(tree)
+        self.assertEqual('<div>Ti<sub>3</sub>Al at 10<sup>-3</sup> s<sup>-1</sup></div>', tostring(tree).decode())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,6 +14,9 @@ from __future__ import unicode_literals
 import logging
 import unittest
 
+from bs4 import UnicodeDammit
+
+from chemdataextractor.text import get_encoding, is_utf8, UTF8_CHUNK_SIZE
 from chemdataextractor.text.latex import latex_to_unicode
 from chemdataextractor.text.normalize import normalize
 from chemdataextractor.text.processors import extract_emails
@@ -83,5 +86,21 @@ class TestExtraction(unittest.TestCase):
                          extract_emails('Invalid - matt@me...com, hithere@ex*ample.com'))
 
 
+class TestEncoding(unittest.TestCase):
+
+    def test_get_encoding(self):
+        """Test encodings are guessed in the same way whether or not the string is valid UTF-8."""
+        # A multi-byte character split across two chunks
+        text = ('a' * (UTF8_CHUNK_SIZE - 1) + '\u00e9').encode('utf-8')
+        self.assertTrue(is_utf8(text))
+        self.assertFalse(is_utf8(text[:-1]))
+        self.assertEqual(get_encoding(text), 'utf-8')
+        self.assertEqual(get_encoding(b'<?xml version="1.0" encoding="iso-8859-1"?><a>x</a>'), 'utf-8')
+        # Strings that aren't valid UTF-8 are left to UnicodeDammit, whose guesses depend on the detector installed
+        for data in ['h\u00e9'.encode('iso-8859-1'), b'\xff\xfea\x00']:
+            self.assertEqual(get_encoding(data), UnicodeDammit(data, override_encodings=['utf-8']).original_encoding)
+        self.assertIsNone(get_encoding('h\u00e9'))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from chemdataextractor import Document
+from chemdataextractor.corpus import CorpusRunner, extract_file
 from chemdataextractor.model import (
     StressModel,
     LengthModel,
@@ -25,146 +26,63 @@ from chemdataextractor.model.model import (
     YieldStrength,
     TableYieldStrength,
 )
+import argparse
+import glob
 import os
 
 
-def extractYS(self, file):
+ALL_MODELS = [YieldStrength, GrainSize, TableYieldStrength, TableGrainSize]
 
-    models = [YieldStrength]
-    records = []
-    for model in models:
-        f = open(file, "rb")
-        d = Document.from_file(f, readers=[ElsevierXmlReader()])
-        try:
-            d.models = [model]
-            try:
-                meta_data = d.metadata.serialize()
-            except:
-                meta_data = "empty"
-            print("parsing " + file + " with model " + str(model))
-
-            rough = d.records.serialize()
-            for dic in rough:
-                if "Compound" in dic:
-                    continue
-                dic["metadata"] = meta_data
-                file_name = os.path.basename(file).replace("10.1016-", "10.1016/")
-                dic["file_name"] = file_name
-                dic["extraction_model"] = str(model)
-                dic["parsing_method"] = "Text Parsing"
-                count += 1
-                records.append(dic)
-            # print(str(count) + " records have been extracted. \n-------")
-            f.close()
-        except:
-            print("Error")
-            f.close()
-            pass
-    return records
 
+def extractAll(self, file, models=ALL_MODELS):
+    """Extract records for all models from a file, reading and parsing it once."""
+    print("parsing " + file + " with models " + ", ".join(m.__name__ for m in models))
+    try:
+        return extract_file(file, models, readers=[ElsevierXmlReader()])
+    except Exception:
+        print("Error")
+        return []
 
-def extractGS(self, file):
 
-    models = [GrainSize]
-
-    records = []
-    for model in models:
-        f = open(file, "rb")
-        d = Document.from_file(f, readers=[ElsevierXmlReader()])
-        try:
-            d.models = [model]
-            try:
-                meta_data = d.metadata.serialize()
-            except:
-                meta_data = "empty"
-            print("parsing " + file + " with model " + str(model))
-
-            rough = d.records.serialize()
-            for dic in rough:
-                if "Compound" in dic:
-                    continue
-                dic["metadata"] = meta_data
-                file_name = os.path.basename(file).replace("10.1016-", "10.1016/")
-                dic["file_name"] = file_name
-                dic["extraction_model"] = str(model)
-                dic["parsing_method"] = "Text Parsing"
-                count += 1
-                records.append(dic)
-            # print(str(count) + " records have been extracted. \n-------")
-            f.close()
-        except:
-            print("Error")
-            f.close()
-            pass
-    return records
+def extractYS(self, file):
+    return extractAll(self, file, [YieldStrength])
 
 
-def extractYSTable(self, file):
+def extractGS(self, file):
+    return extractAll(self, file, [GrainSize])
+
 
-    models = [TableYieldStrength]
-    records = []
-    for model in models:
-        f = open(file, "rb")
-        d = Document.from_file(f, readers=[ElsevierXmlReader()])
-        try:
-            d.models = [model]
-            try:
-                meta_data = d.metadata.serialize()
-            except:
-                meta_data = "empty"
-            print("parsing " + file + " with model " + str(model))
-
-            rough = d.records.serialize()
-            for dic in rough:
-                if "Compound" in dic:
-                    continue
-                dic["metadata"] = meta_data
-                file_name = os.path.basename(file).replace("10.1016-", "10.1016/")
-                dic["file_name"] = file_name
-                dic["extraction_model"] = str(model)
-                dic["parsing_method"] = "Table Parsing"
-                count += 1
-                records.append(dic)
-            # print(str(count) + " records have been extracted. \n-------")
-            f.close()
-        except:
-            print("Error")
-            f.close()
-            pass
-    return records
+def extractYSTable(self, file):
+    return extractAll(self, file, [TableYieldStrength])
 
 
 def extractGSTable(self, file):
-
-    models = [TableGrainSize]
-
-    records = []
-    for model in models:
-        f = open(file, "rb")
-        d = Document.from_file(f, readers=[ElsevierXmlReader()])
-        try:
-            d.models = [model]
-            try:
-                meta_data = d.metadata.serialize()
-            except:
-                meta_data = "empty"
-            print("parsing " + file + " with model " + str(model))
-
-            rough = d.records.serialize()
-            for dic in rough:
-                if "Compound" in dic:
-                    continue
-                dic["metadata"] = meta_data
-                file_name = os.path.basename(file).replace("10.1016-", "10.1016/")
-                dic["file_name"] = file_name
-                dic["extraction_model"] = str(model)
-                dic["parsing_method"] = "Table Parsing"
-                count += 1
-                records.append(dic)
-            # print(str(count) + " records have been extracted. \n-------")
-            f.close()
-        except:
-            print("Error")
-            f.close()
-            pass
-    return records
+    return extractAll(self, file, [TableGrainSize])
+
+
+def extractCorpus(files, output, processes=None, resume=True, annotation_cache=None, screen=True):
+    """Extract records for all models from many files over a process pool, appending them to a JSON lines file.
+
+    Files already finished in a previous run with the same output are skipped when resume is True. If annotation_cache
+    is the path of an SQLite file, sentence annotations are stored there and reused by later runs. If screen is True,
+    papers that are not full-length articles, or only have raw text, are dropped after reading just their header.
+    """
+    runner = CorpusRunner(models=ALL_MODELS, processes=processes, readers=[ElsevierXmlReader()],
+                          annotation_cache=annotation_cache, screen=screen)
+    return runner.run(files, output, resume=resume)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract records from downloaded Elsevier XML papers.")
+    parser.add_argument("input", help="Directory of downloaded XML papers.")
+    parser.add_argument("output", help="JSON lines output file.")
+    parser.add_argument("--processes", "-p", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--restart", action="store_true", help="Overwrite the output instead of resuming.")
+    parser.add_argument("--cache", default=None, help="SQLite file to store and reuse sentence annotations in.")
+    parser.add_argument("--no-screen", action="store_true",
+                        help="Extract from every paper, including raw text only papers and other document subtypes.")
+    args = parser.parse_args()
+    files = sorted(glob.glob(os.path.join(args.input, "*.xml")))
+    count = extractCorpus(files, args.output, processes=args.processes, resume=not args.restart,
+                         annotation_cache=args.cache, screen=not args.no_screen)
+    print(str(count) + " records have been extracted.")